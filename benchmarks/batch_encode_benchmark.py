@@ -0,0 +1,81 @@
+"""
+Measures the per-code cost of encoding label payloads one at a time and as one batch.
+
+The payloads share one length profile (a fixed URL prefix plus a 12-digit serial), as
+in label runs. Encoding cost per code is compared with stock qrcode and with the cost
+of writing each code as a compact PNG, the floor the batch path approaches.
+
+Usage: python benchmarks/batch_encode_benchmark.py [--count N] [--prefix URL]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import qrcode  # noqa: E402
+from qrcode.constants import ERROR_CORRECT_L  # noqa: E402
+
+from src.app_logic.qrcode_engine import clear_matrix_cache, encode_matrices, encode_matrix  # noqa: E402
+from src.app_logic.qrcode_png import write_png  # noqa: E402
+
+# Stock qrcode is slow, so it only encodes a sample of the payloads
+STOCK_SAMPLE = 200
+
+
+def _per_code_ms(function, items):
+    """Returns the milliseconds per item of running function over items."""
+    started = time.perf_counter()
+    function(items)
+    return (time.perf_counter() - started) * 1000 / len(items)
+
+
+def _stock(payloads):
+    for data in payloads:
+        qr = qrcode.QRCode(error_correction=ERROR_CORRECT_L)
+        qr.add_data(data)
+        qr.make()
+
+
+def _single(payloads):
+    for data in payloads:
+        encode_matrix(data)
+
+
+def _write(matrices):
+    for matrix in matrices:
+        write_png(matrix, io.BytesIO(), box_size=4)
+
+
+def benchmark(count, prefix):
+    """Prints the cost per code of each path."""
+    payloads = [f"{prefix}{random.randrange(10 ** 12):012d}" for _ in range(count)]
+    encode_matrices(payloads[:8])
+
+    clear_matrix_cache()
+    single = _per_code_ms(_single, payloads)
+    expected = [encode_matrix(data) for data in payloads[-100:]]
+    clear_matrix_cache()
+    batch = _per_code_ms(encode_matrices, payloads)
+    if encode_matrices(payloads[-100:]) != expected:
+        raise AssertionError("Batch encoding differs from encode_matrix")
+    stock = _per_code_ms(_stock, payloads[:STOCK_SAMPLE])
+    write = _per_code_ms(_write, encode_matrices(payloads[:STOCK_SAMPLE]))
+
+    print(f"{count} payloads like {payloads[0]!r}")
+    print(f"{'stock qrcode':>16} {stock:8.3f} ms/code")
+    print(f"{'one at a time':>16} {single:8.3f} ms/code")
+    print(f"{'batch':>16} {batch:8.3f} ms/code")
+    print(f"{'write PNG':>16} {write:8.3f} ms/code")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="Number of payloads")
+    parser.add_argument("--prefix", default="https://example.com/item/", help="Payload prefix before the serial")
+    args = parser.parse_args()
+    benchmark(args.count, args.prefix)
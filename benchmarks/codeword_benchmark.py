@@ -0,0 +1,64 @@
+"""
+Compares qrcode's codeword generation with the table-driven Reed-Solomon encoder.
+
+For each version it checks that both produce the same bytes, then times qrcode's
+create_data (bit buffer and polynomial objects), the table-driven encoder for one
+symbol, and the per-symbol cost when a whole batch of symbols is divided at once.
+
+Usage: python benchmarks/codeword_benchmark.py [--versions 1 10 25 40] [--batch N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from qrcode import util  # noqa: E402
+from qrcode.constants import ERROR_CORRECT_M  # noqa: E402
+
+from src.app_logic.qrcode_capacity import max_characters  # noqa: E402
+from src.app_logic.qrcode_codewords import data_codewords, encode_codewords, interleave_codewords  # noqa: E402
+
+VERSIONS = (1, 5, 10, 15, 20, 25, 30, 35, 40)
+
+
+def _segments(version, serial=0):
+    """Returns one byte-mode segment that fills most of a version at level M."""
+    text = f"https://example.com/item/{serial:012d}/"
+    length = max_characters(version, ERROR_CORRECT_M) * 9 // 10
+    return [util.QRData((text * (length // len(text) + 1))[:length])]
+
+
+def benchmark(versions, batch, repeat):
+    """Prints one row per version with the time per symbol of each path."""
+    print(f"{'version':>7} {'qrcode ms':>10} {'tables ms':>10} {'batch ms/code':>14} {'speedup':>8}")
+    for version in versions:
+        segments = _segments(version)
+        if encode_codewords(segments, version, ERROR_CORRECT_M).tolist() != util.create_data(
+                version, ERROR_CORRECT_M, segments):
+            raise AssertionError(f"Codewords differ from qrcode for version {version}")
+
+        data = np.array([np.frombuffer(data_codewords(_segments(version, serial), version, ERROR_CORRECT_M),
+                                       dtype=np.uint8) for serial in range(batch)])
+
+        stock = min(timeit.repeat(lambda: util.create_data(version, ERROR_CORRECT_M, segments),
+                                  number=1, repeat=repeat))
+        fast = min(timeit.repeat(lambda: encode_codewords(segments, version, ERROR_CORRECT_M),
+                                 number=1, repeat=repeat))
+        batched = min(timeit.repeat(lambda: interleave_codewords(data, version, ERROR_CORRECT_M),
+                                    number=1, repeat=repeat)) / batch
+        print(f"{version:>7} {stock * 1000:>10.3f} {fast * 1000:>10.3f} {batched * 1000:>14.4f} "
+              f"{stock / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--versions", type=int, nargs="+", default=VERSIONS, help="Versions to measure")
+    parser.add_argument("--batch", type=int, default=256, help="Symbols divided together in batch mode")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per case (best is reported)")
+    args = parser.parse_args()
+    benchmark(args.versions, args.batch, args.repeat)
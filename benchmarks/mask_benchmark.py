@@ -0,0 +1,62 @@
+"""
+Compares qrcode's mask selection with the vectorized evaluator, per version.
+
+For each version it times qrcode's best_mask_pattern (eight full matrix rebuilds scored
+in pure Python), the vectorized evaluator (one placement, eight XORs, array penalty
+rules) and a fixed mask, after checking that both evaluators pick the same mask.
+
+Usage: python benchmarks/mask_benchmark.py [--versions 1 10 25 40] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import qrcode  # noqa: E402
+from qrcode import util  # noqa: E402
+from qrcode.constants import ERROR_CORRECT_M  # noqa: E402
+
+from src.app_logic.qrcode_capacity import max_characters  # noqa: E402
+from src.app_logic.qrcode_mask import best_mask_pattern, build_matrix, place_codewords  # noqa: E402
+
+VERSIONS = (1, 5, 10, 15, 20, 25, 30, 35, 40)
+
+
+def _payload(version):
+    """Returns a byte-mode payload that fills most of a version at level M."""
+    text = "https://example.com/item/"
+    length = max_characters(version, ERROR_CORRECT_M) * 9 // 10
+    return (text * (length // len(text) + 1))[:length]
+
+
+def benchmark(versions, repeat):
+    """Prints one row per version with the time spent choosing and applying the mask."""
+    print(f"{'version':>7} {'mask':>4} {'qrcode ms':>10} {'vectorized ms':>13} {'fixed ms':>9} {'speedup':>8}")
+    for version in versions:
+        qr = qrcode.QRCode(version=version, error_correction=ERROR_CORRECT_M)
+        qr.add_data(util.QRData(_payload(version)))
+        qr.makeImpl(True, 0)
+        codewords = qr.data_cache
+
+        mask = qr.best_mask_pattern()
+        if best_mask_pattern(place_codewords(codewords, version), version) != mask:
+            raise AssertionError(f"Evaluators disagree for version {version}")
+
+        stock = min(timeit.repeat(qr.best_mask_pattern, number=1, repeat=repeat))
+        fast = min(timeit.repeat(lambda: build_matrix(codewords, version, ERROR_CORRECT_M),
+                                 number=1, repeat=repeat))
+        fixed = min(timeit.repeat(lambda: build_matrix(codewords, version, ERROR_CORRECT_M, mask),
+                                  number=1, repeat=repeat))
+        print(f"{version:>7} {mask:>4} {stock * 1000:>10.2f} {fast * 1000:>13.2f} {fixed * 1000:>9.2f} "
+              f"{stock / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--versions", type=int, nargs="+", default=VERSIONS, help="Versions to measure")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per case (best is reported)")
+    args = parser.parse_args()
+    benchmark(args.versions, args.repeat)
@@ -0,0 +1,43 @@
+"""
+Compares the stock qrcode PIL image factory with the NumPy rasterizer.
+
+Usage: python benchmarks/render_benchmark.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.app_logic.qrcode_engine import encode_matrix, render_image  # noqa: E402
+
+VERSIONS = (1, 10, 25, 40)
+BOX_SIZES = (1, 10, 40)
+COLORS = (("black", "white"), ("#FFFFFF", "#000000"))
+
+
+def benchmark(repeat):
+    """Times both backends for every version/box size/color combination and prints a table."""
+    print(f"{'version':>7} {'box':>4} {'colors':>17} {'pil ms':>9} {'numpy ms':>9} {'speedup':>8}")
+    for version in VERSIONS:
+        matrix = encode_matrix("A", version)
+        for box_size in BOX_SIZES:
+            for fill_color, bg_color in COLORS:
+                args = (matrix, box_size, 4, fill_color, bg_color)
+                # The NumPy backend returns a palette image, so compare the pixels' colors
+                expected = render_image(*args, backend="pil").convert("RGBA").tobytes()
+                if render_image(*args, backend="numpy").convert("RGBA").tobytes() != expected:
+                    raise AssertionError(f"Backends disagree for version {version}, box size {box_size}")
+
+                pil = min(timeit.repeat(lambda: render_image(*args, backend="pil"), number=1, repeat=repeat))
+                fast = min(timeit.repeat(lambda: render_image(*args, backend="numpy"), number=1, repeat=repeat))
+                print(f"{version:>7} {box_size:>4} {fill_color + '/' + bg_color:>17} "
+                      f"{pil * 1000:>9.2f} {fast * 1000:>9.2f} {pil / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per case (best is reported)")
+    benchmark(parser.parse_args().repeat)
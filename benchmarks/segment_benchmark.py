@@ -0,0 +1,67 @@
+"""
+Reports the QR versions saved by optimal segmentation on typical mixed payloads.
+
+For each payload and error correction level it prints the version needed when the
+whole payload is one segment (naive), with qrcode's own chunking (stock) and with the
+optimal segmentation the engine uses, plus the encode times of stock and engine.
+
+Usage: python benchmarks/segment_benchmark.py [--repeat N] [payload ...]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import qrcode  # noqa: E402
+from qrcode.constants import ERROR_CORRECT_H, ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q  # noqa: E402
+
+from src.app_logic.qrcode_engine import _encode_matrix  # noqa: E402
+from src.app_logic.qrcode_segments import segment_report  # noqa: E402
+
+PAYLOADS = (
+    "https://EXAMPLE.COM/ITEM/000123456789",
+    "https://example.com/item/000123456789012345678901234567",
+    "WIFI:S:Office;T:WPA;P:0123456789012345;;",
+    "SKU-4006381333931 LOT 20240517 QTY 000120",
+    "tel:+4930123456789012",
+    "BEGIN:VCARD\nVERSION:3.0\nN:Doe;Jane\nTEL:+1 555 0100 2000\nEND:VCARD",
+)
+ERROR_CORRECTION_LEVELS = (("L", ERROR_CORRECT_L), ("M", ERROR_CORRECT_M), ("Q", ERROR_CORRECT_Q),
+                           ("H", ERROR_CORRECT_H))
+
+
+def _stock_encode(data, error_correction):
+    """Encodes data the way the engine did before, with qrcode's default chunking; returns the version."""
+    qr = qrcode.QRCode(error_correction=error_correction)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.version
+
+
+def benchmark(payloads, repeat):
+    """Prints one row per payload and error correction level."""
+    print(f"{'ecc':>3} {'naive':>5} {'stock':>5} {'optimal':>7} {'modules saved':>13} "
+          f"{'stock ms':>8} {'engine ms':>9}  payload")
+    for data in payloads:
+        for name, error_correction in ERROR_CORRECTION_LEVELS:
+            report = segment_report(data, error_correction)
+            stock = _stock_encode(data, error_correction)
+            baseline = report["naive_version"] or stock
+            saved = (17 + 4 * baseline) ** 2 - (17 + 4 * report["version"]) ** 2
+
+            stock_time = min(timeit.repeat(lambda: _stock_encode(data, error_correction), number=1, repeat=repeat))
+            engine_time = min(timeit.repeat(lambda: _encode_matrix(data, None, error_correction, None),
+                                            number=1, repeat=repeat))
+            print(f"{name:>3} {report['naive_version'] or '-':>5} {stock:>5} {report['version']:>7} {saved:>13} "
+                  f"{stock_time * 1000:>8.2f} {engine_time * 1000:>9.2f}  {data[:40]!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("payloads", nargs="*", default=PAYLOADS, help="Payloads to report (default: built-in set)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per case (best is reported)")
+    args = parser.parse_args()
+    benchmark(args.payloads, args.repeat)
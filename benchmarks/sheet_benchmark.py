@@ -0,0 +1,61 @@
+"""
+Measures label sheet throughput and shows that memory stays flat as the job grows.
+
+For each format it writes jobs of increasing size to a temporary directory and prints
+codes per second, pages, file size and the peak memory traced while writing; the peak
+should not grow with the number of codes, as only one page is held at a time.
+
+Usage: python benchmarks/sheet_benchmark.py [--counts 1000 10000] [--formats pdf tiff]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.app_logic.label_sheet import SHEET_FORMATS, SheetLayout  # noqa: E402
+from src.app_logic.qrcode_engine import clear_matrix_cache, save_label_sheets  # noqa: E402
+
+
+def _labels(count):
+    """Yields (payload, caption) pairs shaped like a label run: a URL prefix plus a serial."""
+    for serial in range(count):
+        yield f"https://example.com/item/{serial:012d}", f"SN {serial:012d}"
+
+
+def benchmark(counts, formats, layout):
+    """Prints one row per format and job size."""
+    print(f"{'format':>6} {'codes':>7} {'pages':>6} {'codes/s':>8} {'MiB':>8} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in formats:
+            for count in counts:
+                path = os.path.join(directory, f"labels.{fmt}")
+                clear_matrix_cache()
+                started = time.perf_counter()
+                summary = save_label_sheets(_labels(count), path, layout)
+                elapsed = time.perf_counter() - started
+
+                # Traced separately, as tracing slows every allocation down
+                clear_matrix_cache()
+                tracemalloc.start()
+                save_label_sheets(_labels(count), path, layout)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                print(f"{fmt:>6} {count:>7} {summary['pages']:>6} {count / elapsed:>8.0f} "
+                      f"{summary['bytes'] / 2 ** 20:>8.2f} {peak / 2 ** 20:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=(1000, 10000), help="Codes per job")
+    parser.add_argument("--formats", nargs="+", choices=SHEET_FORMATS, default=SHEET_FORMATS,
+                        help="Sheet formats to measure")
+    parser.add_argument("--columns", type=int, default=4, help="Labels per row of a sheet")
+    parser.add_argument("--rows", type=int, default=6, help="Rows of labels per sheet")
+    args = parser.parse_args()
+    benchmark(args.counts, args.formats, SheetLayout(columns=args.columns, rows=args.rows))
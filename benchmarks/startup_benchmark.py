@@ -0,0 +1,211 @@
+"""
+Measures time-to-first-window and memory of the packaged application and tracks regressions.
+
+Builds the one-file and one-folder PyInstaller variants, launches each headless (Qt offscreen
+platform) with --startup-report --startup-exit, and records cold and warm time-to-first-window
+and peak RSS. Results are appended to a JSON history; the exit status is 1 when a variant is
+slower than the previous run on the same platform by more than the threshold.
+
+Time-to-first-window is measured from the launch, so it includes the one-file bootloader
+unpacking the bundle; "in process" starts when the Python code starts. Peak RSS is that of
+the application process, without the small one-file bootloader parent.
+
+Usage: python benchmarks/startup_benchmark.py [--variants onefile onedir source] [--runs N]
+                                              [--no-build] [--drop-caches] [--threshold 0.1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_NAME = "QRCodeGenerator"
+BUILD_DIR = os.path.join(ROOT, "build", "startup_benchmark")
+HISTORY_PATH = os.path.join(ROOT, "benchmarks", "startup_history.json")
+
+# "source" runs main.py with the current interpreter; it needs no build and isolates
+# the cost that packaging adds
+VARIANTS = ("onefile", "onedir", "source")
+LAUNCH_TIMEOUT = 120
+
+
+def _executable(variant):
+    """Returns the command line that launches a variant (mirrors setup.executable_path)."""
+    if variant == "source":
+        return [sys.executable, os.path.join(ROOT, "main.py")]
+    exe_name = APP_NAME + (".exe" if sys.platform == "win32" else "")
+    dist_path = os.path.join(BUILD_DIR, variant, "dist")
+    if variant == "onefile":
+        return [os.path.join(dist_path, exe_name)]
+    return [os.path.join(dist_path, APP_NAME, exe_name)]
+
+
+def _artifact_size(variant):
+    """Returns the size in bytes of the file or folder that is shipped for a variant."""
+    if variant == "source":
+        return None
+    path = _executable(variant)[0]
+    if variant == "onefile":
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(directory, name))
+               for directory, _, names in os.walk(os.path.dirname(path)) for name in names)
+
+
+def build(variant):
+    """Builds a variant with setup.py into its own dist and work directories."""
+    if variant == "source":
+        return
+    variant_dir = os.path.join(BUILD_DIR, variant)
+    command = [sys.executable, os.path.join(ROOT, "setup.py"), "--distpath", os.path.join(variant_dir, "dist"),
+               "--workpath", os.path.join(variant_dir, "work")]
+    if variant == "onedir":
+        command.append("--onedir")
+    print(f"Building {variant}...")
+    started = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    print(f"Built {variant} in {time.perf_counter() - started:.0f} s")
+
+
+def drop_caches():
+    """Evicts the OS page cache so the next launch reads every file from disk (Linux, root only)."""
+    try:
+        subprocess.run(["sync"], check=True)
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+def launch(variant):
+    """Launches a variant once and returns its time-to-first-window and peak RSS."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_path = os.path.join(temp_dir, "startup.json")
+        command = _executable(variant) + [f"--startup-report={report_path}", "--startup-exit"]
+
+        launched = time.time()
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True,
+                                timeout=LAUNCH_TIMEOUT)
+        exited = time.time()
+        if result.returncode != 0 or not os.path.exists(report_path):
+            raise RuntimeError(f"{variant} failed to start (exit code {result.returncode}):\n{result.stderr}")
+
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+
+    return {
+        "first_window_ms": (report["marks_epoch"]["first paint"] - launched) * 1000,
+        "in_process_ms": report["marks_ms"]["first paint"],
+        "total_ms": (exited - launched) * 1000,
+        "peak_rss_mib": report["peak_rss_bytes"] / 2 ** 20 if report.get("peak_rss_bytes") else None,
+    }
+
+
+def _summarize(runs):
+    """Returns the median of every metric over several launches."""
+    return {key: round(statistics.median(run[key] for run in runs), 1) if runs[0][key] is not None else None
+            for key in runs[0]}
+
+
+def measure(variant, warm_runs, cold_drop_caches):
+    """Measures one cold launch followed by warm_runs warm launches."""
+    dropped = drop_caches() if cold_drop_caches else False
+    cold = launch(variant)
+    warm = _summarize([launch(variant) for _ in range(warm_runs)])
+    return {
+        # Without a page-cache drop the "cold" run is only the first launch after the build
+        "cold": {**{key: round(value, 1) if value is not None else None for key, value in cold.items()},
+                 "page_cache_dropped": dropped},
+        "warm": warm,
+        "size_bytes": _artifact_size(variant),
+    }
+
+
+def _git_commit():
+    """Returns the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    """Reads the result history, returning an empty list if there is none yet."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def find_regressions(history, entry, threshold):
+    """Compares warm and cold time-to-first-window with the last run of each variant on this platform."""
+    regressions = []
+    for variant, result in entry["variants"].items():
+        previous = next((old["variants"][variant] for old in reversed(history)
+                         if old["platform"] == entry["platform"] and variant in old["variants"]), None)
+        if previous is None:
+            continue
+        for phase in ("warm", "cold"):
+            before = previous[phase]["first_window_ms"]
+            after = result[phase]["first_window_ms"]
+            if before and after > before * (1 + threshold):
+                regressions.append(f"{variant} {phase}: {before:.0f} ms -> {after:.0f} ms "
+                                   f"(+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=["onefile", "onedir"],
+                        help="Variants to measure")
+    parser.add_argument("--runs", type=int, default=5, help="Warm launches per variant (median is reported)")
+    parser.add_argument("--no-build", action="store_true", help="Measure the existing builds")
+    parser.add_argument("--drop-caches", action="store_true",
+                        help="Drop the OS page cache before each cold launch (Linux, needs root)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown that counts as a regression (default: 0.10)")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON file the results are appended to")
+    args = parser.parse_args()
+
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "platform": f"{platform.system()}-{platform.machine()}",
+        "python": platform.python_version(),
+        "variants": {},
+    }
+    for variant in args.variants:
+        if not args.no_build:
+            build(variant)
+        entry["variants"][variant] = result = measure(variant, args.runs, args.drop_caches)
+        size = f"{result['size_bytes'] / 2 ** 20:.1f} MiB" if result["size_bytes"] else "-"
+        for phase in ("cold", "warm"):
+            metrics = result[phase]
+            rss = f"{metrics['peak_rss_mib']:.1f} MiB" if metrics["peak_rss_mib"] else "-"
+            print(f"{variant:>8} {phase}: first window {metrics['first_window_ms']:8.1f} ms "
+                  f"(in process {metrics['in_process_ms']:7.1f} ms), peak RSS {rss}, size {size}")
+
+    history = load_history(args.history)
+    regressions = find_regressions(history, entry, args.threshold)
+    history.append(entry)
+    with open(args.history, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    print(f"Results appended to {args.history}")
+
+    if regressions:
+        print("Startup regressions:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,27 @@
-from PySide6.QtWidgets import QApplication, QMainWindow
-from PySide6.QtGui import QIcon
 import sys
+
+from src.app_logic.startup_profiler import STARTUP_EXIT_FLAG, profiler, report_path_from_args
+
+# The import hook has to be in place before anything heavy is imported
+_startup_report, _startup_report_path = report_path_from_args(sys.argv)
+_startup_exit = STARTUP_EXIT_FLAG in sys.argv
+if _startup_report:
+    profiler.install()
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication, QMainWindow
 from src.app_logic.logger import logger
 from src.app_logic.config import config
+from src.app_logic.resource_bundle import resource_bundle
 from src.app_logic.qrcode_logic import QRCodeManager
-from src.app_ui.ui_update_window import UpdateWindow
-from src.app_logic.update_logic import check_for_updates, is_version_discontinued
+from src.app_logic.update_logic import UpdateChecker
 
 
 def show_update_window(release_data, update_file_url, versions):
     """Displays the update dialog with version details."""
+    # Imported on demand: the dialog is rarely shown and is not needed for the first paint
+    from src.app_ui.ui_update_window import UpdateWindow
+
     update_dialog = UpdateWindow(release_data, update_file_url, versions)
     update_dialog.exec()
 
@@ -18,32 +30,73 @@ def load_qss(obj: QApplication, file_path: str):
     """Loads and applies a QSS stylesheet to the application."""
     log = logger
     try:
-        with open(file_path, "r") as f:
-            qss = f.read()
+        # Served from memory when the resources were compiled into the bundle
+        qss = resource_bundle.read_text(file_path)
         obj.setStyleSheet(qss)
         log.info("QSS loaded successfully from %s", file_path)
     except Exception as e:
         log.error("Failed to load QSS from %s: %s", file_path, str(e))
 
 
+class _FirstPaintWatcher(QObject):
+    """Calls back once, after the watched window has painted for the first time."""
+
+    def __init__(self, window, callback):
+        super().__init__(window)
+        self._callback = callback
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            # Let the paint event finish before reporting
+            QTimer.singleShot(0, self._callback)
+        return False
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self._log = logger
-        check_for_updates(config, self._log, show_update_window)
         self.qrcode_manager = QRCodeManager(self)
 
+        self._update_checker = UpdateChecker(config, self._log)
+        self._update_checker.update_available.connect(show_update_window)
+        self._update_checker.version_discontinued.connect(self._on_version_discontinued)
+
+    def start_update_check(self):
+        """Checks for updates in the background; results arrive via signals."""
+        self._update_checker.start()
+
+    def _on_version_discontinued(self, versions):
+        """Forces the update dialog for a discontinued version, then closes the app."""
+        show_update_window(None, None, versions)
+        self.close()
+
+
+def _on_first_paint(window):
+    """Starts deferred work once the window is on screen."""
+    if _startup_report:
+        profiler.mark("first paint")
+        # Later imports are not part of startup and should not pay for the hook
+        profiler.uninstall()
+        profiler.write_report(_startup_report_path)
+    if _startup_exit:
+        # Benchmark run: nothing after the first paint is being measured
+        QApplication.quit()
+        return
+    window.start_update_check()
+
 
 if __name__ == '__main__':
+    profiler.mark("imports done")
     app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon(config.icon_path))
+    app.setWindowIcon(resource_bundle.load_icon(config.icon_path))
 
     load_qss(app, config.qss_path)
 
-    if is_version_discontinued(config):
-        show_update_window(None, None, (config.app_version, ""))
-        sys.exit(0)
-
     window = MainWindow()
+    profiler.mark("window created")
+    _FirstPaintWatcher(window, lambda: _on_first_paint(window))
     window.show()
     sys.exit(app.exec())
@@ -11,8 +11,8 @@ import sys
 import PyInstaller.__main__
 
 
-def build_executable():
-    """Build the executable using PyInstaller"""
+def build_executable(onefile=True, dist_path='dist', work_path='build', bundle_resources=True):
+    """Build the executable using PyInstaller, as a single file or as a one-folder bundle"""
 
     # Application information
     APP_NAME = 'QRCodeGenerator'
@@ -22,11 +22,11 @@ def build_executable():
 
     # Define the build arguments
     args = [
-        '--onefile',  # Create a one-file bundled executable
+        '--onefile' if onefile else '--onedir',  # One-file executable or a folder with the executable
         '--windowed',  # Hide console window (GUI app)
         '--name=' + APP_NAME,  # Name of the executable
-        '--distpath=dist',  # Output directory
-        '--workpath=build',  # Temporary build directory
+        '--distpath=' + dist_path,  # Output directory
+        '--workpath=' + work_path,  # Temporary build directory
         '--specpath=.',  # Spec file location
         '--clean',  # Clean PyInstaller cache
         '--noconfirm',  # Replace output directory without asking
@@ -51,13 +51,30 @@ def build_executable():
         '--hidden-import=collections.abc',
         '--hidden-import=PIL',
         '--hidden-import=PIL.Image',
+        '--hidden-import=numpy',
 
         # Application modules
         '--hidden-import=src.app_logic.logger',
         '--hidden-import=src.app_logic.config',
+        '--hidden-import=src.app_logic.qrcode_engine',
+        '--hidden-import=src.app_logic.result_cache',
+        '--hidden-import=src.app_logic.qrcode_segments',
+        '--hidden-import=src.app_logic.qrcode_capacity',
+        '--hidden-import=src.app_logic.qrcode_mask',
+        '--hidden-import=src.app_logic.qrcode_codewords',
+        '--hidden-import=src.app_logic.qrcode_raster',
+        '--hidden-import=src.app_logic.qrcode_png',
+        '--hidden-import=src.app_logic.qrcode_vector',
+        '--hidden-import=src.app_logic.qrcode_tiff',
+        '--hidden-import=src.app_logic.label_sheet',
         '--hidden-import=src.app_logic.qrcode_logic',
+        '--hidden-import=src.app_logic.preview_logic',
         '--hidden-import=src.app_logic.update_logic',
+        '--hidden-import=src.app_logic.download_logic',
+        '--hidden-import=src.app_logic.startup_profiler',
+        '--hidden-import=src.app_logic.resource_bundle',
         '--hidden-import=src.app_ui.ui_update_window',
+        '--hidden-import=src.app_ui.ui_error_correction_profile',
 
         # Other dependencies
         '--hidden-import=requests',
@@ -105,6 +122,16 @@ def build_executable():
             if not os.path.exists(dir_name):
                 print(f"Warning: Required directory '{dir_name}' not found!")
 
+        # Compile the stylesheet, icon and config defaults into a module loaded from memory at startup
+        if bundle_resources:
+            from src.app_logic.resource_bundle import compile_bundle
+
+            print(f"Resource bundle: {compile_bundle()}")
+            args.insert(-1, '--hidden-import=src.app_logic._resources_data')
+        elif os.path.exists('src/app_logic/_resources_data.py'):
+            # A bundle left by an earlier build would otherwise be shipped and trusted as is
+            os.remove('src/app_logic/_resources_data.py')
+
         # Run PyInstaller
         print("Starting build process...")
         PyInstaller.__main__.run(args)
@@ -113,10 +140,10 @@ def build_executable():
         print("=" * 60)
         print("Build completed successfully!")
         print("=" * 60)
-        print(f"Executable location: {os.path.abspath('dist/' + APP_NAME + '.exe')}")
+        print(f"Executable location: {os.path.abspath(executable_path(APP_NAME, onefile, dist_path))}")
 
         # Create distribution files
-        create_distribution_files(APP_NAME, APP_VERSION, APP_AUTHOR)
+        create_distribution_files(APP_NAME, APP_VERSION, APP_AUTHOR, dist_path)
 
         print("\nDistribution files created successfully!")
         print("\nYour QR Code Generator is ready to distribute!")
@@ -126,7 +153,15 @@ def build_executable():
         sys.exit(1)
 
 
-def create_distribution_files(app_name, app_version, app_author):
+def executable_path(app_name, onefile=True, dist_path='dist'):
+    """Return the path of the built executable for a one-file or one-folder build"""
+    exe_name = app_name + ('.exe' if sys.platform == 'win32' else '')
+    if onefile:
+        return os.path.join(dist_path, exe_name)
+    return os.path.join(dist_path, app_name, exe_name)
+
+
+def create_distribution_files(app_name, app_version, app_author, dist_path='dist'):
     """Create additional distribution files"""
 
     # Create README for distribution
@@ -171,7 +206,7 @@ Licensed under MIT License - see LICENSE.txt for details.
 """
 
     try:
-        with open('dist/README_DIST.txt', 'w', encoding='utf-8') as f:
+        with open(os.path.join(dist_path, 'README_DIST.txt'), 'w', encoding='utf-8') as f:
             f.write(dist_readme)
     except Exception as e:
         print(f"Warning: Could not create dist README: {e}")
@@ -185,7 +220,7 @@ Licensed under MIT License - see LICENSE.txt for details.
     for src, dst in files_to_copy:
         try:
             if os.path.exists(src):
-                shutil.copy2(src, f'dist/{dst}')
+                shutil.copy2(src, os.path.join(dist_path, dst))
         except Exception as e:
             print(f"Warning: Could not copy {src}: {e}")
 
@@ -218,6 +253,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Build QR Code Generator executable')
     parser.add_argument('--clean', action='store_true', help='Clean build files after building')
     parser.add_argument('--test', action='store_true', help='Test the built executable')
+    parser.add_argument('--onedir', action='store_true',
+                        help='Build a one-folder bundle instead of a single file (no unpacking at launch)')
+    parser.add_argument('--distpath', default='dist', help='Output directory')
+    parser.add_argument('--workpath', default='build', help='Temporary build directory')
+    parser.add_argument('--no-resource-bundle', action='store_true',
+                        help='Read the stylesheet, icon and config.ini from disk at startup')
 
     args = parser.parse_args()
 
@@ -242,7 +283,8 @@ if __name__ == "__main__":
         print("Please place your style.qss file in resources/styles/ directory")
 
     # Build the executable
-    build_executable()
+    build_executable(onefile=not args.onedir, dist_path=args.distpath, work_path=args.workpath,
+                     bundle_resources=not args.no_resource_bundle)
 
     # Test the executable if requested
     if args.test:
@@ -250,7 +292,7 @@ if __name__ == "__main__":
         try:
             import subprocess
 
-            exe_path = 'dist/QRCodeGenerator.exe'
+            exe_path = executable_path('QRCodeGenerator', not args.onedir, args.distpath)
             if os.path.exists(exe_path):
                 print(f"Launching {exe_path} for testing...")
                 subprocess.Popen([exe_path])
@@ -0,0 +1,336 @@
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from src.app_logic.config import ERROR_CORRECTION_LEVELS, config
+from src.app_logic.logger import logger
+from src.app_logic.metrics import LatencyHistogram
+from src.app_logic.label_sheet import DEFAULT_DPI, PAGE_SIZES, POINTS_PER_MM, SheetLayout
+from src.app_logic.qrcode_engine import (EXPORT_FORMATS, MATRIX_CACHE_SIZE, RENDER_BACKENDS, create_qr_image,
+                                         export_format, prime_matrix_cache, save_label_sheets, save_qr_code)
+from src.app_logic.qrcode_mask import MASK_PATTERNS
+from src.app_logic.qrcode_png import PNG_FILTERS, ZLIB_STRATEGIES
+from src.app_logic.result_cache import result_cache, result_key
+
+# Per-row manifest columns that override the batch defaults
+INT_OPTIONS = ("version", "box_size", "border")
+STR_OPTIONS = ("fill_color", "bg_color", "error_correction")
+
+# Rows whose payloads are batch-encoded together; half the engine's matrix cache, so
+# every primed matrix is still cached when its row is written
+ENCODE_WINDOW = MATRIX_CACHE_SIZE // 2
+
+# "standard" saves the rendered PNG through PIL; "compact" streams 1-bit palette PNGs
+PNG_MODES = ("standard", "compact")
+
+
+def iter_manifest(path, manifest_format=None):
+    """
+    Streams manifest rows as dictionaries from a CSV or JSONL file.
+
+    The format is inferred from the file extension unless given explicitly. Rows are
+    read lazily so arbitrarily large manifests never have to fit in memory.
+    """
+    if manifest_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        manifest_format = "csv" if extension == ".csv" else "jsonl"
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if manifest_format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def _resolve_output_path(output_dir, filename, index, fmt="png"):
+    """Returns the output path for a row, refusing names that escape output_dir."""
+    filename = filename or str(index)
+    if not os.path.splitext(filename)[1]:
+        filename += "." + fmt
+    path = os.path.normpath(os.path.join(output_dir, filename))
+    if os.path.commonpath([os.path.abspath(path), os.path.abspath(output_dir)]) != os.path.abspath(output_dir):
+        raise ValueError(f"Output filename escapes the output directory: {filename}")
+    return path
+
+
+def _row_options(row, defaults):
+    """Merges per-row overrides into the default generation options."""
+    options = dict(defaults)
+    for key in INT_OPTIONS:
+        value = row.get(key)
+        if value not in (None, ""):
+            options[key] = int(value)
+    for key in STR_OPTIONS:
+        value = row.get(key)
+        if value:
+            options[key] = value
+    return options
+
+
+def _write_code(data, path, options, export):
+    """
+    Writes one code to path and returns its size in bytes.
+
+    The format follows the file extension; standard PNGs are rendered with the selected
+    backend and saved through PIL, everything else is written by save_qr_code. Both paths
+    reuse identical results from the result cache.
+    """
+    fmt = export_format(path)
+    if fmt != "png" or export["png_mode"] == "compact":
+        options = {key: value for key, value in options.items() if key != "backend"}
+        return save_qr_code(data, path, compress_level=export["compress_level"], filter_type=export["filter_type"],
+                            strategy=export["strategy"], fmt=fmt, **options)
+
+    def create():
+        buffer = io.BytesIO()
+        create_qr_image(data, **options).save(buffer, "PNG", compress_level=export["compress_level"])
+        return buffer.getvalue()
+
+    # Both backends produce identical images, so the backend is not part of the key
+    key = result_key(data=data, fmt="png", png_mode="standard", compress_level=export["compress_level"],
+                     **{key: value for key, value in options.items() if key != "backend"})
+    contents = result_cache.get_or_create(key, create) if result_cache.enabled else create()
+    with open(path, "wb") as f:
+        f.write(contents)
+    return len(contents)
+
+
+def _prime_matrices(rows, defaults):
+    """Batch-encodes the payloads of (index, row) pairs, grouped by their encoding options."""
+    groups = {}
+    for _, row in rows:
+        data = row.get("data") or row.get("payload")
+        try:
+            options = _row_options(row, defaults)
+        except ValueError:
+            continue
+        if data:
+            key = (options["version"], options.get("error_correction", "L"), options.get("mask_pattern"))
+            groups.setdefault(key, []).append(str(data))
+    for (version, error_correction, mask_pattern), payloads in groups.items():
+        try:
+            prime_matrix_cache(payloads, version, error_correction, mask_pattern)
+        except ValueError:
+            # An unknown error correction level; each of these rows reports it when written
+            continue
+
+
+def render_chunk(chunk, output_dir, defaults, export):
+    """
+    Renders a chunk of (index, row) pairs to image files inside a worker process.
+
+    Payloads are first encoded together, ENCODE_WINDOW rows at a time (see
+    qrcode_engine.encode_matrices), so each row only renders and writes its image.
+    Returns the latency histogram for the chunk, the total bytes written and a list of
+    (index, error) tuples, keeping the result sent back to the parent small regardless
+    of chunk size.
+    """
+    histogram = LatencyHistogram()
+    written = 0
+    errors = []
+    for position, (index, row) in enumerate(chunk):
+        if position % ENCODE_WINDOW == 0:
+            _prime_matrices(chunk[position:position + ENCODE_WINDOW], defaults)
+        start = time.perf_counter()
+        try:
+            data = row.get("data") or row.get("payload")
+            if not data:
+                raise ValueError("Missing 'data' column")
+            path = _resolve_output_path(output_dir, row.get("filename"), index, export["format"])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            written += _write_code(str(data), path, _row_options(row, defaults), export)
+        except Exception as e:
+            errors.append((index, str(e)))
+            continue
+        histogram.add(time.perf_counter() - start)
+    return histogram, written, errors
+
+
+def run_batch(manifest_path, output_dir, defaults, export, workers=None, chunk_size=64, manifest_format=None):
+    """
+    Renders every manifest row into output_dir using a process pool.
+
+    At most a few chunks per worker are in flight at any time, so memory stays bounded
+    however large the manifest is. Returns a summary dictionary.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 4
+
+    histogram = LatencyHistogram()
+    written = 0
+    failed = 0
+    rows = enumerate(iter_manifest(manifest_path, manifest_format), start=1)
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(render_chunk, chunk, output_dir, defaults, export))
+
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_histogram, chunk_written, errors = future.result()
+                histogram.merge(chunk_histogram)
+                written += chunk_written
+                failed += len(errors)
+                for index, error in errors:
+                    logger.error("Failed to render manifest row %d: %s", index, error)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "generated": histogram.count,
+        "failed": failed,
+        "elapsed": elapsed,
+        "codes_per_sec": histogram.count / elapsed if elapsed else 0.0,
+        "bytes": written,
+        "bytes_per_code": written / histogram.count if histogram.count else 0.0,
+        "p50": histogram.percentile(50),
+        "p99": histogram.percentile(99),
+    }
+
+
+def run_sheets(manifest_path, sheet_path, defaults, layout, dpi=DEFAULT_DPI, compress_level=None,
+               pages_per_file=0, manifest_format=None):
+    """
+    Tiles every manifest row onto label sheets in one PDF or TIFF file (see save_label_sheets).
+
+    Each row's 'caption' column, if any, is printed under its code. Rows are streamed
+    and pages written as they fill, so memory stays flat however large the manifest is.
+    Rows that cannot be encoded are logged, counted as failed and left off the sheets.
+    Per-row option overrides do not apply; every code uses the defaults. Returns a
+    summary dictionary.
+    """
+    failed = 0
+
+    def labels():
+        nonlocal failed
+        for index, row in enumerate(iter_manifest(manifest_path, manifest_format), start=1):
+            data = row.get("data") or row.get("payload")
+            if not data:
+                failed += 1
+                logger.error("Failed to render manifest row %d: Missing 'data' column", index)
+                continue
+            yield str(data), row.get("caption")
+
+    def encode_failed(data, error):
+        logger.error("Failed to encode label %.40r: %s", data, error)
+
+    options = {key: value for key, value in defaults.items() if key not in ("box_size", "backend")}
+    start = time.perf_counter()
+    summary = save_label_sheets(labels(), sheet_path, layout, dpi=dpi, compress_level=compress_level,
+                                pages_per_file=pages_per_file, on_error=encode_failed, **options)
+    elapsed = time.perf_counter() - start
+    return dict(summary, failed=failed + summary["failed"], elapsed=elapsed,
+                codes_per_sec=summary["labels"] / elapsed if elapsed else 0.0)
+
+
+def parse_args(argv=None):
+    """Parses the batch command-line arguments."""
+    parser = argparse.ArgumentParser(description="Render a CSV/JSONL manifest into a directory of QR code images")
+    parser.add_argument("manifest", help="CSV or JSONL file with 'data' and optional 'filename' columns")
+    parser.add_argument("-o", "--output-dir", default="qrcodes", help="Directory to write images into")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Manifest format (default: from extension)")
+    parser.add_argument("-j", "--workers", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Rows sent to a worker per task")
+    parser.add_argument("--version", type=int, default=config.qrcode_default_version,
+                        help="Minimum QR version; 0 picks the smallest version that fits each row")
+    parser.add_argument("--error-correction", choices=ERROR_CORRECTION_LEVELS, type=str.upper,
+                        default=config.qrcode_error_correction,
+                        help="Error correction level; rows may override it with an 'error_correction' column")
+    parser.add_argument("--mask-pattern", type=int, choices=MASK_PATTERNS,
+                        help="Use this mask pattern (0-7) instead of scoring all eight for every code")
+    parser.add_argument("--box-size", type=int, default=config.qrcode_default_box_size)
+    parser.add_argument("--border", type=int, default=config.qrcode_default_border_size)
+    parser.add_argument("--fill-color", default=config.qrcode_default_fill_color)
+    parser.add_argument("--bg-color", default=config.qrcode_default_bg_color)
+    parser.add_argument("--backend", choices=RENDER_BACKENDS, default=config.qrcode_render_backend,
+                        help="Rasterizer used to draw the modules (standard PNG mode only)")
+    parser.add_argument("--output-format", choices=EXPORT_FORMATS, default="png",
+                        help="File format for rows without a filename extension")
+    parser.add_argument("--png-mode", choices=PNG_MODES, default="standard",
+                        help="'compact' writes 1-bit palette PNGs straight from the module matrix")
+    parser.add_argument("--compress-level", type=int, default=config.qrcode_png_compress_level,
+                        help="zlib compression level (0-9) for PNG and PDF output")
+    parser.add_argument("--png-filter", choices=PNG_FILTERS, default=config.qrcode_png_filter,
+                        help="PNG row filter (compact PNG mode only)")
+    parser.add_argument("--zlib-strategy", choices=tuple(ZLIB_STRATEGIES), default=config.qrcode_png_strategy,
+                        help="zlib strategy (compact PNG mode only)")
+    sheets = parser.add_argument_group("label sheets", "Tile every code onto print-ready pages instead")
+    sheets.add_argument("--sheet", metavar="PATH",
+                        help="PDF or TIFF file to write the label sheets to (rows may set a 'caption' column)")
+    sheets.add_argument("--page-size", choices=tuple(PAGE_SIZES), default="a4")
+    sheets.add_argument("--columns", type=int, default=4, help="Labels per row of a sheet")
+    sheets.add_argument("--rows", type=int, default=6, help="Rows of labels per sheet")
+    sheets.add_argument("--margin-mm", type=float, default=10.0, help="Page margin in millimetres")
+    sheets.add_argument("--spacing-mm", type=float, default=0.0, help="Gap between labels in millimetres")
+    sheets.add_argument("--caption-size", type=float, default=8.0,
+                        help="Caption font size in points; 0 leaves no room for captions")
+    sheets.add_argument("--dpi", type=int, default=DEFAULT_DPI, help="Resolution of TIFF sheets")
+    sheets.add_argument("--pages-per-file", type=int, default=0,
+                        help="Split the sheets into numbered files of this many pages, each ready to print "
+                             "once full (default: one file)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the batch command line."""
+    args = parse_args(argv)
+    defaults = {
+        "version": args.version,
+        "box_size": args.box_size,
+        "border": args.border,
+        "fill_color": args.fill_color,
+        "bg_color": args.bg_color,
+        "backend": args.backend,
+        "error_correction": args.error_correction,
+        "mask_pattern": args.mask_pattern,
+    }
+    export = {
+        "format": args.output_format,
+        "png_mode": args.png_mode,
+        "compress_level": args.compress_level,
+        "filter_type": args.png_filter,
+        "strategy": args.zlib_strategy,
+    }
+
+    if args.sheet:
+        layout = SheetLayout(args.page_size, args.columns, args.rows, args.margin_mm * POINTS_PER_MM,
+                             args.spacing_mm * POINTS_PER_MM, args.caption_size)
+        summary = run_sheets(args.manifest, args.sheet, defaults, layout, args.dpi, args.compress_level,
+                             args.pages_per_file, args.format)
+        logger.info("Label sheets finished: %d labels on %d pages, %d failed in %.2fs.",
+                    summary["labels"], summary["pages"], summary["failed"], summary["elapsed"])
+
+        print(f"Labels:    {summary['labels']} on {summary['pages']} pages  Failed: {summary['failed']}")
+        print(f"Elapsed:   {summary['elapsed']:.2f} s")
+        print(f"Throughput: {summary['codes_per_sec']:.1f} codes/sec")
+        print(f"Output:    {summary['bytes']} bytes in {len(summary['files'])} file(s)")
+        return 1 if summary["failed"] else 0
+
+    summary = run_batch(args.manifest, args.output_dir, defaults, export, args.workers, args.chunk_size, args.format)
+    logger.info("Batch finished: %d generated, %d failed in %.2fs.",
+                summary["generated"], summary["failed"], summary["elapsed"])
+
+    print(f"Generated: {summary['generated']}  Failed: {summary['failed']}")
+    print(f"Elapsed:   {summary['elapsed']:.2f} s")
+    print(f"Throughput: {summary['codes_per_sec']:.1f} codes/sec")
+    print(f"Latency:   p50 {summary['p50'] * 1000:.2f} ms  p99 {summary['p99'] * 1000:.2f} ms")
+    print(f"Output:    {summary['bytes']} bytes, {summary['bytes_per_code']:.1f} bytes/code")
+    return 1 if summary["failed"] else 0
@@ -1,11 +1,15 @@
-import configparser
 import os
 import sys
 import logging
 
+from src.app_logic.resource_bundle import resource_bundle
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Error correction levels from lowest to highest; each recovers about 7, 15, 25 and 30 % damage
+ERROR_CORRECTION_LEVELS = ("L", "M", "Q", "H")
+
 
 class Config:
     """
@@ -15,14 +19,16 @@ class Config:
 
     def __init__(self):
         """Initializes and loads configuration settings with error handling."""
-        self._config = configparser.ConfigParser()
-
         # Determine base directory based on execution mode
         self._base_dir = self._get_base_directory()
 
-        # Load configuration file
+        # Load configuration, from the pre-compiled resource bundle when there is one
         self._config_path = os.path.join(self._base_dir, "resources", "config.ini")
-        self._load_config()
+        if resource_bundle.available:
+            self._config = resource_bundle.config
+            logging.info("Configuration loaded from the resource bundle.")
+        else:
+            self._config = self._load_config()
 
         # Load resource paths
         self.qss_path = self._get_path("PATHS", "QSS_PATH")
@@ -31,13 +37,33 @@ class Config:
         # Load application settings
         self.app_name = self._get_setting("SETTINGS", "APP_NAME", fallback="QRCodeGenerator")
         self.app_version = self._get_setting("SETTINGS", "APP_VERSION", fallback="1.0.2")
+        self.releases_cache_ttl = self._get_int_setting("SETTINGS", "RELEASES_CACHE_TTL", 3600)
 
         # Load QR code settings
-        self.qrcode_default_version = self._get_int_setting("DEFAULT", "QRCODE_DEFAULT_VERSION", 1)
+        self.qrcode_default_version = self._get_int_setting("DEFAULT", "QRCODE_DEFAULT_VERSION", 0)
         self.qrcode_default_box_size = self._get_int_setting("DEFAULT", "QRCODE_DEFAULT_BOX_SIZE", 10)
         self.qrcode_default_border_size = self._get_int_setting("DEFAULT", "QRCODE_DEFAULT_BORDER_SIZE", 4)
         self.qrcode_default_fill_color = self._get_setting("DEFAULT", "QRCODE_DEFAULT_FILL_COLOR", fallback="#FFFFFF")
         self.qrcode_default_bg_color = self._get_setting("DEFAULT", "QRCODE_DEFAULT_BG_COLOR", fallback="#000000")
+        self.qrcode_error_correction = self._get_error_correction_setting("DEFAULT", "QRCODE_ERROR_CORRECTION", "L")
+        self.qrcode_render_backend = self._get_setting("DEFAULT", "QRCODE_RENDER_BACKEND", fallback="pil")
+        self.qrcode_png_compress_level = self._get_int_setting("DEFAULT", "QRCODE_PNG_COMPRESS_LEVEL", 9)
+        self.qrcode_png_filter = self._get_setting("DEFAULT", "QRCODE_PNG_FILTER", fallback="up")
+        self.qrcode_png_strategy = self._get_setting("DEFAULT", "QRCODE_PNG_STRATEGY", fallback="default")
+
+        # Load logging settings
+        self.log_file = self._get_setting("LOGGING", "LOG_FILE", fallback="app.log")
+        self.log_level = self._get_setting("LOGGING", "LOG_LEVEL", fallback="DEBUG").strip().upper()
+        self.log_format = self._get_setting("LOGGING", "LOG_FORMAT", fallback="text").strip().lower()
+        self.log_max_mb = self._get_int_setting("LOGGING", "LOG_MAX_MB", 5)
+        self.log_rotate_when = self._get_setting("LOGGING", "LOG_ROTATE_WHEN", fallback="").strip()
+        self.log_backup_count = self._get_int_setting("LOGGING", "LOG_BACKUP_COUNT", 3)
+        self.log_sampling = self._get_sampling_setting("LOGGING", "LOG_SAMPLING", fallback="preview=20")
+
+        # Load rendered result cache settings
+        self.result_cache_mb = self._get_int_setting("DEFAULT", "RESULT_CACHE_MB", 32)
+        self.result_cache_dir = self._get_setting("DEFAULT", "RESULT_CACHE_DIR", fallback="")
+        self.result_cache_disk_mb = self._get_int_setting("DEFAULT", "RESULT_CACHE_DISK_MB", 256)
 
     @staticmethod
     def _get_base_directory():
@@ -47,32 +73,55 @@ class Config:
         return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
     def _load_config(self):
-        """Loads the configuration file with error handling."""
+        """Loads the configuration file with error handling and returns the parser."""
+        # Only needed without a resource bundle, so it is kept off the bundled startup path
+        import configparser
+
+        parser = configparser.ConfigParser()
         if not os.path.exists(self._config_path):
-            logging.error(f"Configuration file not found: {self._config_path}")
-            return
+            logging.error("Configuration file not found: %s", self._config_path)
+            return parser
 
         try:
-            self._config.read(self._config_path)
+            parser.read(self._config_path)
             logging.info("Configuration file loaded successfully.")
         except configparser.Error as e:
-            logging.error(f"Error reading configuration file: {e}")
+            logging.error("Error reading configuration file: %s", e)
+        return parser
 
     def _get_setting(self, section, key, fallback=None):
         """Retrieves a setting from the configuration file with fallback."""
-        try:
-            return self._config.get(section, key, fallback=fallback)
-        except (configparser.NoSectionError, configparser.NoOptionError) as e:
-            logging.warning(f"Missing setting [{section}] {key}: {e}")
-            return fallback
+        # With a fallback, missing sections and options never raise
+        return self._config.get(section, key, fallback=fallback)
 
     def _get_int_setting(self, section, key, fallback=0):
         """Retrieves an integer setting from the configuration file with fallback."""
         try:
             return self._config.getint(section, key, fallback=fallback)
-        except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
-            logging.warning(f"Invalid integer setting [{section}] {key}: {e}")
+        except ValueError as e:
+            logging.warning("Invalid integer setting [%s] %s: %s", section, key, e)
+            return fallback
+
+    def _get_error_correction_setting(self, section, key, fallback="L"):
+        """Retrieves an error correction level (L, M, Q or H) from the configuration file with fallback."""
+        value = self._get_setting(section, key, fallback=fallback).strip().upper()
+        if value not in ERROR_CORRECTION_LEVELS:
+            logging.warning("Invalid error correction level [%s] %s: %s", section, key, value)
             return fallback
+        return value
+
+    def _get_sampling_setting(self, section, key, fallback=""):
+        """Retrieves comma-separated event=N pairs (keep one in N records of the event) as a dictionary."""
+        rates = {}
+        for pair in self._get_setting(section, key, fallback=fallback).split(","):
+            if not pair.strip():
+                continue
+            event, _, rate = pair.partition("=")
+            try:
+                rates[event.strip()] = int(rate)
+            except ValueError:
+                logging.warning("Invalid sampling rate [%s] %s: %s", section, key, pair.strip())
+        return rates
 
     def _get_path(self, section, key):
         """Retrieves a file path from the configuration file and resolves its absolute path."""
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+# (connect, read) timeouts in seconds for download requests
+DOWNLOAD_TIMEOUT = (5, 30)
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed or fails verification."""
+
+
+class RangeDownloader:
+    """
+    Downloads a file over several parallel HTTP Range requests.
+
+    Segments are written into a preallocated ".part" file next to the target. Their
+    progress is persisted to a small state file, so an interrupted download resumes
+    where it stopped, even after a restart. Servers without range support fall back to
+    a single stream. The finished file is optionally checked against a SHA-256 digest
+    before it is moved into place.
+    """
+
+    PART_SUFFIX = ".part"
+    STATE_SUFFIX = ".part.json"
+
+    def __init__(self, url, path, segments=4, chunk_size=64 * 1024, timeout=DOWNLOAD_TIMEOUT,
+                 progress_callback=None, progress_interval=0.1, state_interval=1.0):
+        """Initializes the downloader; progress_callback(downloaded, total) is rate limited."""
+        self._url = url
+        self._path = path
+        self._part_path = path + self.PART_SUFFIX
+        self._state_path = path + self.STATE_SUFFIX
+        self._segment_count = max(1, segments)
+        self._chunk_size = chunk_size
+        self._timeout = timeout
+        self._progress_callback = progress_callback
+        self._progress_interval = progress_interval
+        self._state_interval = state_interval
+
+        self._lock = threading.Lock()
+        self._state = None
+        self._downloaded = 0
+        self._total = 0
+        self._last_progress = 0.0
+        self._last_state_save = 0.0
+
+    def download(self, expected_sha256=None):
+        """Downloads, verifies and moves the file into place; returns its path."""
+        url, size, accepts_ranges, etag = self._probe()
+
+        if size and accepts_ranges:
+            self._download_ranges(url, size, etag)
+        else:
+            self._download_stream(url)
+
+        self._report_progress(force=True)
+        if expected_sha256:
+            actual = self._sha256(self._part_path)
+            if actual.lower() != expected_sha256.lower():
+                self._discard()
+                raise DownloadError(f"Checksum mismatch: expected {expected_sha256}, got {actual}")
+
+        os.replace(self._part_path, self._path)
+        self._remove_state()
+        return self._path
+
+    def _probe(self):
+        """
+        Resolves redirects and returns (url, size, accepts_ranges, etag).
+
+        Some CDNs reject HEAD (e.g. with 403 or 405); the size is then unknown and the
+        file is fetched with a single streaming GET, which reports any real error.
+        """
+        try:
+            response = requests.head(self._url, allow_redirects=True, timeout=self._timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            return self._url, 0, False, None
+        size = int(response.headers.get("Content-Length") or 0)
+        accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+        return response.url, size, accepts_ranges, response.headers.get("ETag")
+
+    def _download_ranges(self, url, size, etag):
+        """Fetches all incomplete segments in parallel threads."""
+        state = self._load_state()
+        if not state or state.get("size") != size or state.get("etag") != etag \
+                or not os.path.exists(self._part_path):
+            state = {"size": size, "etag": etag, "segments": self._plan_segments(size)}
+            with open(self._part_path, "wb") as f:
+                f.truncate(size)
+
+        self._state = state
+        self._total = size
+        self._downloaded = sum(segment["done"] for segment in state["segments"])
+        self._save_state()
+
+        errors = []
+        threads = [
+            threading.Thread(target=self._run_segment, args=(url, segment, errors), daemon=True)
+            for segment in state["segments"] if segment["start"] + segment["done"] <= segment["end"]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self._save_state()
+        if errors:
+            raise DownloadError(f"Download interrupted, will resume on retry: {errors[0]}")
+
+    def _plan_segments(self, size):
+        """Splits the file into contiguous, inclusive byte ranges."""
+        step = -(-size // self._segment_count)
+        return [{"start": start, "end": min(start + step, size) - 1, "done": 0} for start in range(0, size, step)]
+
+    def _run_segment(self, url, segment, errors):
+        """Downloads the remainder of one segment, recording any error."""
+        try:
+            start = segment["start"] + segment["done"]
+            headers = {"Range": f"bytes={start}-{segment['end']}"}
+            with requests.get(url, headers=headers, stream=True, timeout=self._timeout) as response:
+                if response.status_code != 206:
+                    raise DownloadError(f"Server ignored range request (HTTP {response.status_code})")
+                with open(self._part_path, "r+b") as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=self._chunk_size):
+                        f.write(chunk)
+                        f.flush()
+                        with self._lock:
+                            segment["done"] += len(chunk)
+                            self._downloaded += len(chunk)
+                        self._report_progress()
+
+            if segment["start"] + segment["done"] <= segment["end"]:
+                raise DownloadError("Connection closed before the segment was complete")
+        except Exception as e:
+            with self._lock:
+                errors.append(str(e))
+
+    def _download_stream(self, url):
+        """Downloads the whole file over a single connection."""
+        self._remove_state()
+        with requests.get(url, stream=True, timeout=self._timeout) as response:
+            response.raise_for_status()
+            self._total = int(response.headers.get("Content-Length") or 0)
+            self._downloaded = 0
+            with open(self._part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self._chunk_size):
+                    f.write(chunk)
+                    self._downloaded += len(chunk)
+                    self._report_progress()
+
+        if self._total and self._downloaded != self._total:
+            raise DownloadError(f"Incomplete download: {self._downloaded} of {self._total} bytes")
+
+    def _report_progress(self, force=False):
+        """Invokes the progress callback and saves resume state at a limited rate."""
+        now = time.monotonic()
+        with self._lock:
+            report = force or now - self._last_progress >= self._progress_interval
+            if report:
+                self._last_progress = now
+            save = self._state is not None and now - self._last_state_save >= self._state_interval
+            if save:
+                self._last_state_save = now
+            downloaded, total = self._downloaded, self._total
+
+        if save:
+            self._save_state()
+        if report and self._progress_callback:
+            self._progress_callback(downloaded, total)
+
+    def _load_state(self):
+        """Reads the resume state, returning None if it is missing or unreadable."""
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self):
+        """Persists segment progress so a later run can resume."""
+        with self._lock:
+            data = json.dumps(self._state)
+        try:
+            with open(self._state_path, "w", encoding="utf-8") as f:
+                f.write(data)
+        except OSError:
+            pass
+
+    def _remove_state(self):
+        """Deletes the resume state file if present."""
+        try:
+            os.remove(self._state_path)
+        except OSError:
+            pass
+
+    def _discard(self):
+        """Deletes the partial file and its state so the next attempt starts fresh."""
+        self._remove_state()
+        try:
+            os.remove(self._part_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _sha256(path):
+        """Computes the SHA-256 hex digest of a file."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
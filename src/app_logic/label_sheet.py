@@ -0,0 +1,284 @@
+import numpy as np
+
+from src.app_logic.qrcode_raster import module_rows, parse_color
+from src.app_logic.qrcode_tiff import DEFAULT_TIFF_COMPRESS_LEVEL, TiffWriter
+from src.app_logic.qrcode_vector import DEFAULT_PDF_COMPRESS_LEVEL, PdfWriter, pdf_color, pdf_symbol_content
+
+# Page sizes in points (1/72 inch), portrait
+PAGE_SIZES = {
+    "a4": (595.28, 841.89),
+    "letter": (612.0, 792.0),
+}
+
+# File formats written by write_label_sheets
+SHEET_FORMATS = ("pdf", "tiff")
+
+POINTS_PER_MM = 72 / 25.4
+
+# Caption line height as a multiple of the font size
+CAPTION_LEADING = 1.4
+
+DEFAULT_DPI = 300
+
+# Helvetica advance widths (1/1000 em) of the printable ASCII characters, from its AFM metrics
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_DEFAULT_WIDTH = 556
+
+_PDF_FONT = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+
+
+class SheetLayout:
+    """
+    Grid of equal label cells on a page, each holding one code with an optional caption below.
+
+    All measures are in points. Cells fill the page inside the margins, separated by
+    spacing; each code is the largest square that fits its cell above the caption line,
+    centered horizontally. A caption_size of 0 leaves no room for captions.
+    """
+
+    def __init__(self, page_size="a4", columns=4, rows=6, margin=10 * POINTS_PER_MM, spacing=0.0,
+                 caption_size=8.0):
+        """Validates the layout and computes the size of its cells and codes."""
+        if page_size not in PAGE_SIZES:
+            raise ValueError(f"Unknown page size: {page_size}")
+        if columns < 1 or rows < 1:
+            raise ValueError("A sheet needs at least one row and one column")
+        self.page_size = page_size
+        self.width, self.height = PAGE_SIZES[page_size]
+        self.columns = columns
+        self.rows = rows
+        self.margin = margin
+        self.spacing = spacing
+        self.caption_size = caption_size
+
+        self.cell_width = (self.width - 2 * margin - (columns - 1) * spacing) / columns
+        self.cell_height = (self.height - 2 * margin - (rows - 1) * spacing) / rows
+        self.caption_height = caption_size * CAPTION_LEADING if caption_size > 0 else 0.0
+        self.symbol_extent = min(self.cell_width, self.cell_height - self.caption_height)
+        if self.symbol_extent <= 0:
+            raise ValueError("The cells are too small for a code; use fewer rows or columns or smaller margins")
+
+    @property
+    def per_page(self):
+        """Returns the number of labels on one page."""
+        return self.columns * self.rows
+
+    def slots(self):
+        """
+        Yields (x, y, extent, caption_x, caption_y) for every cell, row by row from the top left.
+
+        (x, y) is the lower-left corner of the code square and (caption_x, caption_y) the
+        center of the caption's baseline, both with the PDF origin at the bottom left.
+        """
+        for row in range(self.rows):
+            top = self.height - self.margin - row * (self.cell_height + self.spacing)
+            for column in range(self.columns):
+                left = self.margin + column * (self.cell_width + self.spacing)
+                x = left + (self.cell_width - self.symbol_extent) / 2
+                y = top - self.symbol_extent
+                caption_y = y - self.caption_height + (self.caption_height - self.caption_size) / 2
+                yield x, y, self.symbol_extent, left + self.cell_width / 2, caption_y
+
+
+def _helvetica_width(text, size):
+    """Returns the width in points of text set in Helvetica."""
+    widths = sum(_HELVETICA_WIDTHS[ord(char) - 32] if " " <= char <= "~" else _HELVETICA_DEFAULT_WIDTH
+                 for char in text)
+    return widths * size / 1000
+
+
+def fit_caption(text, max_width, measure):
+    """Returns text, shortened with a trailing "..." if measure(text) is wider than max_width."""
+    text = " ".join(str(text).split())
+    if measure(text) <= max_width:
+        return text
+    while text and measure(text + "...") > max_width:
+        text = text[:-1]
+    return text + "..." if text else ""
+
+
+def _pdf_string(text):
+    """Returns text as a PDF literal string in WinAnsi encoding."""
+    data = text.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class PdfSheetWriter:
+    """
+    Writes label sheets as vector PDF pages through a streaming PdfWriter.
+
+    The page is painted with bg_color, like a TiffSheetWriter page, and captions are set
+    in fill_color, which contrasts with it as the codes' modules do. Codes are drawn with
+    pdf_symbol_content at the layout's slots and captions use the standard Helvetica
+    font, so no font is embedded. Each page is written as soon as it is added.
+    """
+
+    def __init__(self, stream, layout, border=4, fill_color="black", bg_color="white",
+                 compress_level=DEFAULT_PDF_COMPRESS_LEVEL):
+        """Starts the PDF and writes the shared caption font."""
+        self._writer = PdfWriter(stream, compress_level)
+        self._layout = layout
+        self._slots = list(layout.slots())
+        self._border = border
+        self._fill_color = fill_color
+        self._bg_color = bg_color
+        self._resources = b"<< >>"
+        if layout.caption_size > 0:
+            font_id = self._writer.add_object(_PDF_FONT)
+            self._resources = b"<< /Font << /F1 %d 0 R >> >>" % font_id
+        self.pages = 0
+
+    def add_page(self, labels):
+        """Writes one page holding (matrix, caption) pairs, at most layout.per_page of them."""
+        layout = self._layout
+        parts = []
+        if parse_color(self._bg_color)[3]:
+            page = f"{pdf_color(self._bg_color, 'rg')}\n0 0 {layout.width:.2f} {layout.height:.2f} re f"
+            parts.append(page.encode("ascii"))
+        captions = []
+        for (matrix, caption), (x, y, extent, caption_x, caption_y) in zip(labels, self._slots):
+            box_size = extent / (len(matrix) + 2 * self._border)
+            parts.append(pdf_symbol_content(matrix, x, y, box_size, self._border, self._fill_color, self._bg_color))
+            if caption and layout.caption_size > 0:
+                text = fit_caption(caption, layout.cell_width,
+                                   lambda value: _helvetica_width(value, layout.caption_size))
+                left = caption_x - _helvetica_width(text, layout.caption_size) / 2
+                captions.append(f"1 0 0 1 {left:.2f} {caption_y:.2f} Tm ".encode("ascii") + _pdf_string(text) + b" Tj")
+        if captions:
+            header = f"BT\n/F1 {layout.caption_size:.4g} Tf\n{pdf_color(self._fill_color, 'rg')}\n"
+            parts.append(header.encode("ascii") + b"\n".join(captions) + b"\nET")
+        self._writer.add_page(layout.width, layout.height, b"\n".join(parts), self._resources)
+        self.pages += 1
+
+    def close(self):
+        """Finishes the PDF and returns the bytes written."""
+        return self._writer.close()
+
+
+class TiffSheetWriter:
+    """
+    Writes label sheets as 1-bit pages of a multi-page TIFF at a given resolution.
+
+    Each page is rasterized into one (height, width) pixel buffer on a bg_color ground,
+    codes with a whole number of pixels per module so they stay sharp and captions in
+    fill_color, then compressed and handed to a streaming TiffWriter; only that buffer
+    and one compressed page are held in memory.
+    """
+
+    def __init__(self, stream, layout, border=4, fill_color="black", bg_color="white", dpi=DEFAULT_DPI,
+                 compress_level=DEFAULT_TIFF_COMPRESS_LEVEL):
+        """Starts the TIFF and loads the caption font at the page resolution."""
+        self._writer = TiffWriter(stream, compress_level)
+        self._layout = layout
+        self._border = border
+        self._fill_color = fill_color
+        self._bg_color = bg_color
+        self._dpi = dpi
+        self._scale = dpi / 72
+        self._size = (round(layout.width * self._scale), round(layout.height * self._scale))
+        self._slots = [tuple(round(value * self._scale) for value in slot) for slot in layout.slots()]
+        self._font = None
+        self._glyphs = {}
+        if layout.caption_size > 0:
+            # Only needed for captions; PIL is already loaded by the qrcode stack
+            from PIL import ImageFont
+            self._font = ImageFont.load_default(size=max(1, round(layout.caption_size * self._scale)))
+        self.pages = 0
+
+    def add_page(self, labels):
+        """Writes one page holding (matrix, caption) pairs, at most layout.per_page of them."""
+        width, height = self._size
+        page = np.zeros((height, width), dtype=np.uint8)
+        for (matrix, caption), (x, y, extent, caption_x, caption_y) in zip(labels, self._slots):
+            modules = len(matrix) + 2 * self._border
+            box_size = max(1, extent // modules)
+            size = modules * box_size
+            left = x + (extent - size) // 2
+            top = height - y - extent + (extent - size) // 2
+            page[top:top + size, left:left + size] = np.repeat(module_rows(matrix, box_size, self._border),
+                                                               box_size, axis=0)[:height - top, :width - left]
+            if caption and self._font is not None:
+                self._draw_caption(page, caption, caption_x, height - caption_y)
+        self._writer.add_page(page, self._fill_color, self._bg_color, self._dpi)
+        self.pages += 1
+
+    def _glyph(self, char):
+        """Returns (left, top, pixels, advance) of a character, rendered once and cached."""
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            from PIL import Image, ImageDraw
+
+            left, top, right, bottom = self._font.getbbox(char, anchor="ls")
+            image = Image.new("1", (max(right - left, 1), max(bottom - top, 1)), 0)
+            ImageDraw.Draw(image).text((-left, -top), char, fill=1, font=self._font, anchor="ls")
+            glyph = self._glyphs[char] = (left, top, np.asarray(image, dtype=np.uint8), self._font.getlength(char))
+        return glyph
+
+    def _text_width(self, text):
+        """Returns the width in pixels of text set from cached glyphs."""
+        return sum(self._glyph(char)[3] for char in text)
+
+    def _draw_caption(self, page, caption, center_x, baseline_y):
+        """
+        Draws a caption centered on center_x with its baseline at row baseline_y.
+
+        Captions are set glyph by glyph from a per-character cache (without kerning), as
+        rendering every caption through FreeType would dominate the cost of a page.
+        """
+        text = fit_caption(caption, round(self._layout.cell_width * self._scale), self._text_width)
+        pen = center_x - self._text_width(text) / 2
+        for char in text:
+            left, top, pixels, advance = self._glyph(char)
+            _blit(page, pixels, round(pen) + left, baseline_y + top)
+            pen += advance
+
+    def close(self):
+        """Finishes the TIFF and returns the bytes written."""
+        return self._writer.close()
+
+
+def _blit(page, pixels, left, top):
+    """ORs a small bitmap into the page with its top-left corner at (left, top), clipped to the page."""
+    rows = slice(max(top, 0), min(top + pixels.shape[0], page.shape[0]))
+    columns = slice(max(left, 0), min(left + pixels.shape[1], page.shape[1]))
+    if rows.start < rows.stop and columns.start < columns.stop:
+        page[rows, columns] |= pixels[rows.start - top:rows.stop - top, columns.start - left:columns.stop - left]
+
+
+def sheet_writer(stream, layout, fmt="pdf", border=4, fill_color="black", bg_color="white", dpi=DEFAULT_DPI,
+                 compress_level=None):
+    """Returns a PdfSheetWriter or TiffSheetWriter; compress_level None uses the format's default."""
+    if fmt == "pdf":
+        return PdfSheetWriter(stream, layout, border, fill_color, bg_color,
+                              DEFAULT_PDF_COMPRESS_LEVEL if compress_level is None else compress_level)
+    if fmt == "tiff":
+        return TiffSheetWriter(stream, layout, border, fill_color, bg_color, dpi,
+                               DEFAULT_TIFF_COMPRESS_LEVEL if compress_level is None else compress_level)
+    raise ValueError(f"Unknown sheet format: {fmt}")
+
+
+def write_label_sheets(labels, stream, layout, fmt="pdf", border=4, fill_color="black", bg_color="white",
+                       dpi=DEFAULT_DPI, compress_level=None):
+    """
+    Tiles (matrix, caption) pairs onto pages and writes them to a PDF or TIFF stream.
+
+    labels may be any iterable (e.g. a generator); only one page of labels is held at a
+    time and each page is written as soon as it is full. Returns the bytes written.
+    """
+    writer = sheet_writer(stream, layout, fmt, border, fill_color, bg_color, dpi, compress_level)
+    page = []
+    for label in labels:
+        page.append(label)
+        if len(page) == layout.per_page:
+            writer.add_page(page)
+            page = []
+    if page or not writer.pages:
+        writer.add_page(page)
+    return writer.close()
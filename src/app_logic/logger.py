@@ -1,55 +1,232 @@
+import atexit
+import itertools
 import logging
 import os
+import queue
+import sys
+import threading
+
+from src.app_logic.config import config
+
+# Records waiting for the writer thread; when it is full new records are dropped, never waited for
+LOG_QUEUE_SIZE = 10000
+
+# Queued by stop() to end the writer thread
+_STOP = object()
+
+CONSOLE_FORMAT = "%(name)s - %(levelname)s - %(message)s"
+FILE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def _is_worker_process():
+    """
+    Returns True in a process started by multiprocessing, such as a batch or server worker.
+
+    Such a process has multiprocessing imported before it loads this module, so the
+    check never imports it on the GUI's startup path.
+    """
+    multiprocessing = sys.modules.get("multiprocessing")
+    return multiprocessing is not None and multiprocessing.parent_process() is not None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every n records of high-frequency events.
+
+    A record takes part when it is logged with extra={"event": name} and name has a rate
+    in rates; the first record of the event and every n-th one after it pass, marked
+    with the sample_rate they stand for. Other records always pass.
+    """
+
+    def __init__(self, rates):
+        """Initializes one counter per sampled event."""
+        super().__init__()
+        self._rates = {event: rate for event, rate in rates.items() if rate > 1}
+        self._counters = {event: itertools.count() for event in self._rates}
+
+    def filter(self, record):
+        """Returns False for the records of a sampled event that are skipped."""
+        event = getattr(record, "event", None)
+        if event not in self._rates:
+            return True
+        # next() on itertools.count is atomic, so no lock is needed across threads
+        if next(self._counters[event]) % self._rates[event]:
+            return False
+        record.sample_rate = self._rates[event]
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, for log shippers."""
+
+    def format(self, record):
+        """Returns the record as a single-line JSON object."""
+        # Imported here, on the writer thread, to keep them off the startup path
+        import json
+        from datetime import datetime, timezone
+
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key in ("event", "sample_rate"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.Handler):
+    """Hands records to the writer thread unformatted and never blocks the logging thread."""
+
+    def __init__(self, log_queue):
+        """Initializes the handler and its count of dropped records."""
+        super().__init__()
+        self.queue = log_queue
+        self.dropped = 0
+
+    def emit(self, record):
+        """Queues the record, dropping it if the writer thread has fallen too far behind."""
+        # The record is formatted by the writer thread's handlers, so it is queued as is
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 
 class Logger:
     """
     Logger setup class to configure logging for the application.
-    Supports both console and file logging with different log levels.
-    """
 
-    LOG_FILE_NAME = "app.log"
+    Records are put on a bounded queue by the logging thread and written by a writer
+    thread to the console (warnings and above) and to a rotating log file, so no file
+    I/O happens on the GUI thread. The writer thread also builds the file handler, so
+    logging.handlers is not imported on the startup path. Rotation, format (text or
+    JSON lines) and per-event sampling come from the [LOGGING] section of config.ini.
+    """
 
-    def __init__(self):
-        """Initializes the logger with console and file handlers."""
+    def __init__(self, _config=config):
+        """Initializes the logger with its queue, handlers and writer thread."""
+        self._config = _config
         self._logger = logging.getLogger("QRCodeGenerator")
         self._logger.setLevel(logging.DEBUG)
+        # The console handler below replaces the root logger's, so records are not printed twice
+        self._logger.propagate = False
+        self._queue_handler = None
+        self._console_handler = None
+        self._writer = None
 
         # Prevent duplicate handlers in case of multiple logger instances
-        if not self._logger.hasHandlers():
+        if not self._logger.handlers:
             self._setup_handlers()
 
     def _setup_handlers(self):
-        """Sets up logging handlers for console and file logging."""
-        log_dir = self._get_log_directory()
-        log_file_path = os.path.join(log_dir, self.LOG_FILE_NAME)
+        """Sets up the queue handler, the console handler and the writer thread."""
+        # Console handler (Warning and above)
+        self._console_handler = logging.StreamHandler()
+        self._console_handler.setLevel(logging.WARNING)
+        self._console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+        self._queue_handler = _QueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        self._queue_handler.addFilter(SamplingFilter(self._config.log_sampling))
+        self._logger.addHandler(self._queue_handler)
+        # File rotation is not safe across processes, so workers leave the log file to the parent
+        self._start_writer(log_to_file=not _is_worker_process())
+
+        atexit.register(self.stop)
+        if hasattr(os, "register_at_fork"):
+            # A forked worker inherits the queue but not the writer thread, and must not share the file
+            os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _create_file_handler(self):
+        """Returns a size- or time-rotating file handler, or None if file logging is disabled."""
+        log_file = self._config.log_file
+        if not log_file:
+            return None
+        log_file_path = os.path.join(self._get_log_directory(), log_file)
 
         try:
-            os.makedirs(log_dir, exist_ok=True)
+            os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
         except OSError as e:
             print(f"Error creating log directory: {e}")
+            return None
 
-        # Console handler (Warning and above)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.WARNING)
-        console_format = logging.Formatter("%(name)s - %(levelname)s - %(message)s")
-        console_handler.setFormatter(console_format)
+        # Only needed for the file handler, which is built on the writer thread
+        import logging.handlers
+
+        # delay: the file is opened when the first record arrives
+        if self._config.log_rotate_when:
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                log_file_path, when=self._config.log_rotate_when, backupCount=self._config.log_backup_count,
+                encoding="utf-8", delay=True)
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file_path, maxBytes=int(self._config.log_max_mb * 2 ** 20),
+                backupCount=self._config.log_backup_count, encoding="utf-8", delay=True)
+
+        level = logging.getLevelName(self._config.log_level)
+        file_handler.setLevel(level if isinstance(level, int) else logging.DEBUG)
+        if self._config.log_format == "json":
+            file_handler.setFormatter(JsonLinesFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        return file_handler
+
+    def _start_writer(self, log_to_file=True):
+        """Starts the writer thread that passes queued records to the handlers."""
+        self._writer = threading.Thread(target=self._write_records, args=(self._queue_handler.queue, log_to_file),
+                                        name="LogWriter", daemon=True)
+        self._writer.start()
 
-        # File handler (Logs everything)
-        file_handler = logging.FileHandler(log_file_path, encoding="utf-8")
-        file_handler.setLevel(logging.DEBUG)
-        file_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(file_format)
+    def _write_records(self, log_queue, log_to_file):
+        """Runs on the writer thread: builds the file handler, then writes records until stop()."""
+        handlers = [self._console_handler]
+        file_handler = self._create_file_handler() if log_to_file else None
+        if file_handler is not None:
+            handlers.append(file_handler)
 
-        # Attach handlers to logger
-        self._logger.addHandler(console_handler)
-        self._logger.addHandler(file_handler)
+        while True:
+            record = log_queue.get()
+            if record is _STOP:
+                return
+            for handler in handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def _restart_in_child(self):
+        """
+        Gives a forked child process its own queue and a writer thread for the console only.
+
+        Like a spawned worker, a forked one leaves the log file to the parent; its warnings
+        and errors still reach the console.
+        """
+        self._queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        self._start_writer(log_to_file=False)
+
+    def stop(self):
+        """Writes the records still queued and stops the writer thread."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue_handler.queue.put(_STOP)
+            writer.join()
 
     @staticmethod
     def _get_log_directory():
-        """Determines and returns the correct log directory path."""
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-        return base_dir
+        """
+        Determines and returns the directory relative log file paths start from.
+
+        That is the application directory in a source checkout. A packaged executable
+        runs from a temporary directory, so it logs to the per-user data directory.
+        """
+        if getattr(sys, "frozen", False):
+            base_dir = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_STATE_HOME") \
+                or os.path.join(os.path.expanduser("~"), ".local", "state")
+            return os.path.join(base_dir, "QRCodeGenerator")
+        return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
     def get_logger(self):
         """Returns the configured logger instance."""
@@ -0,0 +1,75 @@
+import math
+
+
+class LatencyHistogram:
+    """
+    Log-scale latency histogram that estimates percentiles in constant memory.
+
+    Buckets grow geometrically by `growth`, so any reported percentile is within
+    that relative error of the true value no matter how many samples are recorded.
+    """
+
+    def __init__(self, min_value=1e-6, max_value=100.0, growth=1.05):
+        """Initializes empty buckets covering min_value..max_value seconds."""
+        self._min_value = min_value
+        self._growth = growth
+        self._log_growth = math.log(growth)
+        self._counts = [0] * (int(math.log(max_value / min_value) / self._log_growth) + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        """Records a single latency sample in seconds."""
+        if value <= self._min_value:
+            index = 0
+        else:
+            index = int(math.log(value / self._min_value) / self._log_growth) + 1
+            index = min(index, len(self._counts) - 1)
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        """Adds the samples of another histogram with the same bucket layout."""
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def cumulative_counts(self, bounds):
+        """
+        Returns the number of samples at or below each of the ascending upper bounds.
+
+        Samples are resolved to their log bucket, which is counted against a bound when
+        its upper edge is at most that bound, so a count can miss samples within `growth`
+        below it. These are the le= series of a Prometheus histogram.
+        """
+        counts = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while index < len(self._counts) and self._min_value * self._growth ** index <= bound:
+                seen += self._counts[index]
+                index += 1
+            counts.append(seen)
+        return counts
+
+    @property
+    def mean(self):
+        """Returns the mean latency, or 0.0 when empty."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Returns the estimated latency at the given percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._min_value * self._growth ** index, self.max)
+        return self.max
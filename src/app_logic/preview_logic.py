@@ -0,0 +1,178 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, Signal
+from PySide6.QtGui import QColor, QImage
+
+# NumPy and the qrcode stack are imported by the functions below rather than here. They
+# first run on a preview worker thread, so the main window paints without waiting for them.
+
+
+def matrix_to_qimage(matrix, target_size, border=4, fill_color="black", bg_color="white"):
+    """
+    Builds a preview QImage straight from a module matrix.
+
+    The image is a 1-bit QImage with a two-entry color table, scaled by the largest
+    integer factor that fits target_size (nearest neighbour), and its pixels are written
+    directly into the QImage buffer, so the frame costs a single full-size allocation.
+    """
+    import numpy as np
+
+    from src.app_logic.qrcode_raster import module_rows
+
+    modules = len(matrix) + 2 * border
+    scale = min(target_size.width(), target_size.height()) // modules
+    rows = np.packbits(module_rows(matrix, max(scale, 1), border), axis=1)
+    size = modules * max(scale, 1)
+
+    image = QImage(size, size, QImage.Format_Mono)
+    image.setColorTable([QColor(bg_color).rgba(), QColor(fill_color).rgba()])
+    bits = np.frombuffer(image.bits(), dtype=np.uint8).reshape(modules, max(scale, 1), image.bytesPerLine())
+    bits[:, :, :rows.shape[1]] = rows[:, None, :]
+
+    if scale < 1:
+        # The symbol has more modules than the label has pixels; shrink without smoothing
+        return image.scaled(target_size, Qt.KeepAspectRatio, Qt.FastTransformation)
+    return image
+
+
+class _PreviewSignals(QObject):
+    """Signals emitted by preview tasks from worker threads."""
+
+    finished = Signal(int, QImage)
+    failed = Signal(int, str)
+
+
+class _PreviewTask(QRunnable):
+    """Encodes one preview frame and builds its QImage on a worker thread."""
+
+    def __init__(self, generation, data, options, target_size, signals, is_current):
+        super().__init__()
+        self._generation = generation
+        self._data = data
+        self._options = options
+        self._target_size = target_size
+        self._signals = signals
+        self._is_current = is_current
+
+    def run(self):
+        """Renders the frame unless a newer request superseded it while queued."""
+        if not self._is_current(self._generation):
+            return
+
+        try:
+            from src.app_logic.qrcode_engine import encode_matrix
+
+            matrix = encode_matrix(self._data, self._options["version"], self._options["error_correction"])
+            qt_img = matrix_to_qimage(matrix, self._target_size, self._options["border"],
+                                      self._options["fill_color"], self._options["bg_color"])
+            self._signals.finished.emit(self._generation, qt_img)
+        except Exception as e:
+            self._signals.failed.emit(self._generation, str(e))
+
+
+class _JobSignals(QObject):
+    """Signals emitted by a background job from its worker thread."""
+
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class _Job(QRunnable):
+    """Runs one function on a worker thread and reports its result or error."""
+
+    def __init__(self, function, signals):
+        super().__init__()
+        self._function = function
+        self._signals = signals
+
+    def run(self):
+        """Calls the function and emits its result, or the error it raised."""
+        try:
+            result = self._function()
+        except Exception as e:
+            self._signals.failed.emit(str(e))
+            return
+        self._signals.finished.emit(result)
+
+
+class PreviewRenderer(QObject):
+    """
+    Coalesces rapid preview requests and renders them off the GUI thread.
+
+    Each dispatched request gets a generation number; results from any generation
+    other than the latest are dropped, so only the newest frame is ever painted.
+    """
+
+    preview_ready = Signal(QImage)
+    preview_failed = Signal(str)
+
+    DEBOUNCE_MS = 60
+    MAX_THREADS = 2
+
+    def __init__(self, parent=None, debounce_ms=DEBOUNCE_MS):
+        """Initializes the debounce timer, worker pool and generation counter."""
+        super().__init__(parent)
+        self._generation = 0
+        self._pending = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._dispatch)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.MAX_THREADS)
+
+        self._signals = _PreviewSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def request(self, data, options, target_size, immediate=False):
+        """Schedules a preview; repeated calls within the debounce window collapse into one."""
+        self._pending = (data, dict(options), target_size)
+        if immediate:
+            self._timer.stop()
+            self._dispatch()
+        else:
+            self._timer.start()
+
+    def cancel(self):
+        """Drops any scheduled or in-flight preview."""
+        self._timer.stop()
+        self._pending = None
+        self._generation += 1
+
+    def run_in_background(self, function, on_finished, on_failed):
+        """
+        Runs function() on the preview worker pool, off the GUI thread.
+
+        on_finished(result) or on_failed(message) is then called on the GUI thread.
+        """
+        signals = _JobSignals(self)
+        signals.finished.connect(on_finished)
+        signals.failed.connect(on_failed)
+        signals.finished.connect(signals.deleteLater)
+        signals.failed.connect(signals.deleteLater)
+        self._pool.start(_Job(function, signals))
+
+    def is_current(self, generation):
+        """Returns True if the generation is still the latest requested one."""
+        return generation == self._generation
+
+    def _dispatch(self):
+        """Starts a worker task for the most recent pending request."""
+        if self._pending is None:
+            return
+        self._generation += 1
+        data, options, target_size = self._pending
+        self._pending = None
+        self._pool.start(_PreviewTask(self._generation, data, options, target_size, self._signals,
+                                      self.is_current))
+
+    def _on_finished(self, generation, image):
+        """Forwards the frame only if no newer request has been made since."""
+        if self.is_current(generation):
+            self.preview_ready.emit(image)
+
+    def _on_failed(self, generation, message):
+        """Forwards errors for the latest request only."""
+        if self.is_current(generation):
+            self.preview_failed.emit(message)
@@ -0,0 +1,67 @@
+from bisect import bisect_left
+
+from qrcode import util
+from qrcode.constants import ERROR_CORRECT_H, ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q
+
+# Versions are looked up by index, so every table has a placeholder at index 0
+MAX_VERSION = 40
+CAPACITY_MODES = (util.MODE_NUMBER, util.MODE_ALPHA_NUM, util.MODE_8BIT_BYTE)
+
+# Version ranges that share the same character count indicator widths
+VERSION_CLASSES = ((1, 9), (10, 26), (27, 40))
+
+# qrcode constant of each error correction level name, lowest level first, and the reverse
+ERROR_CORRECTION = {"L": ERROR_CORRECT_L, "M": ERROR_CORRECT_M, "Q": ERROR_CORRECT_Q, "H": ERROR_CORRECT_H}
+ERROR_CORRECTION_NAMES = {level: name for name, level in ERROR_CORRECTION.items()}
+
+
+def _characters(bits, mode):
+    """Returns how many characters of a mode fit in a number of data bits."""
+    if bits <= 0:
+        return 0
+    if mode == util.MODE_NUMBER:
+        return 3 * (bits // 10) + (2 if bits % 10 >= 7 else 1 if bits % 10 >= 4 else 0)
+    if mode == util.MODE_ALPHA_NUM:
+        return 2 * (bits // 11) + (1 if bits % 11 >= 6 else 0)
+    return bits // 8
+
+
+def _character_capacity(error_correction, mode):
+    """Returns the single-segment character capacity of every version."""
+    capacity = [0]
+    for version in range(1, MAX_VERSION + 1):
+        count_bits = util.length_in_bits(mode, version)
+        available = util.BIT_LIMIT_TABLE[error_correction][version] - 4 - count_bits
+        capacity.append(min(_characters(available, mode), 2 ** count_bits - 1))
+    return tuple(capacity)
+
+
+# Data bits of every version per error correction level, and the characters a single
+# segment of each mode can hold; built once at import from qrcode's block tables
+DATA_BITS = {error_correction: tuple(util.BIT_LIMIT_TABLE[error_correction]) for error_correction in range(4)}
+CHARACTER_CAPACITY = {
+    error_correction: {mode: _character_capacity(error_correction, mode) for mode in CAPACITY_MODES}
+    for error_correction in range(4)
+}
+
+
+def version_class(version):
+    """Returns the (first, last) range of versions that shares a version's count indicator widths."""
+    return next(versions for versions in VERSION_CLASSES if versions[0] <= version <= versions[1])
+
+
+def smallest_version(bits, error_correction, first=1, last=MAX_VERSION):
+    """Returns the smallest version in [first, last] with room for a number of data bits, or None."""
+    version = bisect_left(DATA_BITS[error_correction], bits, first, last + 1)
+    return version if version <= last else None
+
+
+def smallest_version_for_length(length, mode, error_correction, minimum=1):
+    """Returns the smallest version not below minimum that holds length characters in one segment, or None."""
+    version = bisect_left(CHARACTER_CAPACITY[error_correction][mode], length, minimum)
+    return version if version <= MAX_VERSION else None
+
+
+def max_characters(version, error_correction, mode=util.MODE_8BIT_BYTE):
+    """Returns how many characters of a mode a single segment can hold at a version."""
+    return CHARACTER_CAPACITY[error_correction][mode][version]
@@ -0,0 +1,182 @@
+from functools import lru_cache
+
+import numpy as np
+from qrcode import base, util
+from qrcode.exceptions import DataOverflowError
+
+
+def _galois_tables():
+    """Returns the GF(256) antilog (exp) and log tables for the QR polynomial x^8 + x^4 + x^3 + x^2 + 1."""
+    exp = np.zeros(512, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int32)
+    value = 1
+    for power in range(255):
+        exp[power] = value
+        log[value] = power
+        value <<= 1
+        if value & 0x100:
+            value ^= 0x11D
+    # Doubled so the sum of two logs never needs a modulo
+    exp[255:510] = exp[:255]
+    return exp, log
+
+
+GF_EXP, GF_LOG = _galois_tables()
+
+# GF_MULTIPLY[a, b] is a * b in GF(256)
+GF_MULTIPLY = np.where(
+    (np.arange(256)[:, None] == 0) | (np.arange(256)[None, :] == 0), 0,
+    GF_EXP[GF_LOG[:, None] + GF_LOG[None, :]],
+).astype(np.uint8)
+GF_MULTIPLY.setflags(write=False)
+
+_PAD_BYTES = bytes((util.PAD0, util.PAD1))
+
+
+@lru_cache(maxsize=None)
+def generator_polynomial(ec_count):
+    """Returns the Reed-Solomon generator polynomial of a block length, highest degree first and monic."""
+    polynomial = np.ones(1, dtype=np.uint8)
+    for power in range(ec_count):
+        # Multiply by (x - a^power); subtraction is XOR in GF(256)
+        shifted = np.append(polynomial, 0).astype(np.uint8)
+        shifted[1:] ^= GF_MULTIPLY[polynomial, GF_EXP[power]]
+        polynomial = shifted
+    polynomial.setflags(write=False)
+    return polynomial
+
+
+@lru_cache(maxsize=None)
+def _feedback_table(ec_count):
+    """Returns the (256, ec_count) products of every feedback byte with the generator's lower terms."""
+    table = GF_MULTIPLY[:, generator_polynomial(ec_count)[1:]]
+    table.setflags(write=False)
+    return table
+
+
+def error_correction_codewords(blocks, ec_count):
+    """
+    Returns the Reed-Solomon codewords of every row of a (blocks, data_count) uint8 array.
+
+    The polynomial division runs as a shift register: one step per data codeword, with
+    each step applied to every block at once through the precomputed feedback table.
+    """
+    blocks = np.asarray(blocks, dtype=np.uint8)
+    feedback_table = _feedback_table(ec_count)
+    remainder = np.zeros((blocks.shape[0], ec_count), dtype=np.uint8)
+    for column in blocks.T:
+        feedback = column ^ remainder[:, 0]
+        remainder[:, :-1] = remainder[:, 1:]
+        remainder[:, -1] = 0
+        remainder ^= feedback_table[feedback]
+    return remainder
+
+
+@lru_cache(maxsize=None)
+def block_structure(version, error_correction):
+    """
+    Returns how a version splits its codewords into blocks.
+
+    The result is (groups, order): groups lists (block_count, data_count, ec_count) per
+    group of equal blocks, and order maps the final interleaved codeword positions to
+    positions in the blocks laid out one after another (all data, then all error
+    correction codewords).
+    """
+    blocks = base.rs_blocks(version, error_correction)
+    groups = []
+    for block in blocks:
+        key = (block.data_count, block.total_count - block.data_count)
+        if groups and groups[-1][1:] == key:
+            groups[-1] = (groups[-1][0] + 1,) + key
+        else:
+            groups.append((1,) + key)
+
+    data_offsets, ec_offsets = [], []
+    data_total = sum(block.data_count for block in blocks)
+    data_position = ec_position = 0
+    for block in blocks:
+        data_offsets.append(data_position)
+        ec_offsets.append(data_total + ec_position)
+        data_position += block.data_count
+        ec_position += block.total_count - block.data_count
+
+    order = []
+    for index in range(max(block.data_count for block in blocks)):
+        order.extend(offset + index for offset, block in zip(data_offsets, blocks) if index < block.data_count)
+    for index in range(max(block.total_count - block.data_count for block in blocks)):
+        order.extend(offset + index for offset, block in zip(ec_offsets, blocks)
+                     if index < block.total_count - block.data_count)
+    order = np.array(order)
+    order.setflags(write=False)
+    return tuple(groups), order
+
+
+def data_codewords(segments, version, error_correction):
+    """
+    Returns the data codewords of segments as bytes, padded as qrcode pads them.
+
+    Bits are accumulated in one integer rather than bit by bit. Raises qrcode's
+    DataOverflowError if the segments do not fit the version.
+    """
+    value = length = 0
+    for segment in segments:
+        count_bits = util.length_in_bits(segment.mode, version)
+        value = (value << (4 + count_bits)) | (segment.mode << count_bits) | len(segment)
+        length += 4 + count_bits
+        data = segment.data
+        if segment.mode == util.MODE_NUMBER:
+            for start in range(0, len(data), 3):
+                chunk = data[start:start + 3]
+                bits = util.NUMBER_LENGTH[len(chunk)]
+                value = (value << bits) | int(chunk)
+                length += bits
+        elif segment.mode == util.MODE_ALPHA_NUM:
+            for start in range(0, len(data) - 1, 2):
+                value = (value << 11) | (util.ALPHA_NUM.find(data[start]) * 45 + util.ALPHA_NUM.find(data[start + 1]))
+            if len(data) % 2:
+                value = (value << 6) | util.ALPHA_NUM.find(data[-1])
+            length += 11 * (len(data) // 2) + 6 * (len(data) % 2)
+        else:
+            value = (value << 8 * len(data)) | int.from_bytes(data, "big")
+            length += 8 * len(data)
+
+    bit_limit = util.BIT_LIMIT_TABLE[error_correction][version]
+    if length > bit_limit:
+        raise DataOverflowError(f"Code length overflow. Data size ({length}) > size available ({bit_limit})")
+
+    # Terminator of up to four zero bits, then zeros up to a byte boundary
+    padding = min(bit_limit - length, 4)
+    padding += -(length + padding) % 8
+    value <<= padding
+    length += padding
+
+    codewords = value.to_bytes(length // 8, "big")
+    pad_count = bit_limit // 8 - len(codewords)
+    return codewords + (_PAD_BYTES * (pad_count // 2 + 1))[:pad_count]
+
+
+def interleave_codewords(data, version, error_correction):
+    """
+    Adds error correction to (symbols, data_codewords) uint8 rows and interleaves them.
+
+    Every block of every symbol in a group of equal blocks is divided in one vectorized
+    pass, so many symbols of the same version and level cost little more than one.
+    Returns a (symbols, total_codewords) uint8 array.
+    """
+    data = np.asarray(data, dtype=np.uint8)
+    symbols = data.shape[0]
+    groups, order = block_structure(version, error_correction)
+
+    ec_parts = []
+    offset = 0
+    for block_count, data_count, ec_count in groups:
+        blocks = data[:, offset:offset + block_count * data_count].reshape(-1, data_count)
+        ec_parts.append(error_correction_codewords(blocks, ec_count).reshape(symbols, -1))
+        offset += block_count * data_count
+    return np.concatenate([data] + ec_parts, axis=1)[:, order]
+
+
+def encode_codewords(segments, version, error_correction):
+    """Returns the interleaved data and error correction codewords of one symbol; same bytes as qrcode."""
+    data = np.frombuffer(data_codewords(segments, version, error_correction), dtype=np.uint8)
+    return interleave_codewords(data[None, :], version, error_correction)[0]
@@ -0,0 +1,426 @@
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+import numpy as np
+from qrcode.constants import ERROR_CORRECT_L
+from qrcode.exceptions import DataOverflowError
+from qrcode.image.pil import PilImage
+
+from src.app_logic.qrcode_capacity import ERROR_CORRECTION
+from src.app_logic.qrcode_codewords import data_codewords, encode_codewords, interleave_codewords
+from src.app_logic.qrcode_mask import build_matrices, build_matrix
+from src.app_logic.qrcode_segments import plan_segments
+from src.app_logic.result_cache import result_cache, result_key
+
+# Number of encoded module matrices kept in memory
+MATRIX_CACHE_SIZE = 256
+
+# Least recently used module matrices by (data, version, error correction, mask pattern)
+_matrix_cache = OrderedDict()
+_matrix_cache_lock = threading.Lock()
+
+# Rasterizers selectable through the `backend` argument
+RENDER_BACKENDS = ("pil", "numpy")
+
+# File formats supported by save_qr_code
+EXPORT_FORMATS = ("png", "svg", "pdf")
+
+
+def error_correction_level(error_correction):
+    """
+    Returns the qrcode constant of an error correction level.
+
+    Accepts a level name (L, M, Q or H, in any case) or one of qrcode's ERROR_CORRECT_*
+    constants; raises ValueError for anything else.
+    """
+    if isinstance(error_correction, str):
+        level = ERROR_CORRECTION.get(error_correction.strip().upper())
+        if level is not None:
+            return level
+    elif error_correction in ERROR_CORRECTION.values():
+        return int(error_correction)
+    raise ValueError(f"Unknown error correction level: {error_correction}")
+
+
+def encode_matrix(data, version=None, error_correction=ERROR_CORRECT_L, mask_pattern=None):
+    """
+    Encodes data into an immutable module matrix (a tuple of rows of booleans).
+
+    The payload is split into numeric, alphanumeric and byte segments with the fewest
+    bits (see qrcode_segments), so mixed content fits in the smallest version. A
+    version of None or 0 auto-fits the data; any other version is treated as the
+    minimum version and grows if the data does not fit. Error correction codewords
+    come from the table-driven Reed-Solomon encoder in qrcode_codewords, and the mask
+    with the lowest penalty is chosen by the vectorized evaluator in qrcode_mask; a
+    mask_pattern (0-7) skips the evaluation for throughput-critical runs. The error
+    correction level is a qrcode constant or a level name (see error_correction_level).
+    Results are cached per (data, version, error correction, mask pattern), so
+    re-rendering the same payload with other colors, box size or border skips all of
+    this work.
+    """
+    key = _matrix_key(data, version, error_correction, mask_pattern)
+    matrix = _cached_matrix(key)
+    if matrix is None:
+        matrix = _encode_matrix(*key)
+        _remember_matrix(key, matrix)
+    return matrix
+
+
+def encode_matrices(payloads, version=None, error_correction=ERROR_CORRECT_L, mask_pattern=None):
+    """
+    Encodes many payloads at once and returns their module matrices in order.
+
+    Payloads are grouped by the version they fit in; each group is encoded as one
+    stacked array, with Reed-Solomon division, codeword placement, masking and penalty
+    scoring all running across the whole group (see qrcode_codewords and qrcode_mask).
+    Label runs, where thousands of payloads share one length profile, then pay little
+    more per code than writing its image. The matrices are identical to encode_matrix
+    and are added to its cache.
+    """
+    keys = [_matrix_key(data, version, error_correction, mask_pattern) for data in payloads]
+    matrices = _encode_batch(keys)
+    return [matrices[key] for key in keys]
+
+
+def prime_matrix_cache(payloads, version=None, error_correction=ERROR_CORRECT_L, mask_pattern=None):
+    """
+    Batch-encodes the payloads that are not cached yet so later encode_matrix calls hit the cache.
+
+    Payloads that cannot be encoded are skipped; encode_matrix reports their error when
+    they are rendered. Returns the number of matrices encoded.
+    """
+    keys = [_matrix_key(data, version, error_correction, mask_pattern) for data in payloads]
+    return len(_encode_batch(keys, skip_errors=True))
+
+
+def _matrix_key(data, version, error_correction, mask_pattern):
+    """Returns the normalized matrix cache key of an encoding request."""
+    return data, version or None, error_correction_level(error_correction), mask_pattern
+
+
+def _cached_matrix(key):
+    """Returns a cached matrix and marks it as recently used, or None."""
+    with _matrix_cache_lock:
+        matrix = _matrix_cache.get(key)
+        if matrix is not None:
+            _matrix_cache.move_to_end(key)
+        return matrix
+
+
+def _remember_matrix(key, matrix):
+    """Caches a matrix, evicting the least recently used ones."""
+    with _matrix_cache_lock:
+        _matrix_cache[key] = matrix
+        _matrix_cache.move_to_end(key)
+        while len(_matrix_cache) > MATRIX_CACHE_SIZE:
+            _matrix_cache.popitem(last=False)
+
+
+def _encode_matrix(data, version, error_correction, mask_pattern):
+    """Runs the actual encoding for encode_matrix; arguments are already normalized."""
+    version, segments = plan_segments(data, error_correction, version)
+    codewords = encode_codewords(segments, version, error_correction)
+    matrix = build_matrix(codewords, version, error_correction, mask_pattern)
+    return tuple(map(tuple, matrix.tolist()))
+
+
+def _encode_batch(keys, skip_errors=False, errors=None):
+    """
+    Encodes the distinct keys that are not cached, grouped by version; returns {key: matrix}.
+
+    With skip_errors, keys that cannot be encoded are left out of the result and, if an
+    errors dictionary is given, their exception is stored in it.
+    """
+    matrices = {}
+    groups = {}
+    for key in dict.fromkeys(keys):
+        matrix = _cached_matrix(key)
+        if matrix is not None:
+            matrices[key] = matrix
+            continue
+        data, version, error_correction, mask_pattern = key
+        try:
+            version, segments = plan_segments(data, error_correction, version)
+            codewords = data_codewords(segments, version, error_correction)
+        except Exception as e:
+            if not skip_errors:
+                raise
+            if errors is not None:
+                errors[key] = e
+            continue
+        groups.setdefault((version, error_correction, mask_pattern), []).append((key, codewords))
+
+    for (version, error_correction, mask_pattern), items in groups.items():
+        data = np.frombuffer(b"".join(codewords for _, codewords in items), dtype=np.uint8).reshape(len(items), -1)
+        codewords = interleave_codewords(data, version, error_correction)
+        for (key, _), matrix in zip(items, build_matrices(codewords, version, error_correction, mask_pattern)):
+            matrices[key] = tuple(map(tuple, matrix.tolist()))
+            _remember_matrix(key, matrices[key])
+    return matrices
+
+
+def render_matrix(matrix, box_size=10, border=4, fill_color="black", bg_color="white", image_factory=PilImage):
+    """Rasterizes a module matrix one rectangle at a time using a qrcode image factory."""
+    size = len(matrix)
+    img = image_factory(border, size, box_size, qrcode_modules=matrix, fill_color=fill_color, back_color=bg_color)
+    for r, row in enumerate(matrix):
+        for c, dark in enumerate(row):
+            if dark:
+                img.drawrect(r, c)
+    return img
+
+
+def render_image(matrix, box_size=10, border=4, fill_color="black", bg_color="white", backend="pil"):
+    """
+    Renders a module matrix to a PIL image with the selected backend.
+
+    "pil" uses qrcode's stock image factory; "numpy" upscales the whole matrix in a
+    single vectorized step into a two-color palette image (see qrcode_raster) and is
+    much faster for large versions and box sizes.
+    """
+    if backend == "numpy":
+        from src.app_logic.qrcode_raster import rasterize
+        return rasterize(matrix, box_size, border, fill_color, bg_color)
+    if backend == "pil":
+        return render_matrix(matrix, box_size, border, fill_color, bg_color).get_image()
+    raise ValueError(f"Unknown render backend: {backend}")
+
+
+def create_qr_image(data, version=None, box_size=10, border=4, fill_color="black", bg_color="white",
+                    error_correction=ERROR_CORRECT_L, backend="pil", mask_pattern=None):
+    """
+    Creates a QR code image for the given data without any Qt dependency.
+
+    Returns a PIL image so callers can save, convert or display it as they see fit.
+    """
+    matrix = encode_matrix(data, version, error_correction, mask_pattern)
+    return render_image(matrix, box_size, border, fill_color, bg_color, backend)
+
+
+def export_format(path):
+    """Returns the export format implied by a file name, defaulting to PNG."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return extension if extension in EXPORT_FORMATS else "png"
+
+
+def write_qr_code(data, stream, fmt="png", version=None, box_size=10, border=4, fill_color="black",
+                  bg_color="white", error_correction=ERROR_CORRECT_L, compress_level=None, filter_type="up",
+                  strategy="default", mask_pattern=None):
+    """
+    Writes a full-resolution QR code for the given data to a binary stream.
+
+    PNG output is a 1-bit palette image streamed from the module matrix; filter_type and
+    strategy tune its row filter and zlib strategy (see qrcode_png). SVG and PDF output
+    are vector files built from merged rectangles (see qrcode_vector). Returns the bytes
+    written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    matrix = encode_matrix(data, version, error_correction, mask_pattern)
+
+    if fmt == "svg":
+        from src.app_logic.qrcode_vector import write_svg
+        return write_svg(matrix, stream, box_size, border, fill_color, bg_color)
+    if fmt == "pdf":
+        return _write_pdf([matrix], stream, box_size, border, fill_color, bg_color, compress_level)
+
+    from src.app_logic.qrcode_png import DEFAULT_COMPRESS_LEVEL, write_png
+    return write_png(matrix, stream, box_size, border, fill_color, bg_color,
+                     DEFAULT_COMPRESS_LEVEL if compress_level is None else compress_level, filter_type, strategy)
+
+
+def qr_code_bytes(data, fmt="png", version=None, box_size=10, border=4, fill_color="black", bg_color="white",
+                  error_correction=ERROR_CORRECT_L, compress_level=None, filter_type="up", strategy="default",
+                  mask_pattern=None):
+    """
+    Returns a QR code encoded as PNG, SVG or PDF file contents (see write_qr_code).
+
+    Results are looked up in the content-addressed result cache first, so a repeated
+    request costs a hash and a dictionary lookup instead of encoding and compression.
+    """
+    def create():
+        buffer = io.BytesIO()
+        write_qr_code(data, buffer, fmt, version, box_size, border, fill_color, bg_color, error_correction,
+                      compress_level, filter_type, strategy, mask_pattern)
+        return buffer.getvalue()
+
+    if not result_cache.enabled:
+        return create()
+    key = result_key(data=data, fmt=fmt, version=version or None, box_size=box_size, border=border,
+                     fill_color=fill_color, bg_color=bg_color,
+                     error_correction=error_correction_level(error_correction),
+                     compress_level=compress_level, filter_type=filter_type, strategy=strategy,
+                     mask_pattern=mask_pattern)
+    return result_cache.get_or_create(key, create)
+
+
+def profile_error_correction(data, version=None, fmt="png", box_size=10, border=4, fill_color="black",
+                             bg_color="white", mask_pattern=None, compress_level=None, filter_type="up",
+                             strategy="default", repeat=3):
+    """
+    Reports what each error correction level costs for one payload.
+
+    Returns one dictionary per level, lowest first, with the level name, the version
+    the data needs, the module count of the symbol, the best encode time in
+    milliseconds over repeat uncached runs and the size in bytes of the file written
+    in fmt with the given encoder settings (see write_qr_code). Levels the data does
+    not fit in have an error message instead.
+    """
+    profile = []
+    for name, error_correction in ERROR_CORRECTION.items():
+        key = _matrix_key(data, version, error_correction, mask_pattern)
+        try:
+            timings = []
+            for _ in range(max(repeat, 1)):
+                started = time.perf_counter()
+                matrix = _encode_matrix(*key)
+                timings.append(time.perf_counter() - started)
+        except DataOverflowError as e:
+            profile.append({"level": name, "error": str(e)})
+            continue
+        _remember_matrix(key, matrix)
+
+        buffer = io.BytesIO()
+        size = write_qr_code(data, buffer, fmt, version, box_size, border, fill_color, bg_color, error_correction,
+                             compress_level, filter_type, strategy, mask_pattern)
+        profile.append({
+            "level": name,
+            "version": (len(matrix) - 17) // 4,
+            "modules": len(matrix) ** 2,
+            "encode_ms": min(timings) * 1000,
+            "bytes": size,
+        })
+    return profile
+
+
+def save_qr_code(data, path, version=None, box_size=10, border=4, fill_color="black", bg_color="white",
+                 error_correction=ERROR_CORRECT_L, compress_level=None, filter_type="up", strategy="default",
+                 fmt=None, mask_pattern=None):
+    """
+    Writes a full-resolution QR code for the given data straight to a file.
+
+    The format is taken from fmt or, if omitted, from the file extension; see
+    write_qr_code for the options. With the result cache enabled the file contents go
+    through qr_code_bytes and are reused for identical requests. Returns the bytes written.
+    """
+    fmt = fmt or export_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    if result_cache.enabled:
+        contents = qr_code_bytes(data, fmt, version, box_size, border, fill_color, bg_color, error_correction,
+                                 compress_level, filter_type, strategy, mask_pattern)
+        with open(path, "wb") as f:
+            f.write(contents)
+        return len(contents)
+
+    with open(path, "wb") as f:
+        return write_qr_code(data, f, fmt, version, box_size, border, fill_color, bg_color, error_correction,
+                             compress_level, filter_type, strategy, mask_pattern)
+
+
+def save_qr_pdf(items, path, version=None, box_size=10, border=4, fill_color="black", bg_color="white",
+                error_correction=ERROR_CORRECT_L, compress_level=None, mask_pattern=None):
+    """
+    Writes one PDF page per payload in items and returns the bytes written.
+
+    items may be a generator; pages are encoded and streamed to disk one at a time.
+    """
+    matrices = (encode_matrix(data, version, error_correction, mask_pattern) for data in items)
+    with open(path, "wb") as f:
+        return _write_pdf(matrices, f, box_size, border, fill_color, bg_color, compress_level)
+
+
+def save_label_sheets(items, path, layout=None, fmt=None, version=None, border=4, fill_color="black",
+                      bg_color="white", error_correction=ERROR_CORRECT_L, mask_pattern=None, dpi=None,
+                      compress_level=None, pages_per_file=0, on_error=None):
+    """
+    Tiles many codes onto print-ready PDF or TIFF pages (see label_sheet) and returns a summary.
+
+    items may be a generator of payloads or (payload, caption) pairs; a bare payload has
+    no caption. They are consumed one page at a time: each page's payloads are encoded
+    together as one batch (see encode_matrices) and the page is written before the
+    next is read, so memory stays flat for any number of codes. A payload that cannot
+    be encoded is left out and counted as failed, after on_error(payload, error) is
+    called if given. The format is taken from fmt or the file extension (.pdf, .tif or
+    .tiff). With pages_per_file, the output is split into numbered files
+    (labels-0001.pdf, ...) that are complete as soon as they are full, so printing can
+    start while the job runs; a file that cannot be finished is removed. The summary
+    holds the labels, failed labels, pages, bytes and the list of files written.
+    """
+    from src.app_logic.label_sheet import DEFAULT_DPI, SHEET_FORMATS, SheetLayout, sheet_writer
+
+    layout = layout or SheetLayout()
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    fmt = fmt or ("tiff" if extension in ("tif", "tiff") else "pdf")
+    if fmt not in SHEET_FORMATS:
+        raise ValueError(f"Unknown sheet format: {fmt}")
+    summary = {"labels": 0, "failed": 0, "pages": 0, "bytes": 0, "files": []}
+
+    def encoded():
+        """Yields (matrix, caption) pairs, encoding one page worth of items at a time."""
+        pairs = (item if isinstance(item, tuple) else (item, None) for item in items)
+        for chunk in iter(lambda: list(islice(pairs, layout.per_page)), []):
+            keys = [_matrix_key(str(data), version, error_correction, mask_pattern) for data, _ in chunk]
+            errors = {}
+            matrices = _encode_batch(keys, skip_errors=True, errors=errors)
+            for key, (_, caption) in zip(keys, chunk):
+                if key in matrices:
+                    yield matrices[key], caption
+                    continue
+                summary["failed"] += 1
+                if on_error is not None:
+                    on_error(key[0], errors[key])
+
+    labels = encoded()
+    pages = iter(lambda: list(islice(labels, layout.per_page)), [])
+    page = next(pages, None)
+    while True:
+        file_path = path
+        if pages_per_file:
+            stem, suffix = os.path.splitext(path)
+            file_path = f"{stem}-{len(summary['files']) + 1:04d}{suffix}"
+        with open(file_path, "wb") as stream:
+            try:
+                writer = sheet_writer(stream, layout, fmt, border, fill_color, bg_color, dpi or DEFAULT_DPI,
+                                      compress_level)
+                while page is not None:
+                    writer.add_page(page)
+                    summary["labels"] += len(page)
+                    if pages_per_file and writer.pages == pages_per_file:
+                        break
+                    page = next(pages, None)
+                if not writer.pages:
+                    # Nothing to lay out; a blank page keeps the file valid
+                    writer.add_page([])
+                summary["pages"] += writer.pages
+                summary["bytes"] += writer.close()
+            except BaseException:
+                # An unfinished PDF or TIFF cannot be read, so do not leave it behind
+                stream.close()
+                os.remove(file_path)
+                raise
+        summary["files"].append(file_path)
+        # The next page is only read once this file is complete, so an error reading it cannot undo the file
+        if page is not None:
+            page = next(pages, None)
+        if page is None:
+            return summary
+
+
+def _write_pdf(matrices, stream, box_size, border, fill_color, bg_color, compress_level):
+    """Writes matrices as PDF pages using the default compression when none is given."""
+    from src.app_logic.qrcode_vector import DEFAULT_PDF_COMPRESS_LEVEL, write_pdf
+
+    return write_pdf(matrices, stream, box_size, border, fill_color, bg_color,
+                     DEFAULT_PDF_COMPRESS_LEVEL if compress_level is None else compress_level)
+
+
+def clear_matrix_cache():
+    """Drops every cached module matrix."""
+    with _matrix_cache_lock:
+        _matrix_cache.clear()
@@ -1,13 +1,25 @@
-import qrcode
-from PIL import ImageQt
-from PySide6.QtCore import Qt
+import os
+
 from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QFileDialog, QColorDialog, QMessageBox
 
-from src.app_logic.config import config
+from src.app_logic.config import ERROR_CORRECTION_LEVELS, config
 from src.app_logic.logger import logger
+from src.app_logic.preview_logic import PreviewRenderer
 from src.app_ui.ui_qrcode import Ui_MainWindow
 
+# Slider value that lets the engine pick the smallest version that fits
+AUTO_VERSION = 0
+AUTO_VERSION_LABEL = "Auto"
+
+# File dialog filters for saving and the export format each one selects
+SAVE_FILTER_FORMATS = {
+    "PNG Image (*.png)": "png",
+    "SVG Vector (*.svg)": "svg",
+    "PDF Document (*.pdf)": "pdf",
+}
+SAVE_FILTERS = ";;".join(SAVE_FILTER_FORMATS)
+
 
 class QRCodeManager:
     """Handles QR code generation, UI interactions, and settings management."""
@@ -28,16 +40,27 @@ class QRCodeManager:
         self._version_slider = self._ui.version_slider
         self._box_size_slider = self._ui.box_size_slider
         self._border_size_slider = self._ui.border_size_slider
+        self._error_correction_combo = self._ui.error_correction_combo
 
         # QR Code Properties
         self._qr_version = self._config.qrcode_default_version
+        self._qr_error_correction = self._config.qrcode_error_correction
         self._qr_box_size = self._config.qrcode_default_box_size
         self._qr_border_size = self._config.qrcode_default_border_size
         self._qr_fill_color = self._config.qrcode_default_fill_color
         self._qr_bg_color = self._config.qrcode_default_bg_color
+        self._render_backend = self._config.qrcode_render_backend
+
+        # Background preview rendering
+        self._preview = PreviewRenderer(self.parent)
 
         # Clear initial QR code display
         self._qrcode_display.clear()
+        # The slider clamps the configured version to its 0-40 range
+        self._version_slider.setValue(self._qr_version)
+        self._qr_version = self._version_slider.value()
+        self._show_version_label()
+        self._error_correction_combo.setCurrentIndex(ERROR_CORRECTION_LEVELS.index(self._qr_error_correction))
 
         # Connect UI Events
         self._init_signals()
@@ -48,78 +71,161 @@ class QRCodeManager:
         self._ui.save_qrcode.clicked.connect(self.save_qrcode)
         self._ui.select_fill_color.clicked.connect(self.select_fill_color)
         self._ui.select_background_color.clicked.connect(self.select_bg_color)
+        self._ui.profile_error_correction.clicked.connect(self.show_error_correction_profile)
 
         # Sliders to dynamically update QR code
         self._version_slider.valueChanged.connect(self._update_qr_version)
         self._box_size_slider.valueChanged.connect(self._update_qr_box_size)
         self._border_size_slider.valueChanged.connect(self._update_qr_border_size)
+        self._error_correction_combo.currentIndexChanged.connect(self._update_qr_error_correction)
+
+        self._preview.preview_ready.connect(self._display_qr_code)
+        self._preview.preview_failed.connect(self._show_generation_error)
 
         self._log.info("QR Code Manager initialized successfully.")
 
     def _update_qr_version(self):
-        """Updates the QR code version and regenerates the QR code."""
+        """Updates the QR code version and schedules a preview refresh."""
         self._qr_version = self._version_slider.value()
-        self.generate_qrcode()
+        self._show_version_label()
+        self._schedule_preview()
+
+    def _show_version_label(self):
+        """Shows "Auto" next to the version slider when no minimum version is pinned."""
+        if self._qr_version == AUTO_VERSION:
+            self._ui.version_slider_value.setText(AUTO_VERSION_LABEL)
+
+    def _update_qr_error_correction(self, index):
+        """Updates the error correction level and schedules a preview refresh."""
+        self._qr_error_correction = ERROR_CORRECTION_LEVELS[index]
+        self._schedule_preview()
 
     def _update_qr_box_size(self):
-        """Updates the QR code box size and regenerates the QR code."""
+        """Updates the QR code box size and schedules a preview refresh."""
         self._qr_box_size = self._box_size_slider.value()
-        self.generate_qrcode()
+        self._schedule_preview()
 
     def _update_qr_border_size(self):
-        """Updates the QR code border size and regenerates the QR code."""
+        """Updates the QR code border size and schedules a preview refresh."""
         self._qr_border_size = self._border_size_slider.value()
-        self.generate_qrcode()
+        self._schedule_preview()
 
     def generate_qrcode(self):
         """Generates and displays a QR code based on user input."""
         data = self._ui.textEdit.toPlainText().strip()
 
         if not data:
+            self._preview.cancel()
             self._qrcode_display.clear()
             QMessageBox.warning(self.parent, "Warning", "Please enter data for QR code generation.")
             self._log.warning("No data provided for QR code generation.")
             return
 
-        try:
-            qr = self._create_qr_code(data)
-            self._display_qr_code(qr)
-            self._log.info(f"QR code generated successfully: Version {self._qr_version}, "
-                           f"Box Size {self._qr_box_size}, Border {self._qr_border_size}.")
-        except Exception as e:
-            QMessageBox.critical(self.parent, "Error", f"Error generating QR code: {str(e)}")
-            self._log.error(f"Error generating QR code: {str(e)}")
-
-    def _create_qr_code(self, data):
-        """Creates a QR code image with current settings."""
-        qr = qrcode.QRCode(
-            version=self._qr_version if self._qr_version > 0 else None,  # Auto-fit if 0
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=self._qr_box_size,
-            border=self._qr_border_size,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        return qr.make_image(fill_color=self._qr_fill_color, back_color=self._qr_bg_color)
-
-    def _display_qr_code(self, qr_img):
-        """Converts the QR code image to Qt format and displays it."""
-        qr_img = qr_img.convert("RGB")
-        qt_img = ImageQt.ImageQt(qr_img)
-        pixmap = QPixmap.fromImage(qt_img)
-        scaled_pixmap = pixmap.scaled(self._qrcode_display.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self._qrcode_display.setPixmap(scaled_pixmap)
+        self._preview.request(data, self._qr_options(), self._qrcode_display.size(), immediate=True)
+
+    def _schedule_preview(self):
+        """Requests a debounced background preview for the current text and settings."""
+        data = self._ui.textEdit.toPlainText().strip()
+
+        if not data:
+            self._preview.cancel()
+            self._qrcode_display.clear()
+            return
+
+        self._preview.request(data, self._qr_options(), self._qrcode_display.size())
+
+    def _qr_options(self):
+        """Returns the current settings as generation engine keyword arguments."""
+        return {
+            "version": self._qr_version,  # Auto-fit if 0, otherwise the minimum version
+            "error_correction": self._qr_error_correction,
+            "box_size": self._qr_box_size,
+            "border": self._qr_border_size,
+            "fill_color": self._qr_fill_color,
+            "bg_color": self._qr_bg_color,
+            "backend": self._render_backend,
+        }
+
+    def _display_qr_code(self, qt_img):
+        """Displays a rendered preview frame."""
+        self._qrcode_display.setPixmap(QPixmap.fromImage(qt_img))
+        # Sampled (see LOG_SAMPLING): every slider tick renders a preview
+        self._log.info("QR code generated successfully: Version %s, Box Size %d, Border %d, Error Correction %s.",
+                       self._qr_version, self._qr_box_size, self._qr_border_size, self._qr_error_correction,
+                       extra={"event": "preview"})
+
+    def _show_generation_error(self, message):
+        """Reports a failed preview render."""
+        QMessageBox.critical(self.parent, "Error", f"Error generating QR code: {message}")
+        self._log.error("Error generating QR code: %s", message)
 
     def save_qrcode(self):
-        """Saves the generated QR code as an image file."""
-        file_path, _ = QFileDialog.getSaveFileName(self.parent, "Save QR Code", "", "Images (*.png)")
+        """Saves the QR code at full resolution using the current settings."""
+        data = self._ui.textEdit.toPlainText().strip()
+
+        if not data:
+            QMessageBox.warning(self.parent, "Warning", "Please enter data for QR code generation.")
+            self._log.warning("No data provided for QR code saving.")
+            return
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(self.parent, "Save QR Code", "", SAVE_FILTERS)
         if file_path:
+            if not os.path.splitext(file_path)[1]:
+                file_path += "." + SAVE_FILTER_FORMATS.get(selected_filter, "png")
             try:
-                self._qrcode_display.pixmap().save(file_path, "PNG")
-                self._log.info(f"QR code saved successfully at {file_path}.")
+                # Imported on first save so the qrcode/PIL stack stays off the startup path
+                from src.app_logic.qrcode_engine import save_qr_code
+
+                save_qr_code(data, file_path, self._qr_version, self._qr_box_size, self._qr_border_size,
+                             self._qr_fill_color, self._qr_bg_color, self._qr_error_correction,
+                             compress_level=self._config.qrcode_png_compress_level,
+                             filter_type=self._config.qrcode_png_filter,
+                             strategy=self._config.qrcode_png_strategy)
+                self._log.info("QR code saved successfully at %s.", file_path)
             except Exception as e:
                 QMessageBox.critical(self.parent, "Error", f"Failed to save QR code: {str(e)}")
-                self._log.error(f"Failed to save QR code: {str(e)}")
+                self._log.error("Failed to save QR code: %s", e)
+
+    def show_error_correction_profile(self):
+        """Profiles every error correction level in the background, then shows the results."""
+        data = self._ui.textEdit.toPlainText().strip()
+
+        if not data:
+            QMessageBox.warning(self.parent, "Warning", "Please enter data for QR code generation.")
+            self._log.warning("No data provided for error correction profiling.")
+            return
+
+        options = (data, self._qr_version, "png", self._qr_box_size, self._qr_border_size, self._qr_fill_color,
+                   self._qr_bg_color)
+        # Same encoder settings as save_qrcode, so the sizes shown are the sizes saved
+        settings = {
+            "compress_level": self._config.qrcode_png_compress_level,
+            "filter_type": self._config.qrcode_png_filter,
+            "strategy": self._config.qrcode_png_strategy,
+        }
+
+        def profile():
+            # Imported on first use so the qrcode/PIL stack stays off the startup path
+            from src.app_logic.qrcode_engine import profile_error_correction
+
+            return profile_error_correction(*options, **settings)
+
+        # Four levels of repeated uncached encodes plus PNG writes; keep them off the GUI thread
+        self._ui.profile_error_correction.setEnabled(False)
+        self._preview.run_in_background(profile, self._show_error_correction_profile, self._show_profile_error)
+
+    def _show_error_correction_profile(self, profile):
+        """Shows the version, modules, encode time and PNG size of every error correction level."""
+        from src.app_ui.ui_error_correction_profile import ErrorCorrectionProfileWindow
+
+        self._ui.profile_error_correction.setEnabled(True)
+        ErrorCorrectionProfileWindow(profile, "png", self.parent).exec()
+
+    def _show_profile_error(self, message):
+        """Reports a failed error correction profile."""
+        self._ui.profile_error_correction.setEnabled(True)
+        QMessageBox.critical(self.parent, "Error", f"Failed to compare error correction levels: {message}")
+        self._log.error("Failed to compare error correction levels: %s", message)
 
     def select_fill_color(self):
         """Allows the user to select a fill color for the QR code."""
@@ -127,8 +233,8 @@ class QRCodeManager:
         if color.isValid():
             self._qr_fill_color = color.name()
             self._ui.fill_color_value.setText(color.name())
-            self.generate_qrcode()
-            self._log.info(f"Selected fill color: {color.name()}")
+            self._schedule_preview()
+            self._log.info("Selected fill color: %s", color.name())
 
     def select_bg_color(self):
         """Allows the user to select a background color for the QR code."""
@@ -136,5 +242,5 @@ class QRCodeManager:
         if color.isValid():
             self._qr_bg_color = color.name()
             self._ui.background_color_value.setText(color.name())
-            self.generate_qrcode()
-            self._log.info(f"Selected background color: {color.name()}")
+            self._schedule_preview()
+            self._log.info("Selected background color: %s", color.name())
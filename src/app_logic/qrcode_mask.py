@@ -0,0 +1,219 @@
+from functools import lru_cache
+
+import numpy as np
+import qrcode
+
+MASK_PATTERNS = tuple(range(8))
+
+# Memory budget for the masked candidates scored at once by build_matrices
+MASK_CANDIDATE_BYTES = 32 * 2 ** 20
+
+
+def _scratch_symbol(version, error_correction=0):
+    """Returns a QRCode whose modules hold only the function patterns of a version."""
+    qr = qrcode.QRCode(version=version, error_correction=error_correction)
+    qr.modules_count = version * 4 + 17
+    qr.modules = [[None] * qr.modules_count for _ in range(qr.modules_count)]
+    qr.setup_position_probe_pattern(0, 0)
+    qr.setup_position_probe_pattern(qr.modules_count - 7, 0)
+    qr.setup_position_probe_pattern(0, qr.modules_count - 7)
+    qr.setup_position_adjust_pattern()
+    qr.setup_timing_pattern()
+    return qr
+
+
+def _write_info(qr, test, mask_pattern):
+    """Writes the format information (and version information from version 7) as qrcode does."""
+    qr.setup_type_info(test, mask_pattern)
+    if qr.version >= 7:
+        qr.setup_type_number(test)
+
+
+@lru_cache(maxsize=None)
+def symbol_layout(version):
+    """
+    Returns the fixed layout of a version as (function_modules, data_cells, info_cells, rows, cols).
+
+    function_modules holds the finder, alignment and timing patterns with the format and
+    version information left light, as qrcode scores masks. data_cells and info_cells
+    mark the modules holding codewords and format/version information. rows and cols
+    list the data modules in the order codeword bits are placed (two-column zigzag from
+    the bottom right).
+    """
+    qr = _scratch_symbol(version)
+    blank = [row[:] for row in qr.modules]
+    _write_info(qr, True, 0)
+
+    size = qr.modules_count
+    function_modules = np.array([[bool(module) for module in row] for row in qr.modules])
+    data_cells = np.array([[module is None for module in row] for row in qr.modules])
+    info_cells = np.array([[module is None for module in row] for row in blank]) & ~data_cells
+
+    rows, cols = [], []
+    row, step = size - 1, -1
+    for col in range(size - 1, 0, -2):
+        if col <= 6:
+            col -= 1
+        while 0 <= row < size:
+            for c in (col, col - 1):
+                if data_cells[row, c]:
+                    rows.append(row)
+                    cols.append(c)
+            row += step
+        row -= step
+        step = -step
+
+    for array in (function_modules, data_cells, info_cells):
+        array.setflags(write=False)
+    return function_modules, data_cells, info_cells, np.array(rows), np.array(cols)
+
+
+@lru_cache(maxsize=None)
+def mask_layers(version):
+    """Returns the eight masks of a version as a (8, size, size) array, limited to data modules."""
+    _, data_cells, _, _, _ = symbol_layout(version)
+    i, j = np.indices(data_cells.shape)
+    masks = np.stack([
+        (i + j) % 2 == 0,
+        i % 2 == 0,
+        j % 3 == 0,
+        (i + j) % 3 == 0,
+        (i // 2 + j // 3) % 2 == 0,
+        (i * j) % 2 + (i * j) % 3 == 0,
+        ((i * j) % 2 + (i * j) % 3) % 2 == 0,
+        ((i * j) % 3 + (i + j) % 2) % 2 == 0,
+    ]) & data_cells
+    masks.setflags(write=False)
+    return masks
+
+
+@lru_cache(maxsize=None)
+def info_modules(version, error_correction):
+    """Returns the (8, size, size) format/version information modules for every mask pattern."""
+    _, _, info_cells, _, _ = symbol_layout(version)
+    qr = _scratch_symbol(version, error_correction)
+    layers = []
+    for mask_pattern in MASK_PATTERNS:
+        _write_info(qr, False, mask_pattern)
+        layers.append([[bool(module) for module in row] for row in qr.modules])
+    layers = np.array(layers) & info_cells
+    layers.setflags(write=False)
+    return layers
+
+
+def place_codewords(codewords, version):
+    """
+    Returns unmasked symbols: function patterns plus the codeword bits in their modules.
+
+    codewords is one symbol's codewords or a (symbols, codewords) array; the result has
+    the same leading dimension followed by (size, size).
+    """
+    function_modules, _, _, rows, cols = symbol_layout(version)
+    codewords = np.asarray(codewords, dtype=np.uint8)
+    bits = np.unpackbits(codewords, axis=-1)[..., :len(rows)]
+    symbols = np.broadcast_to(function_modules, codewords.shape[:-1] + function_modules.shape).copy()
+    symbols[..., rows[:bits.shape[-1]], cols[:bits.shape[-1]]] = bits.astype(bool)
+    return symbols
+
+
+def _run_penalty(symbols):
+    """
+    Penalty rule 1: every run of five or more same-colored modules in a row scores its length - 2.
+
+    A run of length L >= 5 holds L - 4 windows of five equal modules and starts exactly
+    one of them, so its score is the number of such windows plus two per run start.
+    """
+    equal = symbols[..., 1:] == symbols[..., :-1]
+    windows = equal[..., :-3] & equal[..., 1:-2] & equal[..., 2:-1] & equal[..., 3:]
+    starts = windows[..., 1:] & ~equal[..., :-4]
+    return windows.sum(axis=(1, 2)) + 2 * (windows[..., 0].sum(axis=1) + starts.sum(axis=(1, 2)))
+
+
+def _finder_penalty(symbols):
+    """
+    Penalty rule 3: every 1:1:3:1:1 finder-like pattern in a row scores 40.
+
+    Both patterns are the dark-light-dark-dark-dark-light-dark core with four light
+    modules after it (10111010000) or before it (00001011101).
+    """
+    light = ~symbols
+    windows = symbols.shape[-1] - 6
+    core = (symbols[..., 0:windows] & light[..., 1:windows + 1] & symbols[..., 2:windows + 2]
+            & symbols[..., 3:windows + 3] & symbols[..., 4:windows + 4] & light[..., 5:windows + 5]
+            & symbols[..., 6:windows + 6])
+    quiet = light[..., :-3] & light[..., 1:-2] & light[..., 2:-1] & light[..., 3:]
+    followed = core[..., :-4] & quiet[..., 7:]
+    preceded = quiet[..., :-7] & core[..., 4:]
+    return (followed.sum(axis=(1, 2)) + preceded.sum(axis=(1, 2))) * 40
+
+
+def penalty_scores(symbols):
+    """
+    Returns the mask penalty of each symbol in a (..., size, size) array, as qrcode's lost_point scores it.
+
+    All four rules run as array operations over every symbol at once: runs of five or
+    more, 2x2 blocks of one color, finder-like patterns and the deviation of the dark
+    ratio from 50%.
+    """
+    symbols = np.asarray(symbols, dtype=bool)
+    leading = symbols.shape[:-2]
+    size = symbols.shape[-1]
+    symbols = symbols.reshape(-1, size, size)
+    transposed = symbols.transpose(0, 2, 1)
+
+    scores = _run_penalty(symbols) + _run_penalty(transposed)
+
+    top_left = symbols[:, :-1, :-1]
+    blocks = ((top_left == symbols[:, 1:, :-1]) & (top_left == symbols[:, :-1, 1:])
+              & (top_left == symbols[:, 1:, 1:]))
+    scores += blocks.sum(axis=(1, 2)) * 3
+
+    scores += _finder_penalty(symbols) + _finder_penalty(transposed)
+
+    # Same float arithmetic as qrcode, so ratios on a 5% boundary round identically
+    dark_counts = symbols.sum(axis=(1, 2))
+    scores += [int(abs(float(dark) / size ** 2 * 100 - 50) / 5) * 10 for dark in dark_counts.tolist()]
+    return scores.astype(np.int64).reshape(leading)
+
+
+def best_mask_pattern(symbol, version):
+    """Returns the mask pattern with the lowest penalty for an unmasked symbol, first one on a tie."""
+    return int(np.argmin(penalty_scores(symbol ^ mask_layers(version))))
+
+
+def build_matrices(codewords, version, error_correction, mask_pattern=None):
+    """
+    Builds the final module matrices of many symbols of one version as a (symbols, size, size) array.
+
+    codewords is a (symbols, codewords) array. Placement, masking, penalty scoring and
+    format information all run on the stacked symbols, in slices that keep the eight
+    masked candidates of each slice within a few tens of megabytes.
+    """
+    codewords = np.asarray(codewords, dtype=np.uint8)
+    if mask_pattern is not None and mask_pattern not in MASK_PATTERNS:
+        raise ValueError(f"Invalid mask pattern: {mask_pattern}")
+    masks = mask_layers(version)
+    info = info_modules(version, error_correction)
+    size = masks.shape[-1]
+    step = max(1, MASK_CANDIDATE_BYTES // (len(MASK_PATTERNS) * size * size))
+
+    matrices = np.empty((codewords.shape[0], size, size), dtype=bool)
+    for start in range(0, codewords.shape[0], step):
+        symbols = place_codewords(codewords[start:start + step], version)
+        if mask_pattern is None:
+            patterns = np.argmin(penalty_scores(symbols[:, None] ^ masks), axis=1)
+        else:
+            patterns = np.full(symbols.shape[0], mask_pattern)
+        matrices[start:start + step] = symbols ^ masks[patterns] | info[patterns]
+    return matrices
+
+
+def build_matrix(codewords, version, error_correction, mask_pattern=None):
+    """
+    Builds the final module matrix of a symbol as a (size, size) boolean array.
+
+    The codewords are placed once; each mask is then applied to that base with a single
+    XOR, and the eight candidates are scored together by penalty_scores. A fixed
+    mask_pattern skips the evaluation entirely. The result matches qrcode bit for bit.
+    """
+    return build_matrices(np.asarray(codewords, dtype=np.uint8)[None], version, error_correction, mask_pattern)[0]
@@ -0,0 +1,78 @@
+import struct
+import zlib
+
+import numpy as np
+
+from src.app_logic.qrcode_raster import module_rows, parse_color
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Compressed bytes buffered before an IDAT chunk is flushed to the stream
+IDAT_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_COMPRESS_LEVEL = 9
+
+# Row filter schemes: "up" stores each module row once and its repeats as "Up" deltas,
+# "none" stores every pixel row verbatim and leaves all deduplication to zlib
+PNG_FILTERS = ("up", "none")
+
+ZLIB_STRATEGIES = {
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "huffman": zlib.Z_HUFFMAN_ONLY,
+    "rle": zlib.Z_RLE,
+    "fixed": zlib.Z_FIXED,
+}
+
+
+def _chunk(tag, data):
+    """Serializes a single PNG chunk."""
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def write_png(matrix, stream, box_size=10, border=4, fill_color="black", bg_color="white",
+              compress_level=DEFAULT_COMPRESS_LEVEL, filter_type="up", strategy="default"):
+    """
+    Streams a module matrix to a 1-bit, two-entry palette PNG and returns the bytes written.
+
+    Pixel rows are generated and compressed one module row at a time, so memory use
+    does not grow with the image size. With the "up" filter the first pixel row of every
+    module row is stored unfiltered and its box_size - 1 repeats use the PNG "Up" filter,
+    which turns them into runs of zeros that zlib compresses to almost nothing.
+    """
+    if filter_type not in PNG_FILTERS:
+        raise ValueError(f"Unknown PNG filter: {filter_type}")
+    if strategy not in ZLIB_STRATEGIES:
+        raise ValueError(f"Unknown zlib strategy: {strategy}")
+
+    rows = np.packbits(module_rows(matrix, box_size, border), axis=1)
+    size = rows.shape[0] * box_size
+    back = parse_color(bg_color)
+    fill = parse_color(fill_color)
+
+    header = [
+        PNG_SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 1, 3, 0, 0, 0)),
+        _chunk(b"PLTE", bytes(back[:3] + fill[:3])),
+    ]
+    if back[3] < 255 or fill[3] < 255:
+        header.append(_chunk(b"tRNS", bytes((back[3], fill[3]))))
+
+    written = 0
+    for chunk in header:
+        written += stream.write(chunk)
+
+    compressor = zlib.compressobj(compress_level, strategy=ZLIB_STRATEGIES[strategy])
+    idat = bytearray()
+    for row in rows:
+        line = b"\x00" + row.tobytes()
+        repeated = b"\x02" + bytes(len(line) - 1) if filter_type == "up" else line
+        idat += compressor.compress(line + repeated * (box_size - 1))
+        if len(idat) >= IDAT_CHUNK_SIZE:
+            written += stream.write(_chunk(b"IDAT", bytes(idat)))
+            idat.clear()
+    idat += compressor.flush()
+
+    written += stream.write(_chunk(b"IDAT", bytes(idat)))
+    written += stream.write(_chunk(b"IEND", b""))
+    return written
@@ -0,0 +1,48 @@
+import numpy as np
+from PIL import Image, ImageColor
+
+
+def parse_color(color):
+    """Returns an (r, g, b, a) tuple for a color name, hex string or tuple."""
+    if isinstance(color, str):
+        if color.lower() == "transparent":
+            return 0, 0, 0, 0
+        color = ImageColor.getrgb(color)
+    return tuple(color) + (255,) * (4 - len(color))
+
+
+def _is_named(color, name):
+    """Returns True if color is the given case-insensitive color name."""
+    return isinstance(color, str) and color.lower() == name
+
+
+def module_rows(matrix, box_size=10, border=4):
+    """
+    Returns one pixel row per module row (1 = dark), with the border already padded.
+
+    Every box_size consecutive pixel rows of the final image are identical, so the
+    expensive per-pixel work (bit packing, palette lookup) only has to be done on these
+    rows before they are repeated vertically.
+    """
+    modules = np.pad(np.asarray(matrix, dtype=np.uint8), border)
+    return np.repeat(modules, box_size, axis=1)
+
+
+def rasterize(matrix, box_size=10, border=4, fill_color="black", bg_color="white"):
+    """
+    Renders a module matrix to a PIL image without drawing individual rectangles.
+
+    Returns a palette ("P") image whose two entries are bg_color and fill_color, with an
+    RGBA palette for a transparent background. Its pixels are the module rows repeated
+    box_size times, which PIL wraps without copying, so no RGB pixel array is ever built;
+    callers that need RGB convert it themselves. Saved as PNG it becomes a 1-bit palette
+    file.
+    """
+    rows = module_rows(matrix, box_size, border)
+    size = rows.shape[1]
+    image = Image.frombuffer("P", (size, size), np.repeat(rows, box_size, axis=0), "raw", "P", 0, 1)
+    if _is_named(bg_color, "transparent"):
+        image.putpalette(bytes(parse_color(bg_color) + parse_color(fill_color)), "RGBA")
+    else:
+        image.putpalette(bytes(parse_color(bg_color)[:3] + parse_color(fill_color)[:3]))
+    return image
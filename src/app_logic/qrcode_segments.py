@@ -0,0 +1,165 @@
+from functools import lru_cache
+
+from qrcode import util
+from qrcode.exceptions import DataOverflowError
+
+from src.app_logic.qrcode_capacity import (
+    ERROR_CORRECTION_NAMES, VERSION_CLASSES, smallest_version, smallest_version_for_length
+)
+
+# Modes the segmenter chooses from, cheapest per character first
+SEGMENT_MODES = (util.MODE_NUMBER, util.MODE_ALPHA_NUM, util.MODE_8BIT_BYTE)
+
+# Cost of one character in each mode, in sixths of a bit (10 bits per 3 digits,
+# 11 bits per 2 alphanumeric characters, 8 bits per byte)
+_CHAR_COSTS = {util.MODE_NUMBER: 20, util.MODE_ALPHA_NUM: 33, util.MODE_8BIT_BYTE: 48}
+
+# Number of segmentations kept per character class profile
+SEGMENT_PLAN_CACHE_SIZE = 1024
+
+# Maps every byte to its character class: digit, other alphanumeric or byte-only
+_CHARACTER_CLASSES = bytes(
+    ord("n") if byte in b"0123456789" else ord("a") if byte in util.ALPHA_NUM else ord("b") for byte in range(256)
+)
+
+# Modes each character class can be encoded in
+_CLASS_MODES = {ord("n"): SEGMENT_MODES, ord("a"): SEGMENT_MODES[1:], ord("b"): SEGMENT_MODES[2:]}
+
+
+def _data_bits(mode, length):
+    """Returns the exact number of data bits for length characters in a mode."""
+    if mode == util.MODE_NUMBER:
+        return 10 * (length // 3) + util.NUMBER_LENGTH.get(length % 3, 0)
+    if mode == util.MODE_ALPHA_NUM:
+        return 11 * (length // 2) + 6 * (length % 2)
+    return 8 * length
+
+
+def segment_bits(segments, version):
+    """Returns the bit length of segments encoded at a version, headers included."""
+    return sum(4 + util.length_in_bits(segment.mode, version) + _data_bits(segment.mode, len(segment))
+               for segment in segments)
+
+
+def optimal_segments(data, version):
+    """
+    Splits data into the numeric, alphanumeric and byte segments with the fewest bits.
+
+    The best split only depends on the sequence of character classes, so payloads that
+    share a profile (a fixed URL prefix followed by a serial number, say) reuse one
+    cached segmentation. Returns a list of qrcode QRData segments.
+    """
+    data = util.to_bytestring(data)
+    segments = []
+    start = 0
+    for mode, length in _segment_runs(data.translate(_CHARACTER_CLASSES), version):
+        segments.append(util.QRData(data[start:start + length], mode=mode, check_data=False))
+        start += length
+    return segments
+
+
+@lru_cache(maxsize=SEGMENT_PLAN_CACHE_SIZE)
+def _segment_runs(profile, version):
+    """
+    Returns the cheapest segmentation of a character class profile as ((mode, length), ...).
+
+    Runs a dynamic program over the profile: for every position it keeps the cheapest
+    cost of ending in each mode, where switching modes pays a new segment header (mode
+    indicator and character count, whose width depends on the version). Costs are kept
+    in sixths of a bit so partial numeric and alphanumeric groups are weighed exactly;
+    they are rounded up to whole bits at each switch.
+    """
+    if not profile:
+        return ()
+
+    head_costs = {mode: (4 + util.length_in_bits(mode, version)) * 6 for mode in SEGMENT_MODES}
+    costs = dict(head_costs)
+    # previous_modes[i][mode] is the mode of byte i on the cheapest path that is in `mode` after it
+    previous_modes = []
+    for character_class in profile:
+        allowed = _CLASS_MODES[character_class]
+        encoded = {mode: costs[mode] + _CHAR_COSTS[mode] for mode in allowed}
+        current = dict(encoded)
+        came_from = {mode: mode for mode in allowed}
+
+        # Starting a new segment after this byte closes the current one on a whole bit
+        for mode in SEGMENT_MODES:
+            for from_mode in allowed:
+                switched = -(-encoded[from_mode] // 6) * 6 + head_costs[mode]
+                if mode not in current or switched < current[mode]:
+                    current[mode] = switched
+                    came_from[mode] = from_mode
+        previous_modes.append(came_from)
+        costs = current
+
+    mode = min(SEGMENT_MODES, key=lambda candidate: costs[candidate])
+    char_modes = []
+    for came_from in reversed(previous_modes):
+        mode = came_from[mode]
+        char_modes.append(mode)
+    char_modes.reverse()
+
+    runs = []
+    start = 0
+    for end in range(1, len(profile) + 1):
+        if end == len(profile) or char_modes[end] != char_modes[start]:
+            runs.append((char_modes[start], end - start))
+            start = end
+    return tuple(runs)
+
+
+def plan_segments(data, error_correction, version=None):
+    """
+    Returns (version, segments) for the smallest version, not below the given one, that fits data.
+
+    A version of None or 0 picks the smallest version overall. The version is looked up
+    in the capacity table from the payload's bit length, without trial encoding. The
+    segmentation is recomputed for each range of versions with the same count indicator
+    widths, since wider counts can change where switching modes pays off; all-digit
+    payloads skip it and are fitted from their length alone. Raises qrcode's
+    DataOverflowError if the data does not fit in version 40.
+    """
+    data = util.to_bytestring(data)
+    minimum = version or 1
+    util.check_version(minimum)
+
+    if data.isdigit():
+        fitted = smallest_version_for_length(len(data), util.MODE_NUMBER, error_correction, minimum)
+        if fitted is not None:
+            return fitted, [util.QRData(data, mode=util.MODE_NUMBER, check_data=False)]
+    else:
+        for first, last in VERSION_CLASSES:
+            if last < minimum:
+                continue
+            start = max(first, minimum)
+            segments = optimal_segments(data, start)
+            fitted = smallest_version(segment_bits(segments, start), error_correction, start, last)
+            if fitted is not None:
+                return fitted, segments
+    level = ERROR_CORRECTION_NAMES.get(error_correction, error_correction)
+    raise DataOverflowError(f"Data too long for a QR code at error correction level {level}")
+
+
+def naive_version(data, error_correction, version=None):
+    """Returns the smallest version holding data as one segment in its most compact mode, or None."""
+    segment = util.QRData(data)
+    return smallest_version_for_length(len(segment), segment.mode, error_correction, version or 1)
+
+
+def segment_report(data, error_correction, version=None):
+    """
+    Compares optimal segmentation with encoding data as one segment.
+
+    Returns a dictionary with both versions (the naive one is None when the single
+    segment does not fit at all), the versions saved and the segment modes used.
+    """
+    fitted, segments = plan_segments(data, error_correction, version)
+    naive = naive_version(data, error_correction, version)
+    return {
+        "version": fitted,
+        "naive_version": naive,
+        "versions_saved": naive - fitted if naive else None,
+        "bits": segment_bits(segments, fitted),
+        "naive_bits": segment_bits([util.QRData(data)], naive or 40),
+        "segments": [(segment.mode, len(segment)) for segment in segments],
+    }
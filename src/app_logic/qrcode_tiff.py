@@ -0,0 +1,133 @@
+import struct
+import zlib
+
+import numpy as np
+
+from src.app_logic.qrcode_raster import parse_color
+
+DEFAULT_TIFF_COMPRESS_LEVEL = 6
+
+# Uncompressed bytes per strip; readers decode one strip at a time
+STRIP_BYTES = 64 * 1024
+
+# Largest offset a classic (32-bit) TIFF file can hold
+MAX_TIFF_BYTES = 2 ** 32 - 1
+
+_SHORT, _LONG, _RATIONAL = 3, 4, 5
+_COMPRESSION_DEFLATE = 8
+_PHOTOMETRIC_PALETTE = 3
+_RESOLUTION_INCH = 2
+
+
+def _entry(tag, kind, count, value):
+    """Packs a 12-byte directory entry; a single SHORT is stored left-justified in the value field."""
+    if kind == _SHORT and count == 1:
+        return struct.pack("<HHIHH", tag, kind, count, value, 0)
+    return struct.pack("<HHII", tag, kind, count, value)
+
+
+class TiffWriter:
+    """
+    Minimal streaming multi-page TIFF writer for 1-bit, two-entry palette pages.
+
+    Every page's directory points to the next one, so one compressed page is held back
+    until the next page (or close()) shows whether more follow; everything before it is
+    already on the stream. Pages are Deflate-compressed in strips of STRIP_BYTES.
+    """
+
+    def __init__(self, stream, compress_level=DEFAULT_TIFF_COMPRESS_LEVEL):
+        """Writes the TIFF header; the first page directory follows it directly."""
+        self._stream = stream
+        self._compress_level = compress_level
+        self._pending = None
+        self.pages = 0
+        self.written = 0
+        self._write(b"II*\x00" + struct.pack("<I", 8))
+
+    def _write(self, data):
+        """Writes raw bytes and tracks the current offset."""
+        self._stream.write(data)
+        self.written += len(data)
+
+    def add_page(self, pixels, fill_color="black", bg_color="white", dpi=300):
+        """
+        Adds a page from a (height, width) array of 0 (background) and 1 (fill) pixels.
+
+        Colors are stored in the page's palette; transparency is not supported and is dropped.
+        """
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        height, width = pixels.shape
+        packed = np.packbits(pixels, axis=1)
+        rows_per_strip = max(1, STRIP_BYTES // packed.shape[1])
+        strips = [zlib.compress(packed[start:start + rows_per_strip].tobytes(), self._compress_level)
+                  for start in range(0, height, rows_per_strip)]
+
+        if self._pending is not None:
+            self._write_page(*self._pending, last=False)
+        self._pending = (width, height, rows_per_strip, strips, parse_color(bg_color), parse_color(fill_color), dpi)
+        self.pages += 1
+
+    def _write_page(self, width, height, rows_per_strip, strips, back, fill, dpi, last):
+        """Writes one page directory, its out-of-line values and its strips."""
+        entry_count = 13
+        ifd_offset = self.written
+        data_offset = ifd_offset + 2 + 12 * entry_count + 4
+
+        # Out-of-line values, in the order they follow the directory
+        color_map = struct.pack("<6H", *(channel * 257 for pair in zip(back[:3], fill[:3]) for channel in pair))
+        resolution = struct.pack("<II", int(round(dpi * 100)), 100)
+        color_map_offset = data_offset
+        x_resolution_offset = color_map_offset + len(color_map)
+        y_resolution_offset = x_resolution_offset + len(resolution)
+        # Strip offsets and byte counts fit in their directory entries when there is one strip
+        offsets_offset = y_resolution_offset + len(resolution)
+        counts_offset = offsets_offset + 4 * len(strips)
+        strip_offset = counts_offset + 4 * len(strips) if len(strips) > 1 else offsets_offset
+
+        strip_offsets = []
+        for strip in strips:
+            strip_offsets.append(strip_offset)
+            strip_offset += len(strip)
+        end = strip_offset + strip_offset % 2
+        if end > MAX_TIFF_BYTES:
+            raise ValueError("TIFF file would exceed 4 GiB; write fewer pages per file")
+
+        if len(strips) == 1:
+            offsets_value, counts_value = strip_offsets[0], len(strips[0])
+        else:
+            offsets_value, counts_value = offsets_offset, counts_offset
+        entries = (
+            (256, _LONG, 1, width),
+            (257, _LONG, 1, height),
+            (258, _SHORT, 1, 1),
+            (259, _SHORT, 1, _COMPRESSION_DEFLATE),
+            (262, _SHORT, 1, _PHOTOMETRIC_PALETTE),
+            (273, _LONG, len(strips), offsets_value),
+            (277, _SHORT, 1, 1),
+            (278, _LONG, 1, rows_per_strip),
+            (279, _LONG, len(strips), counts_value),
+            (282, _RATIONAL, 1, x_resolution_offset),
+            (283, _RATIONAL, 1, y_resolution_offset),
+            (296, _SHORT, 1, _RESOLUTION_INCH),
+            (320, _SHORT, 6, color_map_offset),
+        )
+        directory = (struct.pack("<H", entry_count) + b"".join(_entry(*entry) for entry in entries)
+                     + struct.pack("<I", 0 if last else end))
+
+        self._write(directory + color_map + resolution + resolution)
+        if len(strips) > 1:
+            self._write(struct.pack(f"<{len(strips)}I", *strip_offsets)
+                        + struct.pack(f"<{len(strips)}I", *map(len, strips)))
+        for strip in strips:
+            self._write(strip)
+        if self.written % 2:
+            # Directories must start on a word boundary
+            self._write(b"\x00")
+
+    def close(self):
+        """Writes the last page and returns the bytes written."""
+        if self._pending is None:
+            raise ValueError("A TIFF file needs at least one page")
+        self._write_page(*self._pending, last=True)
+        self._pending = None
+        return self.written
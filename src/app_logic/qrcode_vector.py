@@ -0,0 +1,185 @@
+import zlib
+
+from src.app_logic.qrcode_raster import parse_color
+
+DEFAULT_PDF_COMPRESS_LEVEL = 6
+
+
+def merge_rectangles(matrix):
+    """
+    Yields (x, y, width, height) rectangles, in modules, that exactly cover the dark modules.
+
+    Dark modules are first joined into horizontal runs; runs with the same extent on
+    consecutive rows are then merged into a single taller rectangle, so a symbol needs
+    several times fewer shapes than one square per module.
+    """
+    size = len(matrix)
+    open_runs = {}
+    for y, row in enumerate(tuple(matrix) + ((False,) * size,)):
+        runs = set()
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                runs.add((start, x))
+            else:
+                x += 1
+
+        for run in [run for run in open_runs if run not in runs]:
+            top = open_runs.pop(run)
+            yield run[0], top, run[1] - run[0], y - top
+        for run in runs:
+            open_runs.setdefault(run, y)
+
+
+def _svg_color(color):
+    """Returns an SVG fill and fill-opacity attribute string for a color."""
+    r, g, b, a = parse_color(color)
+    attributes = f'fill="#{r:02x}{g:02x}{b:02x}"'
+    if a < 255:
+        attributes += f' fill-opacity="{a / 255:.3f}"'
+    return attributes
+
+
+def svg_path_data(matrix, offset=0):
+    """Returns SVG path data drawing every merged rectangle with relative moves."""
+    parts = []
+    x0 = y0 = -offset
+    for x, y, width, height in merge_rectangles(matrix):
+        parts.append(f"m{x - x0} {y - y0}h{width}v{height}h-{width}z")
+        x0, y0 = x, y
+    return "M0 0" + "".join(parts)
+
+
+def write_svg(matrix, stream, box_size=10, border=4, fill_color="black", bg_color="white"):
+    """
+    Writes a module matrix as an SVG document and returns the bytes written.
+
+    The symbol is a single <path> in module units scaled through the viewBox, so the
+    file size depends on the number of merged rectangles, not on box_size.
+    """
+    modules = len(matrix) + 2 * border
+    pixels = modules * box_size
+    background = ""
+    if parse_color(bg_color)[3]:
+        background = f'<rect width="{modules}" height="{modules}" {_svg_color(bg_color)}/>'
+
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {modules} {modules}" shape-rendering="crispEdges">'
+        f'{background}<path {_svg_color(fill_color)} d="{svg_path_data(matrix, border)}"/></svg>\n'
+    ).encode("utf-8")
+    stream.write(document)
+    return len(document)
+
+
+def pdf_color(color, operator):
+    """Returns a PDF color-setting operator for an RGB color."""
+    r, g, b, _ = parse_color(color)
+    return f"{r / 255:.4g} {g / 255:.4g} {b / 255:.4g} {operator}"
+
+
+def pdf_symbol_content(matrix, x, y, box_size=10, border=4, fill_color="black", bg_color="white"):
+    """
+    Returns PDF content-stream operators drawing one symbol with its lower-left corner at (x, y).
+
+    Coordinates are in points; box_size is the module size in points. The drawing is
+    done in module units through a flipping transformation, one "re" per merged rectangle.
+    """
+    modules = len(matrix) + 2 * border
+    extent = modules * box_size
+    ops = ["q", f"{box_size:.4g} 0 0 {-box_size:.4g} {x:.4g} {y + extent:.4g} cm"]
+    if parse_color(bg_color)[3]:
+        ops += [pdf_color(bg_color, "rg"), f"0 0 {modules} {modules} re f"]
+    ops.append(pdf_color(fill_color, "rg"))
+    ops += [f"{rx + border} {ry + border} {w} {h} re" for rx, ry, w, h in merge_rectangles(matrix)]
+    ops += ["f", "Q"]
+    return "\n".join(ops).encode("ascii")
+
+
+class PdfWriter:
+    """
+    Minimal streaming PDF writer.
+
+    Each page is written to the stream as soon as it is added; only the object offsets
+    and page ids are kept until close() writes the page tree, cross-reference table and
+    trailer.
+    """
+
+    CATALOG_ID = 1
+    PAGES_ID = 2
+
+    def __init__(self, stream, compress_level=DEFAULT_PDF_COMPRESS_LEVEL):
+        """Writes the PDF header and prepares the object table."""
+        self._stream = stream
+        self._compress_level = compress_level
+        self._offsets = {}
+        self._page_ids = []
+        self._next_id = self.PAGES_ID + 1
+        self.written = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        """Writes raw bytes and tracks the current offset."""
+        self._stream.write(data)
+        self.written += len(data)
+
+    def _allocate(self):
+        """Reserves the next object id."""
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _object(self, object_id, body):
+        """Writes an indirect object."""
+        self._offsets[object_id] = self.written
+        self._write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+
+    def add_object(self, body):
+        """Writes a shared object (e.g. a font) and returns its id."""
+        object_id = self._allocate()
+        self._object(object_id, body)
+        return object_id
+
+    def add_page(self, width, height, content, resources=b"<< >>"):
+        """Writes one page of the given size in points with a Flate-compressed content stream."""
+        content_id = self._allocate()
+        page_id = self._allocate()
+        data = zlib.compress(content, self._compress_level)
+        self._object(content_id, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data
+                     + b"\nendstream")
+        self._object(page_id, (f"<< /Type /Page /Parent {self.PAGES_ID} 0 R /MediaBox [0 0 {width:.4g} {height:.4g}] "
+                               f"/Contents {content_id} 0 R /Resources ").encode("ascii") + resources + b" >>")
+        self._page_ids.append(page_id)
+
+    def close(self):
+        """Writes the page tree, catalog, cross-reference table and trailer."""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._object(self.PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode("ascii"))
+        self._object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode("ascii"))
+
+        xref_offset = self.written
+        lines = [f"xref\n0 {self._next_id}\n", "0000000000 65535 f \n"]
+        lines += [f"{self._offsets[object_id]:010d} 00000 n \n" for object_id in range(1, self._next_id)]
+        lines.append(f"trailer\n<< /Size {self._next_id} /Root {self.CATALOG_ID} 0 R >>\n"
+                     f"startxref\n{xref_offset}\n%%EOF\n")
+        self._write("".join(lines).encode("ascii"))
+        return self.written
+
+
+def write_pdf(matrices, stream, box_size=10, border=4, fill_color="black", bg_color="white",
+              compress_level=DEFAULT_PDF_COMPRESS_LEVEL):
+    """
+    Writes one page per module matrix to a PDF and returns the bytes written.
+
+    matrices may be any iterable (e.g. a generator); pages are streamed as they arrive.
+    Each page is exactly the size of its symbol, with box_size points per module.
+    """
+    writer = PdfWriter(stream, compress_level)
+    for matrix in matrices:
+        extent = (len(matrix) + 2 * border) * box_size
+        writer.add_page(extent, extent, pdf_symbol_content(matrix, 0, 0, box_size, border, fill_color, bg_color))
+    return writer.close()
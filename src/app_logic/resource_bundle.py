@@ -0,0 +1,184 @@
+import os
+import sys
+
+BUNDLE_MODULE = "_resources_data"
+BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), BUNDLE_MODULE + ".py")
+
+# Paths relative to the application base directory; config.ini is bundled pre-parsed,
+# the other files as raw bytes
+CONFIG_FILE = "resources/config.ini"
+BUNDLED_FILES = (
+    "resources/styles/style.qss",
+    "resources/icons/qrcode_icon.ico",
+)
+
+
+def _base_directory():
+    """Returns the application base directory, as Config does."""
+    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+        return sys._MEIPASS
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def _signature(path):
+    """Returns the (size, mtime) pair used to detect files changed after the bundle was built."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def minify_qss(qss):
+    """Strips comments and redundant whitespace from a stylesheet."""
+    import re
+
+    qss = re.sub(r"/\*.*?\*/", "", qss, flags=re.S)
+    qss = re.sub(r"\s+", " ", qss)
+    return re.sub(r"\s*([{};])\s*", r"\1", qss).strip()
+
+
+def _config_sections(path):
+    """Parses config.ini into {section: {option: value}} with defaults merged and values interpolated."""
+    import configparser
+
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    sections = {parser.default_section: {key: parser.get(parser.default_section, key) for key in parser.defaults()}}
+    for section in parser.sections():
+        sections[section] = dict(parser.items(section))
+    return sections
+
+
+class BundledConfig:
+    """
+    Read-only config.ini parsed at build time, with the ConfigParser get()/getint() calls Config uses.
+
+    Lookups are plain dict reads, so startup needs neither the file nor the configparser module.
+    """
+
+    def __init__(self, sections):
+        self._sections = sections
+
+    def get(self, section, option, fallback=None):
+        """Returns an option's value, or fallback if the section or option is missing."""
+        return self._sections.get(section, {}).get(option.lower(), fallback)
+
+    def getint(self, section, option, fallback=None):
+        """Returns an option as an int, or fallback if missing; raises ValueError like ConfigParser."""
+        value = self.get(section, option)
+        return fallback if value is None else int(value)
+
+
+def compile_bundle(output_path=BUNDLE_PATH, base_dir=None):
+    """Packs config.ini and BUNDLED_FILES (the stylesheet minified) into the bundle module; returns its path."""
+    import pprint
+
+    base_dir = base_dir or _base_directory()
+    files = {}
+    signatures = {CONFIG_FILE: _signature(os.path.join(base_dir, CONFIG_FILE))}
+    for relative_path in BUNDLED_FILES:
+        path = os.path.join(base_dir, relative_path)
+        with open(path, "rb") as f:
+            data = f.read()
+        if relative_path.endswith(".qss"):
+            data = minify_qss(data.decode("utf-8")).encode("utf-8")
+        files[relative_path] = data
+        signatures[relative_path] = _signature(path)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("# Generated by src/app_logic/resource_bundle.py; do not edit.\n\n")
+        f.write(f"CONFIG = {pprint.pformat(_config_sections(os.path.join(base_dir, CONFIG_FILE)))}\n\n")
+        f.write(f"FILES = {pprint.pformat(files, width=120)}\n\n")
+        f.write(f"SIGNATURES = {pprint.pformat(signatures)}\n")
+    return output_path
+
+
+class ResourceBundle:
+    """
+    Serves the stylesheet, icon and config.ini from a module generated at build time.
+
+    compile_bundle() packs the files into _resources_data.py (from setup.py, or with
+    "python -m src.app_logic.resource_bundle" in a source checkout), so startup opens and
+    parses no resource file from disk. From a source checkout the bundle is ignored as soon
+    as any bundled file changes on disk, so editing style.qss or config.ini needs no rebuild.
+    Files that are not bundled are read from disk.
+    """
+
+    def __init__(self, base_dir=None):
+        """Loads the bundle module if it exists and still matches the files on disk."""
+        self._base_dir = base_dir or _base_directory()
+        self._data = self._load()
+
+    def _load(self):
+        """Imports the generated module, returning None if it is missing or stale."""
+        try:
+            from src.app_logic import _resources_data as data
+        except ImportError:
+            return None
+
+        if not getattr(sys, "frozen", False):
+            # Files can only change under a source checkout; the frozen build is immutable
+            try:
+                for relative_path, signature in data.SIGNATURES.items():
+                    if _signature(os.path.join(self._base_dir, relative_path)) != tuple(signature):
+                        return None
+            except OSError:
+                return None
+        return data
+
+    @property
+    def available(self):
+        """Returns True if an up-to-date bundle was loaded."""
+        return self._data is not None
+
+    @property
+    def config(self):
+        """Returns the bundled configuration, or None without a bundle."""
+        return BundledConfig(self._data.CONFIG) if self._data else None
+
+    def _relative(self, path):
+        """Maps an absolute path under the base directory to its bundle key."""
+        try:
+            return os.path.relpath(path, self._base_dir).replace(os.sep, "/")
+        except ValueError:
+            # On another drive than the base directory, so never bundled
+            return None
+
+    def read_bytes(self, path):
+        """Returns a file's contents from the bundle, or from disk if it is not bundled."""
+        if self._data:
+            data = self._data.FILES.get(self._relative(path))
+            if data is not None:
+                return data
+        with open(path, "rb") as f:
+            return f.read()
+
+    def read_text(self, path, encoding="utf-8"):
+        """Returns a text file's contents from the bundle or from disk."""
+        return self.read_bytes(path).decode(encoding)
+
+    def load_icon(self, path):
+        """Builds a QIcon with every size stored in an icon file, from memory when bundled."""
+        from PySide6.QtCore import QBuffer, QByteArray
+        from PySide6.QtGui import QIcon, QImageReader, QPixmap
+
+        if not self._data or self._relative(path) not in self._data.FILES:
+            return QIcon(path)
+
+        buffer = QBuffer()
+        buffer.setData(QByteArray(self._data.FILES[self._relative(path)]))
+        # Naming the format skips probing every image plugin
+        reader = QImageReader(buffer, os.path.splitext(path)[1].lstrip(".").encode("ascii"))
+        icon = QIcon()
+        for _ in range(max(reader.imageCount(), 1)):
+            image = reader.read()
+            if not image.isNull():
+                icon.addPixmap(QPixmap.fromImage(image))
+            if not reader.jumpToNextImage():
+                break
+        return icon
+
+
+# Create a single bundle shared by the configuration and the startup path
+resource_bundle = ResourceBundle()
+
+if __name__ == "__main__":
+    print(f"Resource bundle written to {compile_bundle()}")
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from src.app_logic.config import config
+from src.app_logic.logger import logger
+
+# Bumped whenever the renderers change their output, so stale disk entries are never served
+CACHE_SCHEMA = 2
+
+# Each process rescans the shared disk directory after writing this fraction of its budget
+DISK_RESCAN_FRACTION = 16
+
+
+def _try_lock(fd):
+    """
+    Takes an exclusive, non-blocking OS lock on an open file; returns False if another process holds it.
+
+    The operating system releases the lock when the file is closed or its process dies,
+    so a crashed trimmer never leaves the lock behind and a slow one is never overlapped.
+    """
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd):
+    """Releases a lock taken by _try_lock."""
+    if os.name == "nt":
+        import msvcrt
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def result_key(**params):
+    """
+    Returns the content address of a rendered result: a SHA-256 over every parameter.
+
+    Callers pass everything that affects the output bytes (payload, version, error
+    correction, box size, border, colors, format and encoder settings).
+    """
+    canonical = json.dumps([CACHE_SCHEMA, params], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of rendered file contents.
+
+    Entries live in an in-memory LRU bounded by max_memory_bytes. With a disk directory,
+    every entry is also written there (one file per key, shared by all processes and
+    later runs) and the directory is kept under max_disk_bytes by deleting the least
+    recently used files, by modification time. Each process only sees its own writes
+    between scans, so it rescans the directory whenever its index is over budget or
+    it has written 1/DISK_RESCAN_FRACTION of the budget since the last scan; files
+    written by other processes are then counted and evicted too. Trims hold an OS lock
+    on TRIM_LOCK, so only one process trims the directory at a time. A disk hit is
+    promoted back into memory.
+    """
+
+    FILE_SUFFIX = ".bin"
+    TRIM_LOCK = ".trim.lock"
+
+    def __init__(self, max_memory_bytes, disk_dir=None, max_disk_bytes=0):
+        """Initializes the cache; the disk directory is scanned on first use."""
+        self._max_memory_bytes = max_memory_bytes
+        self._disk_dir = disk_dir if disk_dir and max_disk_bytes > 0 else None
+        self._max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._disk_entries = None
+        self._disk_size = 0
+        self._written_since_scan = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        """Returns True if either tier can hold entries."""
+        return self._max_memory_bytes > 0 or self._disk_dir is not None
+
+    def get(self, key):
+        """Returns the cached bytes for a key, or None."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+            data = self._read_disk(key)
+            if data is not None:
+                self._remember(key, data)
+                self.hits += 1
+                return data
+            self.misses += 1
+            return None
+
+    def put(self, key, data):
+        """Stores bytes under a key in memory and, if configured, on disk."""
+        with self._lock:
+            self._remember(key, data)
+            self._write_disk(key, data)
+
+    def get_or_create(self, key, create):
+        """Returns the cached bytes for a key, calling create() to produce and store them on a miss."""
+        data = self.get(key)
+        if data is None:
+            data = create()
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        """Drops every in-memory entry; disk entries are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remember(self, key, data):
+        """Adds an entry to the memory tier, evicting least recently used entries."""
+        if len(data) > self._max_memory_bytes or key in self._entries:
+            return
+        self._entries[key] = data
+        self.size += len(data)
+        while self.size > self._max_memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _path(self, key):
+        """Returns the file of a key, fanned out over 256 subdirectories."""
+        return os.path.join(self._disk_dir, key[:2], key + self.FILE_SUFFIX)
+
+    def _scan_disk(self):
+        """Indexes the disk tier by last use, oldest first."""
+        entries = []
+        for directory, _, names in os.walk(self._disk_dir):
+            for name in names:
+                if name.endswith(self.FILE_SUFFIX):
+                    try:
+                        stat = os.stat(os.path.join(directory, name))
+                    except FileNotFoundError:
+                        # Evicted by another process since the directory was listed
+                        continue
+                    entries.append((stat.st_mtime, name[:-len(self.FILE_SUFFIX)], stat.st_size))
+        self._disk_entries = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._disk_size = sum(self._disk_entries.values())
+        self._written_since_scan = 0
+
+    def _read_disk(self, key):
+        """Reads a disk entry and marks it as recently used."""
+        if self._disk_dir is None:
+            return None
+        if self._disk_entries is None:
+            self._scan_disk()
+        try:
+            path = self._path(key)
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        if key in self._disk_entries:
+            self._disk_entries.move_to_end(key)
+        return data
+
+    def _write_disk(self, key, data):
+        """Atomically writes a disk entry and trims the directory to its budget."""
+        if self._disk_dir is None or len(data) > self._max_disk_bytes:
+            return
+        if self._disk_entries is None:
+            self._scan_disk()
+        if key in self._disk_entries:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning("Could not write result cache entry %s: %s", path, e)
+            return
+
+        self._disk_entries[key] = len(data)
+        self._disk_size += len(data)
+        self._written_since_scan += len(data)
+        if (self._disk_size > self._max_disk_bytes
+                or self._written_since_scan * DISK_RESCAN_FRACTION >= self._max_disk_bytes):
+            self._trim_disk()
+
+    def _trim_disk(self):
+        """Rescans the directory and deletes the least recently used files until it fits its budget."""
+        try:
+            fd = os.open(os.path.join(self._disk_dir, self.TRIM_LOCK), os.O_RDWR | os.O_CREAT)
+        except OSError as e:
+            logger.warning("Could not open the result cache trim lock: %s", e)
+            return
+        locked = _try_lock(fd)
+        try:
+            if not locked:
+                # Another process is trimming the same directory right now
+                return
+            self._scan_disk()
+            while self._disk_size > self._max_disk_bytes and self._disk_entries:
+                evicted, size = self._disk_entries.popitem(last=False)
+                self._disk_size -= size
+                try:
+                    os.remove(self._path(evicted))
+                except FileNotFoundError:
+                    # Evicted by another process, or by a trim that ran before this one
+                    pass
+                except OSError as e:
+                    logger.warning("Could not evict result cache entry %s: %s", evicted, e)
+        finally:
+            if locked:
+                _unlock(fd)
+            os.close(fd)
+
+
+# Create a single result cache shared by every caller of the engine
+result_cache = ResultCache(config.result_cache_mb * 2 ** 20, config.result_cache_dir or None,
+                           config.result_cache_disk_mb * 2 ** 20)
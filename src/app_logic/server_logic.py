@@ -0,0 +1,459 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from src.app_logic.config import ERROR_CORRECTION_LEVELS, config
+from src.app_logic.logger import logger
+from src.app_logic.metrics import LatencyHistogram
+from src.app_logic.result_cache import CACHE_SCHEMA, ResultCache
+
+# Formats served by /qr and their content types
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+# Request limits; QR payloads are at most a few kilobytes
+MAX_LINE_BYTES = 8 * 1024
+MAX_HEADERS = 64
+MAX_BODY_BYTES = 64 * 1024
+MAX_DATA_CHARS = 7089
+READ_TIMEOUT = 30
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Window over which /metrics reports the request rate
+RATE_WINDOW_SECONDS = 60
+
+# Upper bounds in seconds of the latency histogram buckets on /metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(Exception):
+    """Raised for a request the server cannot serve; carries the HTTP status to reply with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(params, names, default, low, high):
+    """Reads an integer parameter under any of its names and checks its range."""
+    for name in names:
+        value = params.get(name)
+        if value not in (None, ""):
+            try:
+                number = int(value)
+            except (TypeError, ValueError):
+                raise RequestError(f"{name} must be an integer") from None
+            if not low <= number <= high:
+                raise RequestError(f"{name} must be between {low} and {high}")
+            return number
+    return default
+
+
+def parse_qr_params(params):
+    """
+    Validates /qr parameters and returns the normalized render options.
+
+    Accepts data, version (0 auto-fits, otherwise the minimum), ecc (or
+    error_correction: L, M, Q or H), box (or box_size), border, fmt, fill (or
+    fill_color) and bg (or bg_color); missing options fall back to config.ini.
+    """
+    data = params.get("data")
+    if not isinstance(data, str) or not data:
+        raise RequestError("data is required")
+    if len(data) > MAX_DATA_CHARS:
+        raise RequestError(f"data must be at most {MAX_DATA_CHARS} characters")
+
+    fmt = str(params.get("fmt") or "png").lower()
+    if fmt not in CONTENT_TYPES:
+        raise RequestError(f"fmt must be one of: {', '.join(CONTENT_TYPES)}")
+
+    error_correction = str(params.get("ecc") or params.get("error_correction")
+                           or config.qrcode_error_correction).upper()
+    if error_correction not in ERROR_CORRECTION_LEVELS:
+        raise RequestError(f"ecc must be one of: {', '.join(ERROR_CORRECTION_LEVELS)}")
+
+    return {
+        "data": data,
+        "version": _int_param(params, ("version",), config.qrcode_default_version, 0, 40),
+        "error_correction": error_correction,
+        "box_size": _int_param(params, ("box", "box_size"), config.qrcode_default_box_size, 1, 100),
+        "border": _int_param(params, ("border",), config.qrcode_default_border_size, 0, 100),
+        "fill_color": str(params.get("fill") or params.get("fill_color") or config.qrcode_default_fill_color),
+        "bg_color": str(params.get("bg") or params.get("bg_color") or config.qrcode_default_bg_color),
+        "fmt": fmt,
+    }
+
+
+def compute_etag(options):
+    """
+    Returns a strong ETag for a set of render options.
+
+    Rendering is deterministic, so the tag is a hash of the options, the application
+    version and the renderer output schema; a conditional request can be answered
+    without rendering anything.
+    """
+    key = json.dumps([config.app_version, CACHE_SCHEMA, options], sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def render_qr(options):
+    """
+    Renders one code in a worker process; bad input is reported as a RequestError.
+
+    The server caches finished responses by ETag itself, so workers write the file
+    straight into memory instead of going through the engine's result cache, which
+    would give every worker its own copy.
+    """
+    from qrcode.exceptions import DataOverflowError
+
+    from src.app_logic.qrcode_engine import write_qr_code
+
+    buffer = io.BytesIO()
+    try:
+        write_qr_code(options["data"], buffer, options["fmt"], options["version"], options["box_size"],
+                      options["border"], options["fill_color"], options["bg_color"], options["error_correction"])
+    except (DataOverflowError, ValueError) as e:
+        raise RequestError(str(e) or type(e).__name__) from None
+    return buffer.getvalue()
+
+
+class RateCounter:
+    """Counts events in one-second buckets to report a rate over a sliding window."""
+
+    def __init__(self, window=RATE_WINDOW_SECONDS):
+        self._window = window
+        self._buckets = deque()
+
+    def add(self, now=None):
+        """Records one event."""
+        second = int(now if now is not None else time.monotonic())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([second, 1])
+        self._expire(second)
+
+    def _expire(self, second):
+        """Drops buckets older than the window."""
+        while self._buckets and self._buckets[0][0] <= second - self._window:
+            self._buckets.popleft()
+
+    def rate(self, now=None):
+        """Returns events per second averaged over the window."""
+        self._expire(int(now if now is not None else time.monotonic()))
+        return sum(count for _, count in self._buckets) / self._window
+
+
+class ServerMetrics:
+    """Request counters and latency histograms exposed on /metrics."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.rate = RateCounter()
+        self.responses = {}
+        self.cache_hits = 0
+        self.not_modified = 0
+        self.rejected = 0
+        self.request_latency = LatencyHistogram()
+        self.render_latency = LatencyHistogram()
+
+    def record(self, status, elapsed):
+        """Records one finished request."""
+        self.rate.add()
+        self.responses[status] = self.responses.get(status, 0) + 1
+        self.request_latency.add(elapsed)
+
+    def render(self, queue_depth, in_flight, cache):
+        """Formats the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# TYPE qrserver_uptime_seconds gauge",
+            f"qrserver_uptime_seconds {time.monotonic() - self.started:.3f}",
+            "# TYPE qrserver_requests_total counter",
+        ]
+        lines += [f'qrserver_requests_total{{status="{status}"}} {count}'
+                  for status, count in sorted(self.responses.items())]
+        lines += [
+            "# TYPE qrserver_request_rate gauge",
+            f"qrserver_request_rate {self.rate.rate():.3f}",
+            "# TYPE qrserver_queue_depth gauge",
+            f"qrserver_queue_depth {queue_depth}",
+            "# TYPE qrserver_renders_in_flight gauge",
+            f"qrserver_renders_in_flight {in_flight}",
+            "# TYPE qrserver_rejected_total counter",
+            f"qrserver_rejected_total {self.rejected}",
+            "# TYPE qrserver_cache_hits_total counter",
+            f"qrserver_cache_hits_total {self.cache_hits}",
+            "# TYPE qrserver_not_modified_total counter",
+            f"qrserver_not_modified_total {self.not_modified}",
+            "# TYPE qrserver_cache_entries gauge",
+            f"qrserver_cache_entries {len(cache)}",
+            "# TYPE qrserver_cache_bytes gauge",
+            f"qrserver_cache_bytes {cache.size}",
+        ]
+        for name, histogram in (("request", self.request_latency), ("render", self.render_latency)):
+            metric = f"qrserver_{name}_duration_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            lines += [f'{metric}_bucket{{le="{bound:g}"}} {count}'
+                      for bound, count in zip(LATENCY_BUCKETS, histogram.cumulative_counts(LATENCY_BUCKETS))]
+            lines += [f'{metric}_bucket{{le="+Inf"}} {histogram.count}',
+                      f"{metric}_sum {histogram.total:.6f}", f"{metric}_count {histogram.count}"]
+        return "\n".join(lines) + "\n"
+
+
+class QRServer:
+    """
+    Minimal asyncio HTTP/1.1 server for QR codes.
+
+    Requests are parsed on the event loop; rendering runs in a process pool. Render jobs
+    wait in a bounded queue and requests beyond its capacity are rejected with 503 and
+    Retry-After instead of piling up. Identical concurrent requests share one render, and
+    finished responses are cached by their strong ETag.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 cache_bytes=DEFAULT_CACHE_BYTES):
+        self._host = host
+        self._port = port
+        self._workers = workers or os.cpu_count() or 1
+        self._queue_size = queue_size
+        # Keyed by ETag in the server process, so a hit needs no round trip to a worker
+        self._cache = ResultCache(cache_bytes)
+        self._metrics = ServerMetrics()
+        self._in_flight = {}
+        self._rendering = 0
+        self._queue = None
+        self._pool = None
+
+    async def serve(self, ready=None):
+        """Runs the server until cancelled; ready(sockets) is called once it is listening."""
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        consumers = [asyncio.create_task(self._consume()) for _ in range(self._workers)]
+        server = await asyncio.start_server(self._handle_connection, self._host, self._port,
+                                            limit=MAX_LINE_BYTES)
+        logger.info("QR server listening on %s with %d workers",
+                    ", ".join(str(sock.getsockname()) for sock in server.sockets), self._workers)
+        if ready:
+            ready(server.sockets)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _consume(self):
+        """Takes render jobs off the queue and runs them in the process pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            options, etag, future = await self._queue.get()
+            self._rendering += 1
+            started = time.perf_counter()
+            try:
+                body = await loop.run_in_executor(self._pool, render_qr, options)
+                self._cache.put(etag, body)
+                future.set_result(body)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self._metrics.render_latency.add(time.perf_counter() - started)
+                self._rendering -= 1
+                self._in_flight.pop(etag, None)
+                self._queue.task_done()
+
+    async def _render(self, options, etag):
+        """Returns the body for a request from the cache, a matching in-flight render or a new one."""
+        body = self._cache.get(etag)
+        if body is not None:
+            self._metrics.cache_hits += 1
+            return body
+
+        future = self._in_flight.get(etag)
+        if future is None:
+            if self._queue.full():
+                self._metrics.rejected += 1
+                raise RequestError("Render queue is full, retry later", 503)
+            future = asyncio.get_running_loop().create_future()
+            # Marks a failure as retrieved even if every waiting client has gone away
+            future.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._in_flight[etag] = future
+            self._queue.put_nowait((options, etag, future))
+        # Shielded so a client disconnecting does not cancel a render other requests wait for
+        return await asyncio.shield(future)
+
+    async def _handle_connection(self, reader, writer):
+        """Serves requests on one connection until it is closed or not kept alive."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), READ_TIMEOUT)
+                except RequestError as e:
+                    await self._send(writer, e.status, str(e).encode("utf-8") + b"\n", keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                started = time.perf_counter()
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, response_headers, response_body = await self._dispatch(method, target, headers, body)
+                await self._send(writer, status, response_body, response_headers, keep_alive,
+                                 head_only=method == "HEAD")
+                self._metrics.record(status, time.perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """Reads one request; returns (method, target, headers, body) or None at end of stream."""
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise RequestError("Request line too long", 431) from None
+        if not line.strip():
+            return None
+
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise RequestError("Malformed request line")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise RequestError("Header line too long", 431) from None
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise RequestError("Too many headers", 431)
+            name, separator, value = line.decode("latin-1").partition(":")
+            if not separator:
+                raise RequestError("Malformed header")
+            headers[name.strip().lower()] = value.strip()
+
+        if "transfer-encoding" in headers:
+            raise RequestError("Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise RequestError("Invalid Content-Length") from None
+        if length > MAX_BODY_BYTES:
+            raise RequestError("Request body too large", 413)
+        body = await reader.readexactly(length) if length > 0 else b""
+        return method, target, headers, body
+
+    async def _dispatch(self, method, target, headers, body):
+        """Routes a request and returns (status, headers, body)."""
+        url = urlsplit(target)
+        if url.path == "/metrics":
+            if method not in ("GET", "HEAD"):
+                return 405, {"Allow": "GET, HEAD"}, b""
+            text = self._metrics.render(self._queue.qsize(), self._rendering, self._cache)
+            return 200, {"Content-Type": "text/plain; version=0.0.4"}, text.encode("utf-8")
+        if url.path != "/qr":
+            return 404, {}, b"Not found\n"
+        if method not in ("GET", "HEAD", "POST"):
+            return 405, {"Allow": "GET, HEAD, POST"}, b""
+
+        try:
+            params = dict(parse_qsl(url.query, keep_blank_values=True))
+            if method == "POST":
+                params.update(self._body_params(headers, body))
+            options = parse_qr_params(params)
+            etag = compute_etag(options)
+            response_headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+
+            if etag in [tag.strip().removeprefix("W/") for tag in headers.get("if-none-match", "").split(",")]:
+                self._metrics.not_modified += 1
+                return 304, response_headers, b""
+
+            payload = await self._render(options, etag)
+        except RequestError as e:
+            headers_out = {"Retry-After": "1"} if e.status == 503 else {}
+            return e.status, headers_out, str(e).encode("utf-8") + b"\n"
+        except Exception as e:
+            logger.error("QR server failed to render a code: %s", e)
+            return 500, {}, b"Internal server error\n"
+
+        response_headers["Content-Type"] = CONTENT_TYPES[options["fmt"]]
+        return 200, response_headers, payload
+
+    @staticmethod
+    def _body_params(headers, body):
+        """Parses a POST body: form fields, a JSON object, or the raw payload as data."""
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        try:
+            text = body.decode("utf-8")
+        except UnicodeDecodeError:
+            raise RequestError("Request body must be UTF-8") from None
+
+        if content_type == "application/x-www-form-urlencoded":
+            return dict(parse_qsl(text, keep_blank_values=True))
+        if content_type == "application/json":
+            try:
+                params = json.loads(text)
+            except ValueError:
+                raise RequestError("Invalid JSON body") from None
+            if not isinstance(params, dict):
+                raise RequestError("JSON body must be an object")
+            return {key: value if isinstance(value, str) else json.dumps(value) for key, value in params.items()}
+        return {"data": text} if text else {}
+
+    @staticmethod
+    async def _send(writer, status, body, headers=None, keep_alive=True, head_only=False):
+        """Writes a response with Content-Length framing."""
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        if body and "Content-Type" not in (headers or {}):
+            lines.append("Content-Type: text/plain; charset=utf-8")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body and not head_only:
+            writer.write(body)
+        await writer.drain()
+
+
+def main(argv=None):
+    """Command-line entry point for the QR HTTP server."""
+    parser = argparse.ArgumentParser(description="Serve QR codes over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Render processes (default: number of CPUs)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Render jobs that may wait before requests get 503 (default: %(default)s)")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_BYTES / 2 ** 20,
+                        help="Memory budget for cached responses in MiB (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    server = QRServer(args.host, args.port, args.workers, args.queue_size, int(args.cache_mb * 2 ** 20))
+    try:
+        asyncio.run(server.serve(ready=lambda sockets: print(
+            f"Serving QR codes on http://{args.host}:{sockets[0].getsockname()[1]}/qr", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    return 0
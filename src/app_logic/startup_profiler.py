@@ -0,0 +1,201 @@
+import json
+import sys
+import threading
+import time
+
+# Command-line flag that enables the startup report; "--startup-report=path.json" also saves it
+STARTUP_REPORT_FLAG = "--startup-report"
+
+# Command-line flag that quits the application right after the first paint (for benchmarks)
+STARTUP_EXIT_FLAG = "--startup-exit"
+
+# Number of modules listed in the printed report
+REPORT_TOP_MODULES = 25
+
+
+class _TimedLoader:
+    """Wraps a module loader to time the execution of the module body."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        """Delegates module creation to the wrapped loader."""
+        create_module = getattr(self._loader, "create_module", None)
+        return create_module(spec) if create_module else None
+
+    def exec_module(self, module):
+        """Restores the original loader on the module, then times its execution."""
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit()
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class StartupProfiler:
+    """
+    Records per-module import cost and startup milestones, like "python -X importtime".
+
+    install() puts a finder at the front of sys.meta_path that wraps the loader of every
+    newly imported module, so each import is timed with its self time (the module body)
+    and its cumulative time (including the imports it triggers). Each thread keeps its
+    own stack of modules being imported, so imports running on other threads are not
+    counted as children of the main thread's. Because it is a plain import hook, it also
+    works in the frozen executable, where -X options are unavailable.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._installed = False
+        self._local = threading.local()
+        self._imports = []
+        self._marks = []
+
+    @property
+    def enabled(self):
+        """Returns True once the profiler has been installed."""
+        return self._installed
+
+    def install(self):
+        """Starts timing imports; must run before the modules of interest are imported."""
+        if not self._installed:
+            sys.meta_path.insert(0, self)
+            self._installed = True
+
+    def uninstall(self):
+        """Stops timing imports."""
+        if self._installed:
+            sys.meta_path.remove(self)
+            self._installed = False
+
+    def find_spec(self, name, path, target=None):
+        """Finds the module with the remaining finders and wraps its loader."""
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    @property
+    def _stack(self):
+        """Returns the current thread's stack of modules being imported."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        """Pushes a module whose body is about to execute."""
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        """Pops the finished module and records its self and cumulative time."""
+        stack = self._stack
+        name, started, children = stack.pop()
+        cumulative = time.perf_counter() - started
+        if stack:
+            stack[-1][2] += cumulative
+        self._imports.append((name, cumulative - children, cumulative, len(stack)))
+
+    def mark(self, label):
+        """Records a named milestone relative to process start."""
+        self._marks.append((label, time.perf_counter() - self._start, time.time()))
+
+    def report(self):
+        """Returns the milestones and import timings as a JSON-serializable dict."""
+        return {
+            "python": sys.version.split()[0],
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "marks_ms": {label: round(elapsed * 1000, 2) for label, elapsed, _ in self._marks},
+            # Wall-clock times let an external harness measure from the moment it launched the process
+            "marks_epoch": {label: wall_time for label, _, wall_time in self._marks},
+            "imports": [
+                {"module": name, "self_us": round(self_time * 1e6), "cumulative_us": round(cumulative * 1e6),
+                 "depth": depth}
+                for name, self_time, cumulative, depth in self._imports
+            ],
+        }
+
+    def format_report(self, top=REPORT_TOP_MODULES):
+        """Formats the milestones and the most expensive imports as text."""
+        lines = ["Startup report"]
+        lines += [f"  {label:<24}{elapsed * 1000:10.1f} ms" for label, elapsed, _ in self._marks]
+        peak_rss = peak_rss_bytes()
+        if peak_rss:
+            lines.append(f"  {'peak RSS':<24}{peak_rss / 2 ** 20:10.1f} MiB")
+
+        total = sum(self_time for _, self_time, _, _ in self._imports)
+        lines.append(f"  {len(self._imports)} modules imported, {total * 1000:.1f} ms in module bodies")
+        lines.append(f"  {'self [us]':>10} | {'cumulative':>10} | module")
+        for name, self_time, cumulative, depth in sorted(self._imports, key=lambda item: -item[2])[:top]:
+            lines.append(f"  {self_time * 1e6:10.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}")
+        return "\n".join(lines)
+
+    def write_report(self, path=None):
+        """Prints the report to stderr and, if a path is given, saves it as JSON."""
+        print(self.format_report(), file=sys.stderr)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+
+
+def peak_rss_bytes():
+    """Returns the peak resident set size of this process in bytes, or None if unknown."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+            get_current_process.restype = wintypes.HANDLE
+            get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+            if not get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+                return None
+            return counters.PeakWorkingSetSize
+
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux reports kilobytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError, AttributeError):
+        return None
+
+
+def report_path_from_args(argv):
+    """Returns (enabled, path) for the startup report flag in argv."""
+    for arg in argv:
+        if arg == STARTUP_REPORT_FLAG:
+            return True, None
+        if arg.startswith(STARTUP_REPORT_FLAG + "="):
+            return True, arg.split("=", 1)[1]
+    return False, None
+
+
+# Create a single profiler; its clock starts when this module is first imported
+profiler = StartupProfiler()
@@ -1,7 +1,23 @@
+import json
+import os
 import threading
-import requests
+import time
+
 from PySide6.QtCore import QObject, Signal
 
+from src.app_logic.config import config
+from src.app_logic.logger import logger
+
+# requests (and download_logic, which needs it) is imported inside the functions that use
+# it: every caller runs on a background thread, so the import never delays the first paint
+
+GITHUB_OWNER = "pyapril15"
+GITHUB_REPO = "QRCodeGenerator"
+RELEASES_URL = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/releases"
+
+# (connect, read) timeouts in seconds for GitHub API requests
+REQUEST_TIMEOUT = (5, 15)
+
 
 class UpdateManager(QObject):
     """Handles update checking, downloading, and installation processes."""
@@ -15,49 +31,172 @@ class UpdateManager(QObject):
         super().__init__()
         self.update_file_url = update_file_url
         self.update_file_name = f"QRCodeGenerator_{version}.exe"
+        self._last_percent = -1
 
     def start_update(self):
         """Starts the update download in a separate thread."""
         threading.Thread(target=self.download_update, daemon=True).start()
 
     def download_update(self):
-        """Handles downloading the update and updating progress signals."""
-        try:
-            session = requests.Session()
-            response = session.get(self.update_file_url, stream=True)
-            response.raise_for_status()
+        """Downloads and verifies the update, resuming a previous partial download if present."""
+        from src.app_logic.download_logic import RangeDownloader
 
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
+        try:
+            expected_sha256 = find_asset_sha256(self.update_file_url)
+            if not expected_sha256:
+                logger.warning("No published checksum for %s; download will not be verified.",
+                               self.update_file_url)
 
-            with open(self.update_file_name, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        self.progress_signal.emit(int((downloaded / total_size) * 100))
+            downloader = RangeDownloader(self.update_file_url, self.update_file_name,
+                                         progress_callback=self._on_progress)
+            downloader.download(expected_sha256)
 
+            self.progress_signal.emit(100)
             self.download_complete_signal.emit()
 
         except Exception as e:
             self.status_signal.emit(f"Update failed: {str(e)}")
 
+    def _on_progress(self, downloaded, total):
+        """Emits progress only when the whole percentage changes."""
+        if not total:
+            return
+        percent = min(100, downloaded * 100 // total)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress_signal.emit(percent)
+
     def close_application(self):
         """Triggers restart message before closing."""
         self.restart_signal.emit()
 
 
-def check_for_updates(config, logger, update_callback):
+class ReleaseCache:
+    """
+    Persistent cache of the GitHub releases list, revalidated with ETags.
+
+    Within the TTL the cached list is returned without any request. After that a
+    conditional request (If-None-Match) is made; a 304 reply just refreshes the
+    timestamp and does not count against the API rate limit. If GitHub cannot be
+    reached, the last cached list is returned instead of failing.
+    """
+
+    CACHE_FILE_NAME = "releases.json"
+
+    def __init__(self, ttl, cache_dir=None):
+        """Initializes the cache; the file is only read on first use."""
+        self._ttl = ttl
+        self._path = os.path.join(cache_dir or self._get_cache_directory(), self.CACHE_FILE_NAME)
+        self._lock = threading.Lock()
+        self._entry = None
+
+    @staticmethod
+    def _get_cache_directory():
+        """Determines the per-user cache directory."""
+        base_dir = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") \
+            or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base_dir, "QRCodeGenerator")
+
+    def _load(self):
+        """Reads the cache file, returning None if it is missing or unreadable."""
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, entry):
+        """Atomically writes the cache file; failures only cost a future request."""
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            temp_path = self._path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self._path)
+        except OSError as e:
+            logger.warning("Could not write releases cache %s: %s", self._path, e)
+
+    def get_releases(self, timeout=REQUEST_TIMEOUT):
+        """Returns the releases list, fetching or revalidating it only when needed."""
+        import requests
+
+        with self._lock:
+            entry = self._entry or self._load()
+            now = time.time()
+            if entry and now - entry.get("fetched_at", 0) < self._ttl:
+                self._entry = entry
+                return entry["releases"]
+
+            headers = {"Accept": "application/vnd.github+json"}
+            if entry and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+
+            try:
+                response = requests.get(RELEASES_URL, headers=headers, timeout=timeout)
+                if response.status_code == 304 and entry:
+                    entry["fetched_at"] = now
+                else:
+                    response.raise_for_status()
+                    entry = {"etag": response.headers.get("ETag"), "fetched_at": now, "releases": response.json()}
+            except requests.exceptions.RequestException as e:
+                if not entry:
+                    raise
+                logger.warning("Using cached releases after failed refresh: %s", e)
+                self._entry = entry
+                return entry["releases"]
+
+            self._entry = entry
+            self._save(entry)
+            return entry["releases"]
+
+
+def fetch_releases(timeout=REQUEST_TIMEOUT):
+    """Returns the list of GitHub releases for the application from the shared cache."""
+    return release_cache.get_releases(timeout)
+
+
+def fetch_latest_release(timeout=REQUEST_TIMEOUT):
+    """Returns the newest published, non-prerelease release, like GitHub's /releases/latest."""
+    return next((release for release in fetch_releases(timeout)
+                 if not release.get("draft") and not release.get("prerelease")), None)
+
+
+def find_asset_sha256(asset_url, timeout=REQUEST_TIMEOUT):
+    """
+    Returns the published SHA-256 of a release asset, or None if none is published.
+
+    GitHub's asset "digest" field is used when present; otherwise a "<asset>.sha256"
+    file attached to the same release is downloaded and its first token returned.
+    """
+    import requests
+
+    for release in fetch_releases(timeout):
+        assets = release.get("assets", [])
+        asset = next((a for a in assets if a.get("browser_download_url") == asset_url), None)
+        if asset is None:
+            continue
+
+        digest = asset.get("digest") or ""
+        if digest.startswith("sha256:"):
+            return digest.split(":", 1)[1]
+
+        sidecar = next((a for a in assets if a["name"] == asset["name"] + ".sha256"), None)
+        if sidecar:
+            response = requests.get(sidecar["browser_download_url"], timeout=timeout)
+            response.raise_for_status()
+            return response.text.split()[0]
+        return None
+    return None
+
+
+def check_for_updates(config, logger, update_callback, releases=None):
     """Checks for application updates and fetches latest version if discontinued."""
+    import requests
+
     try:
         current_version = config.app_version
-        owner = "pyapril15"
-        repo = "QRCodeGenerator"
-
-        url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-        response = requests.get(url)
-        response.raise_for_status()
-        releases = response.json()
+        if releases is None:
+            releases = fetch_releases()
 
         # Get the latest release details
         latest_release = releases[0] if releases else None
@@ -78,27 +217,67 @@ def check_for_updates(config, logger, update_callback):
             return
 
         if latest_version and latest_version > current_version:
-            logger.info(f"New update available: {latest_version}")
+            logger.info("New update available: %s", latest_version)
             update_callback(latest_release, latest_update_file_url, (current_version, latest_version))
         else:
             logger.info("No update required.")
 
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error checking for updates: {str(e)}")
+        logger.error("Error checking for updates: %s", e)
 
 
-def is_version_discontinued(config):
+def is_version_discontinued(config, releases=None):
     """Checks if the current version is discontinued on GitHub."""
-    try:
-        owner = "pyapril15"
-        repo = "QRCodeGenerator"
+    import requests
 
-        url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-        response = requests.get(url)
-        response.raise_for_status()
-        releases = response.json()
+    try:
+        if releases is None:
+            releases = fetch_releases()
 
         available_versions = {release["tag_name"].lstrip("v") for release in releases}
         return config.app_version not in available_versions
     except requests.exceptions.RequestException:
         return False
+
+
+class UpdateChecker(QObject):
+    """
+    Runs the startup update checks on a background thread.
+
+    The releases list is fetched once and shared by the discontinued-version and
+    update-available checks; results are delivered through signals so the main window
+    can be shown before the network round trip completes.
+    """
+
+    update_available = Signal(object, str, object)
+    version_discontinued = Signal(object)
+
+    def __init__(self, config, logger):
+        super().__init__()
+        self._config = config
+        self._log = logger
+
+    def start(self):
+        """Starts the update checks in a separate thread."""
+        threading.Thread(target=self.run_checks, daemon=True).start()
+
+    def run_checks(self):
+        """Fetches the releases once and emits the outcome of both checks."""
+        import requests
+
+        try:
+            releases = fetch_releases()
+        except requests.exceptions.RequestException as e:
+            self._log.error("Error checking for updates: %s", e)
+            return
+
+        if is_version_discontinued(self._config, releases):
+            self._log.warning("Version %s is discontinued.", self._config.app_version)
+            self.version_discontinued.emit((self._config.app_version, ""))
+            return
+
+        check_for_updates(self._config, self._log, self.update_available.emit, releases)
+
+
+# Create a single releases cache shared by every update check
+release_cache = ReleaseCache(config.releases_cache_ttl)
@@ -0,0 +1,65 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QAbstractItemView, QDialog, QHeaderView, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QVBoxLayout
+)
+
+PROFILE_COLUMNS = ("Level", "Version", "Modules", "Encode (ms)", "Output (bytes)")
+
+
+class ErrorCorrectionProfileWindow(QDialog):
+    """
+    Shows what each error correction level costs for the current payload.
+    """
+
+    def __init__(self, profile, fmt="png", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Error Correction Levels")
+        self.setMinimumSize(520, 260)
+
+        self.profile = profile
+        self.fmt = fmt
+
+        self.init_ui()
+        self.init_signals()
+
+    def init_ui(self):
+        """Initialize the profile table and its description."""
+        self.description_label = QLabel(
+            "Higher levels recover more damage but need more modules. "
+            "Pick the lowest level that meets the scanning requirement.")
+        self.description_label.setWordWrap(True)
+        self.description_label.setStyleSheet("font-size: 14px; color: #555;")
+
+        self.profile_table = QTableWidget(len(self.profile), len(PROFILE_COLUMNS))
+        self.profile_table.setHorizontalHeaderLabels(
+            PROFILE_COLUMNS[:-1] + (f"{self.fmt.upper()} output (bytes)",))
+        self.profile_table.verticalHeader().setVisible(False)
+        self.profile_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.profile_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.profile_table.setSelectionMode(QAbstractItemView.NoSelection)
+
+        for row, entry in enumerate(self.profile):
+            if "error" in entry:
+                cells = (entry["level"], "Does not fit", "-", "-", "-")
+            else:
+                cells = (entry["level"], str(entry["version"]), f"{entry['modules']:,}",
+                         f"{entry['encode_ms']:.2f}", f"{entry['bytes']:,}")
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter)
+                if "error" in entry:
+                    item.setToolTip(entry["error"])
+                self.profile_table.setItem(row, column, item)
+
+        self.close_btn = QPushButton("Close")
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.description_label)
+        layout.addWidget(self.profile_table)
+        layout.addWidget(self.close_btn)
+        self.setLayout(layout)
+
+    def init_signals(self):
+        """Connect UI signals to their respective slots."""
+        self.close_btn.clicked.connect(self.accept)
@@ -8,17 +8,11 @@
 ## WARNING! All changes made in this file will be lost when recompiling UI file!
 ################################################################################
 
-from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
-                            QMetaObject, QObject, QPoint, QRect,
-                            QSize, QTime, QUrl, Qt)
-from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
-                           QFont, QFontDatabase, QGradient, QIcon,
-                           QImage, QKeySequence, QLinearGradient, QPainter,
-                           QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QApplication, QFrame, QGridLayout, QHBoxLayout,
-                               QLabel, QLineEdit, QMainWindow, QPushButton,
-                               QSizePolicy, QSlider, QTextEdit, QVBoxLayout,
-                               QWidget)
+from PySide6.QtCore import (QCoreApplication, QMetaObject, QSize, Qt)
+from PySide6.QtGui import (QCursor, QFont)
+from PySide6.QtWidgets import (QComboBox, QFrame, QGridLayout, QHBoxLayout,
+                               QLabel, QLineEdit, QPushButton, QSizePolicy,
+                               QSlider, QTextEdit, QVBoxLayout, QWidget)
 
 
 class Ui_MainWindow(object):
@@ -122,7 +116,7 @@ class Ui_MainWindow(object):
         self.version_slider = QSlider(self.version_frm)
         self.version_slider.setObjectName(u"version_slider")
         self.version_slider.setCursor(QCursor(Qt.PointingHandCursor))
-        self.version_slider.setMinimum(1)
+        self.version_slider.setMinimum(0)
         self.version_slider.setMaximum(40)
         self.version_slider.setPageStep(2)
         self.version_slider.setOrientation(Qt.Horizontal)
@@ -138,6 +132,48 @@ class Ui_MainWindow(object):
 
         self.verticalLayout_7.addWidget(self.version_frm)
 
+        self.error_correction_frm = QFrame(self.setting_frm)
+        self.error_correction_frm.setObjectName(u"error_correction_frm")
+        self.error_correction_frm.setFrameShape(QFrame.NoFrame)
+        self.error_correction_frm.setFrameShadow(QFrame.Raised)
+        self.verticalLayout_11 = QVBoxLayout(self.error_correction_frm)
+        self.verticalLayout_11.setSpacing(8)
+        self.verticalLayout_11.setObjectName(u"verticalLayout_11")
+        self.verticalLayout_11.setContentsMargins(2, 2, 2, 2)
+        self.error_correction_title = QLabel(self.error_correction_frm)
+        self.error_correction_title.setObjectName(u"error_correction_title")
+        self.error_correction_title.setFont(font1)
+
+        self.verticalLayout_11.addWidget(self.error_correction_title)
+
+        self.error_correction_description = QLabel(self.error_correction_frm)
+        self.error_correction_description.setObjectName(u"error_correction_description")
+        self.error_correction_description.setFont(font2)
+
+        self.verticalLayout_11.addWidget(self.error_correction_description)
+
+        self.horizontalLayout_7 = QHBoxLayout()
+        self.horizontalLayout_7.setObjectName(u"horizontalLayout_7")
+        self.error_correction_combo = QComboBox(self.error_correction_frm)
+        self.error_correction_combo.addItem("")
+        self.error_correction_combo.addItem("")
+        self.error_correction_combo.addItem("")
+        self.error_correction_combo.addItem("")
+        self.error_correction_combo.setObjectName(u"error_correction_combo")
+        self.error_correction_combo.setCursor(QCursor(Qt.PointingHandCursor))
+
+        self.horizontalLayout_7.addWidget(self.error_correction_combo)
+
+        self.profile_error_correction = QPushButton(self.error_correction_frm)
+        self.profile_error_correction.setObjectName(u"profile_error_correction")
+        self.profile_error_correction.setCursor(QCursor(Qt.PointingHandCursor))
+
+        self.horizontalLayout_7.addWidget(self.profile_error_correction)
+
+        self.verticalLayout_11.addLayout(self.horizontalLayout_7)
+
+        self.verticalLayout_7.addWidget(self.error_correction_frm)
+
         self.box_size_frm = QFrame(self.setting_frm)
         self.box_size_frm.setObjectName(u"box_size_frm")
         self.box_size_frm.setFrameShape(QFrame.NoFrame)
@@ -366,12 +402,30 @@ class Ui_MainWindow(object):
         self.version_description.setText(
             QCoreApplication.translate("MainWindow", u"Controls the size of the QR Code", None))
         # if QT_CONFIG(tooltip)
-        self.version_slider.setToolTip(QCoreApplication.translate("MainWindow", u"QR code version", None))
+        self.version_slider.setToolTip(
+            QCoreApplication.translate("MainWindow", u"Minimum QR code version (0 picks the smallest that fits)", None))
         # endif // QT_CONFIG(tooltip)
         # if QT_CONFIG(tooltip)
         self.version_slider_value.setToolTip(QCoreApplication.translate("MainWindow", u"Version value", None))
         # endif // QT_CONFIG(tooltip)
-        self.version_slider_value.setText(QCoreApplication.translate("MainWindow", u"1", None))
+        self.version_slider_value.setText(QCoreApplication.translate("MainWindow", u"Auto", None))
+        self.error_correction_title.setText(QCoreApplication.translate("MainWindow", u"Error Correction", None))
+        self.error_correction_description.setText(
+            QCoreApplication.translate("MainWindow", u"Trades density for robustness against damage", None))
+        self.error_correction_combo.setItemText(0, QCoreApplication.translate("MainWindow", u"L - Low (7%)", None))
+        self.error_correction_combo.setItemText(1, QCoreApplication.translate("MainWindow", u"M - Medium (15%)", None))
+        self.error_correction_combo.setItemText(
+            2, QCoreApplication.translate("MainWindow", u"Q - Quartile (25%)", None))
+        self.error_correction_combo.setItemText(3, QCoreApplication.translate("MainWindow", u"H - High (30%)", None))
+        # if QT_CONFIG(tooltip)
+        self.error_correction_combo.setToolTip(
+            QCoreApplication.translate("MainWindow", u"Share of damaged modules the code can recover", None))
+        # endif // QT_CONFIG(tooltip)
+        # if QT_CONFIG(tooltip)
+        self.profile_error_correction.setToolTip(
+            QCoreApplication.translate("MainWindow", u"Compare the cost of every level for the current content", None))
+        # endif // QT_CONFIG(tooltip)
+        self.profile_error_correction.setText(QCoreApplication.translate("MainWindow", u"Compare", None))
         self.box_size_title.setText(QCoreApplication.translate("MainWindow", u"Box Size", None))
         self.box_size_description.setText(
             QCoreApplication.translate("MainWindow", u"Controls the pixel size of each box", None))
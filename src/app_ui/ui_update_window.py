@@ -5,7 +5,7 @@ from PySide6.QtWidgets import (
     QDialog, QLabel, QPushButton, QVBoxLayout, QProgressBar,
     QMessageBox, QScrollArea, QWidget
 )
-from src.app_logic.update_logic import UpdateManager
+from src.app_logic.update_logic import UpdateManager, fetch_latest_release
 
 
 class UpdateWindow(QDialog):
@@ -106,14 +106,8 @@ class UpdateWindow(QDialog):
         if not self.update_file_url:
             QMessageBox.information(self, "Checking for Updates", "Fetching latest update...")
 
-            owner = "pyapril15"
-            repo = "QRCodeGenerator"
-            url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
-
             try:
-                response = requests.get(url)
-                response.raise_for_status()
-                release_data = response.json()
+                release_data = fetch_latest_release() or {}
 
                 latest_update_file_url = next(
                     (asset["browser_download_url"] for asset in release_data.get("assets", []) if
@@ -0,0 +1,61 @@
+import io
+import re
+import unittest
+import zlib
+
+from PIL import Image
+
+from src.app_logic.label_sheet import SheetLayout, write_label_sheets
+from src.app_logic.qrcode_engine import encode_matrices
+
+# Inverted codes, as shipped in config.ini
+FILL_COLOR = "#FFFFFF"
+BG_COLOR = "#000000"
+
+
+def _labels(count):
+    """Returns (matrix, caption) pairs for a small sheet."""
+    payloads = [f"item-{index}" for index in range(count)]
+    return list(zip(encode_matrices(payloads), (f"SN {index}" for index in range(count))))
+
+
+def _pdf_streams(data):
+    """Returns the decompressed content streams of a PDF."""
+    return [zlib.decompress(stream) for stream in re.findall(rb"stream\r?\n(.*?)\r?\nendstream", data, re.S)]
+
+
+class CaptionColorTest(unittest.TestCase):
+    """Captions must stand out from the page they are printed on, in both formats."""
+
+    def setUp(self):
+        self.layout = SheetLayout(columns=3, rows=4, caption_size=10)
+
+    def test_pdf_caption_contrasts_with_page(self):
+        stream = io.BytesIO()
+        write_label_sheets(_labels(6), stream, self.layout, "pdf", fill_color=FILL_COLOR, bg_color=BG_COLOR)
+        content = next(stream for stream in _pdf_streams(stream.getvalue()) if b"BT" in stream)
+
+        page_color = re.match(rb"(.*?) rg\n0 0 [\d.]+ [\d.]+ re f", content)
+        caption_color = re.search(rb"BT\n/F1 [\d.]+ Tf\n(.*?) rg", content)
+        self.assertIsNotNone(page_color, "the page background is not painted")
+        self.assertIsNotNone(caption_color)
+        self.assertEqual(page_color.group(1), b"0 0 0")
+        self.assertEqual(caption_color.group(1), b"1 1 1")
+
+    def test_tiff_caption_contrasts_with_page(self):
+        stream = io.BytesIO()
+        write_label_sheets(_labels(6), stream, self.layout, "tiff", fill_color=FILL_COLOR, bg_color=BG_COLOR,
+                           dpi=72)
+        image = Image.open(stream).convert("RGB")
+
+        # The page margin shows the page color; the caption strip of the first cell holds its text
+        page_color = image.getpixel((2, 2))
+        x, y, extent, caption_x, caption_y = next(self.layout.slots())
+        top = round(image.height - y)
+        strip = image.crop((round(x), top, round(x + extent), top + round(self.layout.caption_height)))
+        self.assertEqual(page_color, (0, 0, 0))
+        self.assertIn((255, 255, 255), {color for _, color in strip.getcolors()})
+
+
+if __name__ == "__main__":
+    unittest.main()
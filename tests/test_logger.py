@@ -0,0 +1,40 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _log_from_worker(log_file):
+    """Logs one record from a spawned worker configured to write log_file; returns the worker check."""
+    from src.app_logic.config import config
+
+    config.log_file = log_file
+    from src.app_logic import logger as logger_module
+
+    logger_module.logger.error("record from a worker")
+    # Give the writer thread time to open and write the file if it were going to
+    time.sleep(0.5)
+    return logger_module._is_worker_process()
+
+
+class WorkerLoggingTest(unittest.TestCase):
+    """Worker processes must not write the rotating log file the parent writes."""
+
+    def test_parent_is_not_a_worker(self):
+        from src.app_logic.logger import _is_worker_process
+
+        self.assertFalse(_is_worker_process())
+
+    def test_spawned_worker_leaves_log_file_alone(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, "worker.log")
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                is_worker = pool.submit(_log_from_worker, log_file).result(timeout=60)
+            self.assertTrue(is_worker)
+            self.assertFalse(os.path.exists(log_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from src.app_logic.result_cache import DISK_RESCAN_FRACTION, ResultCache
+
+BUDGET = 1 << 20
+ENTRY_BYTES = 10_000
+
+
+def _directory_bytes(directory):
+    """Returns the size of every cache entry in a directory tree."""
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(directory) for name in names if name.endswith(ResultCache.FILE_SUFFIX))
+
+
+def _fill(directory, prefix, count):
+    """Writes count distinct entries into a disk-only cache; runs in a worker process."""
+    cache = ResultCache(0, directory, BUDGET)
+    for index in range(count):
+        cache.put(f"{prefix:02x}{index:062x}", os.urandom(ENTRY_BYTES))
+    return True
+
+
+def _trim(directory):
+    """Trims a disk-only cache once; runs in a worker process."""
+    cache = ResultCache(0, directory, BUDGET)
+    cache._trim_disk()
+    return True
+
+
+class SharedDiskTierTest(unittest.TestCase):
+    """Processes sharing a disk directory keep it within one budget between them."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.context = multiprocessing.get_context("spawn")
+
+    def test_two_writers_stay_within_budget(self):
+        with ProcessPoolExecutor(2, mp_context=self.context) as pool:
+            results = list(pool.map(_fill, [self.directory] * 2, [1, 2], [300, 300]))
+        self.assertEqual(results, [True, True])
+        # Each writer may be up to one rescan interval behind the other's writes
+        self.assertLessEqual(_directory_bytes(self.directory), BUDGET * (1 + 2 / DISK_RESCAN_FRACTION))
+
+    def test_two_trimmers_on_one_directory(self):
+        oversized = ResultCache(0, self.directory, BUDGET * 4)
+        for index in range(300):
+            oversized.put(f"ff{index:062x}", os.urandom(ENTRY_BYTES))
+        self.assertGreater(_directory_bytes(self.directory), BUDGET)
+
+        with ProcessPoolExecutor(2, mp_context=self.context) as pool:
+            results = list(pool.map(_trim, [self.directory] * 4))
+        self.assertEqual(results, [True] * 4)
+        self.assertLessEqual(_directory_bytes(self.directory), BUDGET)
+
+    def test_entries_deleted_by_another_process(self):
+        cache = ResultCache(0, self.directory, BUDGET)
+        for index in range(50):
+            cache.put(f"00{index:062x}", os.urandom(ENTRY_BYTES))
+        # Another process evicts everything this cache has indexed
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(ResultCache.FILE_SUFFIX):
+                    os.remove(os.path.join(root, name))
+
+        cache._disk_size = BUDGET * 2
+        cache._trim_disk()
+        self.assertIsNone(cache.get(f"00{0:062x}"))
+        for index in range(200):
+            cache.put(f"01{index:062x}", os.urandom(ENTRY_BYTES))
+        self.assertLessEqual(_directory_bytes(self.directory), BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()